@@ -0,0 +1,91 @@
+"""Conditional GET handling for the metrics routes.
+
+Responses are validated by a strong ETag built from the loaded dataset
+version and the request's path and query, so a matching ``If-None-Match``
+is answered with 304 before any service work runs. ``Cache-Control``
+lets clients reuse a response until the next scheduled refresh, which
+every worker reads from the same schedule.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from ..config import settings
+from ..db.client import get_repository
+from ..jobs.scheduler import REFRESH_JOB_ID, read_schedule, schedule_path
+
+
+def build_etag(version: str, request: Request) -> str:
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}?{query}".encode("utf-8")).hexdigest()[:12]
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Evaluate an ``If-None-Match`` header (weak comparison, per RFC 9110)."""
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def seconds_until_refresh(request: Request) -> int:
+    """Seconds until the scheduled refresh job runs next, or zero if unknown."""
+    interval = settings.refresh_interval_minutes * 60
+    now = datetime.now(timezone.utc)
+    scheduler = getattr(request.app.state, "scheduler", None)
+    if scheduler is not None and scheduler.running:
+        next_run_time = getattr(scheduler.get_job(REFRESH_JOB_ID), "next_run_time", None)
+        if next_run_time is None:
+            return 0
+        remaining = (next_run_time - now).total_seconds()
+        return max(0, min(interval, int(remaining)))
+    # Workers that lost the scheduler election follow the schedule the owner
+    # recorded; until there is one, clients revalidate with the ETag
+    schedule = read_schedule(schedule_path(settings.db_path))
+    if schedule is None:
+        return 0
+    first_run, interval_seconds = schedule
+    remaining = (first_run - now).total_seconds() % interval_seconds
+    return max(0, min(interval, int(remaining)))
+
+
+class ConditionalGetMiddleware(BaseHTTPMiddleware):
+    """Add ETag/Cache-Control to GET responses under ``path_prefix`` and answer 304s."""
+
+    def __init__(self, app, path_prefix: str = "/api/metrics") -> None:
+        super().__init__(app)
+        self._path_prefix = path_prefix
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if request.method not in ("GET", "HEAD") or not request.url.path.startswith(
+            self._path_prefix
+        ):
+            return await call_next(request)
+
+        # Pin the repository so the body is rendered from the version the ETag names;
+        # a stale repository reloads here, which must not block the event loop
+        repository = await run_in_threadpool(get_repository)
+        request.state.repository = repository
+        etag = build_etag(repository.version, request)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={seconds_until_refresh(request)}, must-revalidate",
+        }
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        response = await call_next(request)
+        if response.status_code == 200:
+            response.headers.update(headers)
+        return response
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import JSONResponse, Response
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from typing import AsyncIterator, Literal, Optional
 
 from ..models.metrics import (
     AlertFeed,
+    CorrelationResponse,
+    DashboardBundle,
+    ForecastResponse,
     MetadataResponse,
     MetricsPayload,
     MetricsSummary,
@@ -14,14 +19,18 @@ from ..models.metrics import (
     NetworkHealthDetailed,
     PoolMigrationResponse,
     PrivacyMetricsResponse,
+    TimeSeriesResponse,
 )
+from ..services.events import broadcaster
+from ..services.memo import view_cache
 from ..services.metrics_service import MetricsService
 
 router = APIRouter()
 
 
-def get_service() -> MetricsService:
-    return MetricsService()
+def get_service(request: Request) -> MetricsService:
+    # Render from the repository the conditional-GET middleware validated against
+    return MetricsService(getattr(request.state, "repository", None))
 
 
 def validate_date_format(date_str: Optional[str], param_name: str) -> None:
@@ -49,9 +58,101 @@ def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
 
 
+# Comment lines keep idle SSE connections open through proxies
+SSE_KEEPALIVE_SECONDS = 15
+
+
+@router.get("/events")
+async def stream_events(request: Request) -> StreamingResponse:
+    """Server-Sent Events: a ``generation`` event with the dashboard bundle after each refresh."""
+    queue = broadcaster.subscribe()
+    latest = broadcaster.latest or await run_in_threadpool(broadcaster.current_event)
+    last_seen = request.headers.get("last-event-id")
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield "retry: 5000\n\n"
+            if latest[0] != last_seen:
+                yield latest[1]
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/cache/stats")
+def fetch_cache_stats() -> dict[str, int]:
+    """Hit/miss counters of the computed-view cache, for sizing MEMO_CACHE_SIZE."""
+    return view_cache.stats()
+
+
 @router.get("/metrics/daily", response_model=MetricsPayload)
-def fetch_daily_metrics(service: MetricsService = Depends(get_service)) -> MetricsPayload:
-    return service.get_daily_metrics(limit=30)
+def fetch_daily_metrics(service: MetricsService = Depends(get_service)) -> Response:
+    # Pre-rendered from the frame; the schema is checked column-wise when rendering
+    return Response(
+        content=service.get_daily_metrics_json(limit=30), media_type="application/json"
+    )
+
+
+@router.get("/metrics/timeseries", response_model=TimeSeriesResponse)
+def fetch_timeseries(
+    metrics: Optional[str] = Query(None, description="Comma-separated metric columns"),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(1000, ge=1, le=5000, description="Days per page"),
+    max_points: Optional[int] = Query(
+        None, ge=2, le=10000, description="Downsample the whole range to this many points"
+    ),
+    service: MetricsService = Depends(get_service)
+) -> TimeSeriesResponse:
+    """Get daily series over any range, paginated by cursor or downsampled server-side."""
+    validate_date_format(start_date, "start_date")
+    validate_date_format(end_date, "end_date")
+    validate_date_format(cursor, "cursor")
+    names = tuple(name.strip() for name in metrics.split(",") if name.strip()) if metrics else ()
+    try:
+        return service.get_timeseries(
+            names,
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+            limit=limit,
+            max_points=max_points,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/metrics/rollups/{grain}")
+def fetch_rollups(
+    grain: Literal["week", "month", "quarter"],
+    metrics: Optional[str] = Query(None, description="Comma-separated metric columns"),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Most recent buckets"),
+    service: MetricsService = Depends(get_service)
+) -> Response:
+    """Get sum/mean/min/max/last of each metric per calendar week, month or quarter."""
+    validate_date_format(start_date, "start_date")
+    validate_date_format(end_date, "end_date")
+    names = tuple(name.strip() for name in metrics.split(",") if name.strip()) if metrics else ()
+    try:
+        content = service.get_rollups_json(
+            grain, names, start_date=start_date, end_date=end_date, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/metrics/kpis")
@@ -65,15 +166,42 @@ def fetch_summary(service: MetricsService = Depends(get_service)) -> MetricsSumm
     return service.get_summary()
 
 
+@router.get("/dashboard", response_model=DashboardBundle)
+def fetch_dashboard(service: MetricsService = Depends(get_service)) -> DashboardBundle:
+    """Get every dashboard widget's data in one consistent response."""
+    return service.get_dashboard(days=30)
+
+
 @router.get("/alerts", response_model=AlertFeed)
-def fetch_alerts(service: MetricsService = Depends(get_service)) -> AlertFeed:
-    return service.get_alerts(limit=10)
+def fetch_alerts(
+    severity: Optional[str] = Query(None, description="Only alerts with this severity"),
+    metric: Optional[str] = Query(None, description="Only alerts on this metric column"),
+    alert_type: Optional[str] = Query(None, alias="type", description="Only alerts of this type"),
+    before: Optional[datetime] = Query(None, description="Only alerts older than this time"),
+    after: Optional[datetime] = Query(None, description="Only alerts at or after this time"),
+    limit: int = Query(10, ge=1, le=500, description="Page size"),
+    offset: int = Query(0, ge=0, description="Number of matching alerts to skip"),
+    service: MetricsService = Depends(get_service)
+) -> AlertFeed:
+    """Get the alert feed, newest first, with optional filters and pagination."""
+    return service.get_alerts(
+        limit=limit,
+        severity=severity,
+        metric=metric,
+        alert_type=alert_type,
+        before=before,
+        after=after,
+        offset=offset,
+    )
 
 
 @router.get("/metrics/privacy", response_model=PrivacyMetricsResponse)
-def fetch_privacy_metrics(service: MetricsService = Depends(get_service)) -> PrivacyMetricsResponse:
+def fetch_privacy_metrics(
+    days: int = Query(30, ge=1, le=3650, description="Number of days to analyze"),
+    service: MetricsService = Depends(get_service)
+) -> PrivacyMetricsResponse:
     """Get privacy-focused analytics."""
-    return service.get_privacy_metrics(days=30)
+    return service.get_privacy_metrics(days=days)
 
 
 @router.get("/metrics/health", response_model=NetworkHealthDetailed)
@@ -99,11 +227,12 @@ def export_metrics_csv(
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     service: MetricsService = Depends(get_service)
-) -> Response:
+) -> StreamingResponse:
     """Export metrics data as CSV file."""
-    csv_data = service.export_metrics_csv(start_date, end_date)
-    return Response(
-        content=csv_data,
+    validate_date_format(start_date, "start_date")
+    validate_date_format(end_date, "end_date")
+    return StreamingResponse(
+        service.export_metrics_csv(start_date, end_date),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=zcash_metrics.csv"}
     )
@@ -114,11 +243,13 @@ def export_metrics_json(
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     service: MetricsService = Depends(get_service)
-) -> JSONResponse:
+) -> StreamingResponse:
     """Export metrics data as JSON."""
     validate_date_format(start_date, "start_date")
     validate_date_format(end_date, "end_date")
-    return service.export_metrics_json(start_date, end_date)
+    return StreamingResponse(
+        service.export_metrics_json(start_date, end_date), media_type="application/json"
+    )
 
 
 @router.get("/export/alerts/csv")
@@ -126,11 +257,12 @@ def export_alerts_csv(
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     service: MetricsService = Depends(get_service)
-) -> Response:
+) -> StreamingResponse:
     """Export alerts data as CSV file."""
-    csv_data = service.export_alerts_csv(start_date, end_date)
-    return Response(
-        content=csv_data,
+    validate_date_format(start_date, "start_date")
+    validate_date_format(end_date, "end_date")
+    return StreamingResponse(
+        service.export_alerts_csv(start_date, end_date),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=zcash_alerts.csv"}
     )
@@ -141,17 +273,110 @@ def export_alerts_json(
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     service: MetricsService = Depends(get_service)
-) -> JSONResponse:
+) -> StreamingResponse:
     """Export alerts data as JSON."""
     validate_date_format(start_date, "start_date")
     validate_date_format(end_date, "end_date")
-    return service.export_alerts_json(start_date, end_date)
+    return StreamingResponse(
+        service.export_alerts_json(start_date, end_date), media_type="application/json"
+    )
+
+
+@router.get("/export/metrics/parquet")
+def export_metrics_parquet(
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    service: MetricsService = Depends(get_service)
+) -> StreamingResponse:
+    """Export metrics data as a Parquet file."""
+    validate_date_format(start_date, "start_date")
+    validate_date_format(end_date, "end_date")
+    return StreamingResponse(
+        service.export_metrics_parquet(start_date, end_date),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": "attachment; filename=zcash_metrics.parquet"}
+    )
+
+
+@router.get("/export/metrics/arrow")
+def export_metrics_arrow(
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    service: MetricsService = Depends(get_service)
+) -> StreamingResponse:
+    """Export metrics data as an Arrow IPC stream."""
+    validate_date_format(start_date, "start_date")
+    validate_date_format(end_date, "end_date")
+    return StreamingResponse(
+        service.export_metrics_arrow(start_date, end_date),
+        media_type="application/vnd.apache.arrow.stream",
+        headers={"Content-Disposition": "attachment; filename=zcash_metrics.arrows"}
+    )
+
+
+@router.get("/export/alerts/parquet")
+def export_alerts_parquet(
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    service: MetricsService = Depends(get_service)
+) -> StreamingResponse:
+    """Export alerts data as a Parquet file."""
+    validate_date_format(start_date, "start_date")
+    validate_date_format(end_date, "end_date")
+    return StreamingResponse(
+        service.export_alerts_parquet(start_date, end_date),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": "attachment; filename=zcash_alerts.parquet"}
+    )
+
+
+@router.get("/export/alerts/arrow")
+def export_alerts_arrow(
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    service: MetricsService = Depends(get_service)
+) -> StreamingResponse:
+    """Export alerts data as an Arrow IPC stream."""
+    validate_date_format(start_date, "start_date")
+    validate_date_format(end_date, "end_date")
+    return StreamingResponse(
+        service.export_alerts_arrow(start_date, end_date),
+        media_type="application/vnd.apache.arrow.stream",
+        headers={"Content-Disposition": "attachment; filename=zcash_alerts.arrows"}
+    )
 
 
 @router.get("/metrics/pool-migration", response_model=PoolMigrationResponse)
 def fetch_pool_migration(
-    days: int = Query(30, description="Number of days to analyze"),
+    days: int = Query(30, ge=1, le=3650, description="Number of days to analyze"),
     service: MetricsService = Depends(get_service)
 ) -> PoolMigrationResponse:
-    """Get shielded pool adoption trends and migration velocity."""
+    """Get shielded pool adoption trends, migration velocity and adoption forecasts."""
     return service.get_pool_migration(days)
+
+
+@router.get("/metrics/correlations", response_model=CorrelationResponse)
+def fetch_correlations(
+    window: int = Query(30, description="Rolling window in days: 7, 30 or 90"),
+    method: Literal["pearson", "spearman"] = Query("pearson", description="Correlation method"),
+    days: int = Query(90, ge=1, le=3650, description="Days of rolling correlations to return"),
+    service: MetricsService = Depends(get_service)
+) -> CorrelationResponse:
+    """Get price/volume correlations with shielded adoption, volume and fees, and their lags."""
+    try:
+        return service.get_correlations(window, method, days)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/metrics/forecasts", response_model=ForecastResponse)
+def fetch_forecasts(
+    metrics: Optional[str] = Query(None, description="Comma-separated forecast metrics"),
+    service: MetricsService = Depends(get_service)
+) -> ForecastResponse:
+    """Get 7/30/90-day forecasts with 95% prediction intervals."""
+    names = tuple(name.strip() for name in metrics.split(",") if name.strip()) if metrics else ()
+    try:
+        return service.get_forecasts(names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
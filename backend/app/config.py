@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -32,6 +32,28 @@ class Settings(BaseSettings):
     # In development, it will be in the project root's data directory
     db_path: Path = Path(__file__).resolve().parent.parent / "data" / "zcash_pulse.duckdb"
 
+    # Where the API reads data from: "sample" (JSON files), "duckdb" (db_path),
+    # "snapshot" (Arrow files the ETL publishes next to db_path) or "auto"
+    # (the snapshot, else DuckDB, else sample data, whichever exists first)
+    data_backend: str = "auto"
+    duckdb_pool_size: int = 4
+    # Open API connections read-only, so every worker can read the warehouse.
+    # The one process that refreshes db_path in place (the scheduler owner with
+    # publish_generations off) opens it read-write instead: DuckDB rejects
+    # mixing both modes on one file within a process. Other processes cannot
+    # open a file while it is being written, so refreshing in place needs a
+    # single worker; published generations are never written again.
+    duckdb_read_only: bool = True
+    # Write each refresh into a new versioned copy of the database and swap it
+    # in atomically, so API reads never see a half-written refresh or wait on
+    # the writer. Readers then use read-only connections to the published copy.
+    publish_generations: bool = True
+    # Days of history kept in DuckDB; older whole months move to partitioned
+    # Parquet next to db_path, which reads combine transparently
+    hot_window_days: int = 365
+    # Computed API views memoized per dataset version (LRU entries)
+    memo_cache_size: int = 256
+
     # Scheduler Configuration
     refresh_interval_minutes: int = 5
     enable_live_data: bool = True  # Set to False to use sample data only
@@ -44,6 +66,8 @@ class Settings(BaseSettings):
     # Anomaly Detection
     anomaly_zscore_threshold: float = 2.5  # Standard deviations for anomaly detection
     enable_anomaly_detection: bool = True
+    # Detectors per metric column for history backfills, e.g. {"*": ["zscore", "mad"]}
+    anomaly_detectors: Dict[str, List[str]] = {}
 
     # Logging
     log_level: str = "INFO"
@@ -83,6 +107,7 @@ class Settings(BaseSettings):
         logger.info(f"Zchain API: {self.zchain_api_url}")
         logger.info(f"CoinGecko API: {self.coingecko_api_url}")
         logger.info(f"Database: {self.db_path}")
+        logger.info(f"Data Backend: {self.data_backend}")
         logger.info(f"Live Data: {'ENABLED' if self.enable_live_data else 'DISABLED (sample mode)'}")
         logger.info(f"Refresh Interval: {self.refresh_interval_minutes} minutes")
         logger.info(f"Discord Alerts: {'ENABLED' if self.discord_webhook_url else 'DISABLED'}")
@@ -0,0 +1,122 @@
+"""In-memory alert store ordered by time with secondary indexes."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+INDEXED_FIELDS = ("severity", "metric", "type")
+
+
+def parse_timestamp(value: Any) -> datetime:
+    """Parse an alert timestamp into a naive UTC datetime."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class AlertStore:
+    """
+    Alerts sorted newest-first once, with per-field position indexes.
+
+    Time bounds resolve by binary search over the sorted timestamps and
+    equality filters on ``severity``, ``metric`` and ``type`` use the
+    secondary indexes, so a query never scans or re-sorts the full feed.
+    """
+
+    def __init__(self, alerts: Iterable[Dict[str, Any]]) -> None:
+        """
+        Initialize store.
+
+        Args:
+            alerts: Alert dicts with at least a ``timestamp`` key
+        """
+        keyed = sorted(
+            ((parse_timestamp(alert["timestamp"]), alert) for alert in alerts),
+            key=lambda pair: pair[0],
+            reverse=True,
+        )
+        self._alerts = [alert for _, alert in keyed]
+        # Ascending keys for bisect: negated POSIX seconds of a newest-first list
+        self._keys = [-ts.replace(tzinfo=timezone.utc).timestamp() for ts, _ in keyed]
+        self._indexes: Dict[str, Dict[Any, List[int]]] = {field: {} for field in INDEXED_FIELDS}
+        for position, alert in enumerate(self._alerts):
+            for field in INDEXED_FIELDS:
+                self._indexes[field].setdefault(alert.get(field), []).append(position)
+        self._index_sets: Dict[str, Dict[Any, FrozenSet[int]]] = {
+            field: {value: frozenset(positions) for value, positions in index.items()}
+            for field, index in self._indexes.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def _time_bounds(
+        self,
+        before: Optional[datetime],
+        after: Optional[datetime],
+    ) -> Tuple[int, int]:
+        lo, hi = 0, len(self._keys)
+        if before is not None:
+            # Exclusive: skip alerts at or after ``before``
+            key = -parse_timestamp(before).replace(tzinfo=timezone.utc).timestamp()
+            lo = bisect_right(self._keys, key)
+        if after is not None:
+            # Inclusive: keep alerts at or after ``after``
+            key = -parse_timestamp(after).replace(tzinfo=timezone.utc).timestamp()
+            hi = bisect_right(self._keys, key)
+        return lo, max(lo, hi)
+
+    def query(
+        self,
+        *,
+        severity: Optional[str] = None,
+        metric: Optional[str] = None,
+        alert_type: Optional[str] = None,
+        before: Optional[datetime] = None,
+        after: Optional[datetime] = None,
+        limit: Optional[int] = 10,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return alerts newest-first matching every given filter.
+
+        Args:
+            severity: Exact severity ("high", "medium", "low")
+            metric: Exact metric column name
+            alert_type: Exact alert type (e.g. "fees_spike")
+            before: Only alerts strictly older than this time
+            after: Only alerts at or newer than this time
+            limit: Maximum number of alerts (None for all)
+            offset: Number of matching alerts to skip
+
+        Returns:
+            List of alert dicts
+        """
+        lo, hi = self._time_bounds(before, after)
+        filters = {"severity": severity, "metric": metric, "type": alert_type}
+        active = [(field, value) for field, value in filters.items() if value is not None]
+        end = None if limit is None else offset + limit
+
+        if not active:
+            start = lo + offset
+            stop = hi if end is None else min(hi, lo + end)
+            return self._alerts[start:stop]
+
+        # Walk the shortest posting list, checking the others by set membership
+        active.sort(key=lambda item: len(self._indexes[item[0]].get(item[1], [])))
+        field, value = active[0]
+        candidates = self._indexes[field].get(value, [])
+        others = [self._index_sets[f].get(v, frozenset()) for f, v in active[1:]]
+        window = candidates[bisect_left(candidates, lo):bisect_left(candidates, hi)]
+        matches = (p for p in window if all(p in other for other in others))
+        selected = []
+        for index, position in enumerate(matches):
+            if end is not None and index >= end:
+                break
+            if index >= offset:
+                selected.append(self._alerts[position])
+        return selected
@@ -1,25 +1,397 @@
 from __future__ import annotations
 
+import abc
+import hashlib
 import json
+import logging
+import sys
+import threading
+from datetime import date, datetime, timedelta
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
+import duckdb
 import polars as pl
 
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
 
-class DataRepository:
-    """Lightweight data access layer backed by sample JSON or DuckDB."""
+from data.etl.archive import (  # noqa: E402
+    archive_relation,
+    default_archive_dir,
+    has_archive,
+    list_partitions,
+    scan_archive,
+)
+from data.etl.publishing import (  # noqa: E402
+    generation_snapshot_dir,
+    pointer_path,
+    resolve_published_path,
+)
+from data.etl.snapshot import (  # noqa: E402
+    ALERTS_FILE,
+    CORRELATIONS_FILE,
+    CROSS_CORRELATIONS_FILE,
+    DAILY_METRICS_FILE,
+    FORECASTS_FILE,
+    ROLLUPS_FILE,
+    default_snapshot_dir,
+    resolve_snapshot,
+    snapshot_pointer,
+)
+from data.etl.transformers.alert_generator import ALERT_SCHEMA  # noqa: E402
+from data.etl.transformers.correlations import (  # noqa: E402
+    CORRELATION_TABLE,
+    CROSS_CORRELATION_TABLE,
+    compute_correlations,
+    compute_cross_correlations,
+)
+from data.etl.transformers.derived_metrics import (  # noqa: E402
+    DERIVED_TABLE,
+    compute_derived_metrics,
+)
+from data.etl.transformers.forecasting import FORECAST_TABLE, compute_forecasts  # noqa: E402
+from data.etl.transformers.rollups import ROLLUP_TABLE, compute_rollups  # noqa: E402
+
+from .alerts import AlertStore, parse_timestamp  # noqa: E402
+from .pool import (  # noqa: E402
+    DuckDBConnectionPool,
+    get_connection_pool,
+    retire_connection_pools,
+)
+from .timeseries import TimeSeriesStore  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+SourceSignature = Tuple[Tuple[str, int, int], ...]
+DateLike = Union[date, str]
+
+
+def _as_date(value: Optional[DateLike]) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def _select_rollups(
+    rollups: pl.DataFrame,
+    grain: str,
+    limit: Optional[int],
+    start_date: Optional[date],
+    end_date: Optional[date],
+) -> pl.DataFrame:
+    frame = rollups.filter(pl.col("grain") == grain)
+    if start_date is not None:
+        frame = frame.filter(pl.col("bucket_end") >= start_date)
+    if end_date is not None:
+        frame = frame.filter(pl.col("bucket_start") <= end_date)
+    frame = frame.sort("bucket_start")
+    return frame if limit is None else frame.tail(limit)
+
+
+def _select_correlations(
+    frame: pl.DataFrame,
+    window: int,
+    method: str,
+    start_date: Optional[date] = None,
+    order: str = "date",
+) -> pl.DataFrame:
+    frame = frame.filter((pl.col("window_days") == window) & (pl.col("method") == method))
+    if start_date is not None:
+        frame = frame.filter(pl.col("date") >= start_date)
+    return frame.sort("driver", "metric", order)
+
+
+def _as_alert_frame(frame: pl.DataFrame) -> pl.DataFrame:
+    """Alerts with ``ALERT_SCHEMA`` columns and naive UTC timestamps, newest first."""
+    if frame.width == 0:
+        return pl.DataFrame(schema=ALERT_SCHEMA)
+    if frame.schema["timestamp"] == pl.String:
+        frame = frame.with_columns(pl.col("timestamp").str.to_datetime(time_zone="UTC"))
+    if frame.schema["timestamp"].time_zone is not None:
+        frame = frame.with_columns(
+            pl.col("timestamp").dt.convert_time_zone("UTC").dt.replace_time_zone(None)
+        )
+    return frame.select(
+        (pl.col(name) if name in frame.columns else pl.lit(None)).cast(dtype).alias(name)
+        for name, dtype in ALERT_SCHEMA.items()
+    ).sort("timestamp", descending=True, maintain_order=True)
+
+
+class BaseRepository(abc.ABC):
+    """Common interface and change detection shared by all repositories."""
+
+    generation: int = 0
+    _signature: SourceSignature = ()
+    # Cold tier: days before ``_hot_start`` live in the Parquet archive
+    _archive_dir: Optional[Path] = None
+    _hot_start: Optional[date] = None
+    _archived_days: int = 0
+
+    @abc.abstractmethod
+    def _source_files(self) -> List[Path]:
+        ...
+
+    def _source_signature(self) -> SourceSignature:
+        signature = []
+        for path in self._source_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                signature.append((str(path), -1, -1))
+                continue
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def is_stale(self) -> bool:
+        """Return True when the underlying source files changed since load."""
+        return self._source_signature() != self._signature
+
+    @cached_property
+    def version(self) -> str:
+        """Identifier of the loaded data, equal across processes that read the same files."""
+        return hashlib.sha1(repr(self._signature).encode("utf-8")).hexdigest()[:16]
+
+    def _attach_archive(self, archive_dir: Optional[Path], hot_start: Optional[date]) -> None:
+        if archive_dir is None or hot_start is None or not has_archive(archive_dir):
+            return
+        self._archive_dir = archive_dir
+        self._hot_start = hot_start
+        self._archived_days = self._count_archived(hot_start - timedelta(days=1))
+
+    def _count_archived(self, end_date: date) -> int:
+        cold = scan_archive(self._archive_dir, end_date=end_date)
+        return cold.select(pl.len()).collect().item() if cold is not None else 0
+
+    def _with_archived_rows(
+        self,
+        hot: pl.DataFrame,
+        limit: Optional[int],
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> pl.DataFrame:
+        """Prepend archived days when the hot window cannot answer the query alone."""
+        if self._archive_dir is None or (limit is not None and hot.height >= limit):
+            return hot
+        if start_date is not None and start_date >= self._hot_start:
+            return hot
+        # Archived copies of days still in the hot window are stale leftovers
+        cold_end = self._hot_start - timedelta(days=1)
+        if end_date is not None:
+            cold_end = min(cold_end, end_date)
+        cold = self._archived_rows(
+            hot.columns, start_date, cold_end, None if limit is None else limit - hot.height
+        )
+        if cold is None:
+            return hot
+        return pl.concat([cold, hot], how="diagonal_relaxed")
+
+    def _archived_rows(
+        self,
+        columns: List[str],
+        start_date: Optional[date],
+        end_date: date,
+        limit: Optional[int],
+    ) -> Optional[pl.DataFrame]:
+        """The latest ``limit`` archived days in the range, oldest first, with the given columns."""
+        cold = scan_archive(self._archive_dir, start_date, end_date)
+        if cold is None:
+            return None
+        cold = cold.sort("date")
+        if limit is not None:
+            cold = cold.tail(limit)
+        cold = cold.collect()
+        return cold.select([column for column in columns if column in cold.columns])
+
+    @abc.abstractmethod
+    def get_daily_metrics(
+        self,
+        limit: Optional[int] = 30,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+    ) -> pl.DataFrame:
+        """Return the most recent ``limit`` days within the range, oldest first."""
+
+    @abc.abstractmethod
+    def count_daily_metrics(self) -> int:
+        ...
+
+    @abc.abstractmethod
+    def get_latest_row(self) -> Dict[str, Any]:
+        ...
+
+    @abc.abstractmethod
+    def get_previous_row(self) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abc.abstractmethod
+    def query_alerts(
+        self,
+        *,
+        severity: Optional[str] = None,
+        metric: Optional[str] = None,
+        alert_type: Optional[str] = None,
+        before: Optional[datetime] = None,
+        after: Optional[datetime] = None,
+        limit: Optional[int] = 10,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Return alerts newest-first; ``after`` is inclusive, ``before`` exclusive."""
+
+    def get_alerts(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return self.query_alerts(limit=limit)
+
+    @abc.abstractmethod
+    def query_alert_frame(
+        self,
+        *,
+        before: Optional[datetime] = None,
+        after: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> pl.DataFrame:
+        """Return alerts in the time range newest-first, as an ``ALERT_SCHEMA`` frame."""
+
+    @abc.abstractmethod
+    def get_rollups(
+        self,
+        grain: str,
+        limit: Optional[int] = None,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+    ) -> pl.DataFrame:
+        """Return the latest ``limit`` buckets of ``grain`` overlapping the range, oldest first."""
+
+    @abc.abstractmethod
+    def get_forecasts(self) -> pl.DataFrame:
+        """Return the latest forecast of every metric and horizon."""
+
+    @abc.abstractmethod
+    def get_correlations(
+        self, window: int, method: str, start_date: Optional[DateLike] = None
+    ) -> pl.DataFrame:
+        """Return rolling driver/metric correlations from ``start_date`` on, by pair and date."""
+
+    @abc.abstractmethod
+    def get_cross_correlations(self, window: int, method: str) -> pl.DataFrame:
+        """Return the latest driver/metric correlations at every lag, by pair and lag."""
+
+    @abc.abstractmethod
+    def get_daily_metrics_schema(self) -> pl.Schema:
+        """Return the column types of the hot daily metrics, as the source stores them."""
+
+    def iter_daily_metrics(
+        self,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[pl.DataFrame]:
+        """
+        Yield every day in the range, oldest first, in frames of at most ``chunk_size`` rows.
+
+        Archived months are read one partition at a time before the hot
+        window, so memory stays bounded by the chunk (or month) size no
+        matter how long the range is.
+        """
+        start_date, end_date = _as_date(start_date), _as_date(end_date)
+        if self._archive_dir is not None and (start_date is None or start_date < self._hot_start):
+            cold_end = self._hot_start - timedelta(days=1)
+            if end_date is not None:
+                cold_end = min(cold_end, end_date)
+            for path in list_partitions(self._archive_dir, start_date, cold_end):
+                rows = pl.read_parquet(path).filter(pl.col("date") <= cold_end)
+                if start_date is not None:
+                    rows = rows.filter(pl.col("date") >= start_date)
+                for offset in range(0, rows.height, chunk_size):
+                    yield rows.slice(offset, chunk_size)
+            start_date = self._hot_start if start_date is None else max(start_date, self._hot_start)
+        yield from self._iter_hot_metrics(start_date, end_date, chunk_size)
+
+    @abc.abstractmethod
+    def _iter_hot_metrics(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        chunk_size: int,
+    ) -> Iterator[pl.DataFrame]:
+        ...
+
+    def iter_alerts(
+        self,
+        *,
+        before: Optional[datetime] = None,
+        after: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield every alert in the time range, newest first, in pages of ``chunk_size``."""
+        offset = 0
+        while True:
+            page = self.query_alerts(before=before, after=after, limit=chunk_size, offset=offset)
+            if page:
+                yield page
+            if len(page) < chunk_size:
+                return
+            offset += chunk_size
+
+    def iter_alert_frames(
+        self,
+        *,
+        before: Optional[datetime] = None,
+        after: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[pl.DataFrame]:
+        """Like ``iter_alerts``, but as ``ALERT_SCHEMA`` frames read without building dicts."""
+        offset = 0
+        while True:
+            page = self.query_alert_frame(before=before, after=after, limit=chunk_size, offset=offset)
+            if page.height:
+                yield page
+            if page.height < chunk_size:
+                return
+            offset += chunk_size
+
+
+class DataRepository(BaseRepository):
+    """Lightweight data access layer backed by sample JSON.
+
+    A repository is an immutable snapshot: it loads its sources once at
+    construction and never mutates afterwards, so a request holding a
+    reference always reads consistent data. Use ``get_repository()`` to
+    obtain the shared, process-wide instance.
+    """
 
     def __init__(
         self,
         db_path: Optional[Path] = None,
         sample_dir: Optional[Path] = None,
+        generation: int = 0,
+        archive_dir: Optional[Path] = None,
+        watch_files: Sequence[Path] = (),
     ) -> None:
-        root_dir = Path(__file__).resolve().parents[3]
-        self._db_path = db_path or root_dir / "data" / "zcash_pulse.duckdb"
-        self._sample_dir = sample_dir or root_dir / "data" / "sample"
-        self._daily_metrics = self._load_daily_metrics()
-        self._alerts = self._load_alerts()
+        self._db_path = db_path or ROOT / "data" / "zcash_pulse.duckdb"
+        self._sample_dir = sample_dir or ROOT / "data" / "sample"
+        self._watch_files = list(watch_files)
+        self.generation = generation
+        # Capture the signature before reading so a write racing the load
+        # marks this snapshot stale instead of being missed.
+        self._signature = self._source_signature()
+        self._daily_metrics = TimeSeriesStore(self._load_daily_metrics())
+        self._alerts = AlertStore(self._load_alerts())
+        self._alert_frame = _as_alert_frame(self._load_alert_frame())
+        self._rollups = self._load_rollups()
+        self._forecasts = self._load_forecasts()
+        self._correlations, self._cross_correlations = self._load_correlations()
+        if self._daily_metrics.height:
+            self._attach_archive(archive_dir, self._daily_metrics.frame["date"][0])
+
+    def _source_files(self) -> List[Path]:
+        return [
+            self._sample_dir / "daily_metrics_sample.json",
+            self._sample_dir / "alerts_sample.json",
+            *self._watch_files,
+        ]
 
     def _load_daily_metrics(self) -> pl.DataFrame:
         sample_file = self._sample_dir / "daily_metrics_sample.json"
@@ -29,17 +401,11 @@ class DataRepository:
             )
         with sample_file.open("r", encoding="utf-8") as handle:
             raw_data = json.load(handle)
-        frame = pl.DataFrame(raw_data)
-        return frame.with_columns(
+        frame = pl.DataFrame(raw_data).with_columns(
             pl.col("date").str.strptime(pl.Date, format="%Y-%m-%d"),
-            (pl.col("shielded_transactions") / pl.col("total_transactions")).alias(
-                "shielded_tx_ratio"
-            ),
-            (pl.col("shielded_volume_zec")
-             / (pl.col("shielded_volume_zec") + pl.col("transparent_volume_zec"))).alias(
-                "shielded_volume_ratio"
-            ),
-        ).sort("date")
+        )
+        # Ratios, rolling means/std and deltas, as the ETL stores them
+        return frame.join(compute_derived_metrics(frame), on="date")
 
     def _load_alerts(self) -> List[Dict[str, Any]]:
         sample_file = self._sample_dir / "alerts_sample.json"
@@ -50,22 +416,652 @@ class DataRepository:
         with sample_file.open("r", encoding="utf-8") as handle:
             return json.load(handle)
 
-    def get_daily_metrics(self, limit: int = 30) -> pl.DataFrame:
-        return self._daily_metrics.sort("date", descending=True).head(limit).sort("date")
+    def _load_alert_frame(self) -> pl.DataFrame:
+        return pl.read_json(self._sample_dir / "alerts_sample.json")
+
+    def _load_rollups(self) -> pl.DataFrame:
+        return compute_rollups(self._daily_metrics.frame)
+
+    def _load_forecasts(self) -> pl.DataFrame:
+        return compute_forecasts(self._daily_metrics.frame)
+
+    def _load_correlations(self) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        frame = self._daily_metrics.frame
+        return compute_correlations(frame), compute_cross_correlations(frame)
+
+    def get_daily_metrics(
+        self,
+        limit: Optional[int] = 30,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+    ) -> pl.DataFrame:
+        start_date, end_date = _as_date(start_date), _as_date(end_date)
+        hot = self._daily_metrics.range(start_date, end_date, limit)
+        return self._with_archived_rows(hot, limit, start_date, end_date)
+
+    def _iter_hot_metrics(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        chunk_size: int,
+    ) -> Iterator[pl.DataFrame]:
+        lo, hi = self._daily_metrics.index_range(start_date, end_date)
+        frame = self._daily_metrics.frame
+        for offset in range(lo, hi, chunk_size):
+            yield frame.slice(offset, min(chunk_size, hi - offset))
+
+    def get_daily_metrics_schema(self) -> pl.Schema:
+        return self._daily_metrics.frame.schema
+
+    def count_daily_metrics(self) -> int:
+        return self._daily_metrics.height + self._archived_days
 
     def get_latest_row(self) -> Dict[str, Any]:
-        last_row = self._daily_metrics.sort("date", descending=True).row(0, named=True)
-        return dict(last_row)
+        return self._daily_metrics.latest()
 
     def get_previous_row(self) -> Optional[Dict[str, Any]]:
-        if self._daily_metrics.height < 2:
+        return self._daily_metrics.previous()
+
+    def query_alerts(self, **filters: Any) -> List[Dict[str, Any]]:
+        return self._alerts.query(**filters)
+
+    def query_alert_frame(
+        self,
+        *,
+        before: Optional[datetime] = None,
+        after: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> pl.DataFrame:
+        frame = self._alert_frame
+        if before is not None:
+            frame = frame.filter(pl.col("timestamp") < parse_timestamp(before))
+        if after is not None:
+            frame = frame.filter(pl.col("timestamp") >= parse_timestamp(after))
+        return frame.slice(offset, limit)
+
+    def get_rollups(
+        self,
+        grain: str,
+        limit: Optional[int] = None,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+    ) -> pl.DataFrame:
+        return _select_rollups(
+            self._rollups, grain, limit, _as_date(start_date), _as_date(end_date)
+        )
+
+    def get_forecasts(self) -> pl.DataFrame:
+        return self._forecasts
+
+    def get_correlations(
+        self, window: int, method: str, start_date: Optional[DateLike] = None
+    ) -> pl.DataFrame:
+        return _select_correlations(self._correlations, window, method, _as_date(start_date))
+
+    def get_cross_correlations(self, window: int, method: str) -> pl.DataFrame:
+        return _select_correlations(self._cross_correlations, window, method, order="lag")
+
+
+class SnapshotRepository(DataRepository):
+    """In-memory repository loaded from the Arrow IPC snapshot the ETL publishes.
+
+    The snapshot already carries typed dates and the derived columns, and
+    its files are memory-mapped, so loading costs no parsing. The pointer
+    to the published version is resolved once, so every file comes from
+    the same refresh.
+    """
+
+    def __init__(
+        self,
+        snapshot_dir: Path,
+        generation: int = 0,
+        archive_dir: Optional[Path] = None,
+        watch_files: Sequence[Path] = (),
+    ) -> None:
+        self._snapshot_dir = resolve_snapshot(snapshot_dir)
+        super().__init__(
+            generation=generation,
+            archive_dir=archive_dir,
+            watch_files=[snapshot_pointer(snapshot_dir), *watch_files],
+        )
+        if resolve_snapshot(snapshot_dir) != self._snapshot_dir:
+            # Swapped before the signature was captured: load again
+            self._signature = ()
+
+    def _source_files(self) -> List[Path]:
+        return [
+            self._snapshot_dir / DAILY_METRICS_FILE,
+            self._snapshot_dir / ALERTS_FILE,
+            self._snapshot_dir / ROLLUPS_FILE,
+            self._snapshot_dir / FORECASTS_FILE,
+            self._snapshot_dir / CORRELATIONS_FILE,
+            self._snapshot_dir / CROSS_CORRELATIONS_FILE,
+            *self._watch_files,
+        ]
+
+    def _load_daily_metrics(self) -> pl.DataFrame:
+        return pl.read_ipc(self._snapshot_dir / DAILY_METRICS_FILE, memory_map=True)
+
+    def _load_alerts(self) -> List[Dict[str, Any]]:
+        alerts_file = self._snapshot_dir / ALERTS_FILE
+        if not alerts_file.exists():
+            return []
+        return pl.read_ipc(alerts_file, memory_map=True).to_dicts()
+
+    def _load_alert_frame(self) -> pl.DataFrame:
+        alerts_file = self._snapshot_dir / ALERTS_FILE
+        if not alerts_file.exists():
+            return pl.DataFrame(schema=ALERT_SCHEMA)
+        return pl.read_ipc(alerts_file, memory_map=True)
+
+    def _load_rollups(self) -> pl.DataFrame:
+        rollups_file = self._snapshot_dir / ROLLUPS_FILE
+        if not rollups_file.exists():
+            # Snapshots published before rollups existed
+            return super()._load_rollups()
+        return pl.read_ipc(rollups_file, memory_map=True)
+
+    def _load_forecasts(self) -> pl.DataFrame:
+        forecasts_file = self._snapshot_dir / FORECASTS_FILE
+        if not forecasts_file.exists():
+            # Snapshots published before forecasts were stored
+            return super()._load_forecasts()
+        return pl.read_ipc(forecasts_file, memory_map=True)
+
+    def _load_correlations(self) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        rolling_file = self._snapshot_dir / CORRELATIONS_FILE
+        lagged_file = self._snapshot_dir / CROSS_CORRELATIONS_FILE
+        if not (rolling_file.exists() and lagged_file.exists()):
+            # Snapshots published before correlations were stored
+            return super()._load_correlations()
+        return (
+            pl.read_ipc(rolling_file, memory_map=True),
+            pl.read_ipc(lagged_file, memory_map=True),
+        )
+
+
+class DuckDBRepository(BaseRepository):
+    """Data access layer that reads the ETL's DuckDB warehouse.
+
+    Limits, date ranges and ordering are pushed into SQL so only the rows a
+    request needs are materialized; ratios and rolling aggregates are read
+    from the derived table the ETL maintains. Queries run on pooled connections that
+    are reused across requests and repository generations. Days older than
+    the hot window are read from the Parquet archive only when a query
+    reaches past it.
+    """
+
+    OPTIONAL_COLUMNS = ("zec_price_usd", "market_cap_usd", "trading_volume_usd")
+    BASE_COLUMNS = (
+        "date",
+        "total_transactions",
+        "shielded_transactions",
+        "transparent_transactions",
+        "shielded_volume_zec",
+        "transparent_volume_zec",
+        "avg_fee_zec",
+        "median_fee_zec",
+        "avg_block_time_seconds",
+        "active_addresses",
+    )
+
+    def __init__(
+        self,
+        db_path: Path,
+        pool: Optional[DuckDBConnectionPool] = None,
+        generation: int = 0,
+        watch_files: Sequence[Path] = (),
+        archive_dir: Optional[Path] = None,
+    ) -> None:
+        self._db_path = db_path
+        self._watch_files = list(watch_files)
+        self.generation = generation
+        self._signature = self._source_signature()
+        self._pool = pool or get_connection_pool(db_path)
+        with self._pool.connection() as conn:
+            available = {row[0] for row in conn.execute("DESCRIBE daily_metrics").fetchall()}
+            tables = {row[0] for row in conn.execute("SHOW TABLES").fetchall()}
+            hot_start, self._hot_days = conn.execute(
+                "SELECT MIN(date), COUNT(*) FROM daily_metrics"
+            ).fetchone()
+        if DERIVED_TABLE not in tables:
+            raise duckdb.CatalogException(
+                f"{DERIVED_TABLE} missing from {db_path}; run the ETL refresh to build it"
+            )
+        columns = [f"m.{column}" for column in self.BASE_COLUMNS]
+        columns.extend(f"m.{column}" for column in self.OPTIONAL_COLUMNS if column in available)
+        self._has_alerts = "alerts" in tables
+        self._has_rollups = ROLLUP_TABLE in tables
+        self._has_forecasts = FORECAST_TABLE in tables
+        self._has_correlations = {CORRELATION_TABLE, CROSS_CORRELATION_TABLE} <= tables
+        self._select = (
+            f"SELECT * FROM (SELECT {', '.join(columns)}, d.* EXCLUDE (date) "
+            f"FROM daily_metrics m JOIN {DERIVED_TABLE} d ON d.date = m.date)"
+        )
+        self._attach_archive(archive_dir, hot_start)
+
+    def _count_archived(self, end_date: date) -> int:
+        relation = archive_relation(self._archive_dir, end_date=end_date)
+        if relation is None:
+            return 0
+        return self._query(
+            f"SELECT COUNT(*) AS days FROM {relation} WHERE date <= ?", [end_date]
+        )["days"][0]
+
+    def _archived_rows(
+        self,
+        columns: List[str],
+        start_date: Optional[date],
+        end_date: date,
+        limit: Optional[int],
+    ) -> Optional[pl.DataFrame]:
+        # DuckDB reads the partitions itself, pushing the date range and
+        # the limit into the scan instead of collecting whole months
+        relation = archive_relation(self._archive_dir, start_date, end_date)
+        if relation is None:
             return None
-        row = self._daily_metrics.sort("date", descending=True).row(1, named=True)
-        return dict(row)
+        conditions, params = ["date <= ?"], [end_date]
+        if start_date is not None:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        names = ", ".join(f"'{column}'" for column in columns)
+        sql = (
+            f"SELECT COLUMNS(c -> c IN ({names})) FROM {relation} "
+            f"WHERE {' AND '.join(conditions)} ORDER BY date DESC"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._query(sql, params).sort("date")
 
-    def get_alerts(self, limit: int = 10) -> List[Dict[str, Any]]:
-        return sorted(self._alerts, key=lambda row: row["timestamp"], reverse=True)[:limit]
+    def _source_files(self) -> List[Path]:
+        return [
+            self._db_path,
+            self._db_path.with_name(self._db_path.name + ".wal"),
+            *self._watch_files,
+        ]
+
+    def _query(self, sql: str, params: List[Any]) -> pl.DataFrame:
+        with self._pool.connection() as conn:
+            return conn.execute(sql, params).pl()
+
+    def _recent_rows(
+        self,
+        limit: Optional[int],
+        offset: int = 0,
+        where: str = "",
+        params: Optional[List[Any]] = None,
+    ) -> pl.DataFrame:
+        params = list(params or [])
+        sql = f"{self._select}{where} ORDER BY date DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        return self._query(sql, params)
+
+    def get_daily_metrics(
+        self,
+        limit: Optional[int] = 30,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+    ) -> pl.DataFrame:
+        conditions = []
+        params: List[Any] = []
+        if start_date is not None:
+            conditions.append("date >= ?")
+            params.append(_as_date(start_date))
+        if end_date is not None:
+            conditions.append("date <= ?")
+            params.append(_as_date(end_date))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        hot = self._recent_rows(limit, where=where, params=params).sort("date")
+        return self._with_archived_rows(hot, limit, _as_date(start_date), _as_date(end_date))
+
+    def _iter_hot_metrics(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        chunk_size: int,
+    ) -> Iterator[pl.DataFrame]:
+        # Keyset pagination: each chunk is one short query on a pooled
+        # connection, so a slow consumer never pins a connection
+        cursor = start_date
+        inclusive = True
+        while True:
+            conditions, params = [], []
+            if cursor is not None:
+                conditions.append("date >= ?" if inclusive else "date > ?")
+                params.append(cursor)
+            if end_date is not None:
+                conditions.append("date <= ?")
+                params.append(end_date)
+            where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+            chunk = self._query(
+                f"{self._select}{where} ORDER BY date LIMIT ?", [*params, chunk_size]
+            )
+            if chunk.height:
+                yield chunk
+            if chunk.height < chunk_size:
+                return
+            cursor, inclusive = chunk["date"][-1], False
+
+    @cached_property
+    def _daily_metrics_schema(self) -> pl.Schema:
+        return self._query(f"{self._select} LIMIT 0", []).schema
+
+    def get_daily_metrics_schema(self) -> pl.Schema:
+        return self._daily_metrics_schema
+
+    def count_daily_metrics(self) -> int:
+        return self._hot_days + self._archived_days
+
+    @cached_property
+    def _computed_rollups(self) -> pl.DataFrame:
+        # Warehouses written before the ETL kept a rollup table
+        return compute_rollups(self.get_daily_metrics(limit=None))
+
+    def get_rollups(
+        self,
+        grain: str,
+        limit: Optional[int] = None,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+    ) -> pl.DataFrame:
+        start_date, end_date = _as_date(start_date), _as_date(end_date)
+        if not self._has_rollups:
+            return _select_rollups(self._computed_rollups, grain, limit, start_date, end_date)
+        conditions = ["grain = ?"]
+        params: List[Any] = [grain]
+        if start_date is not None:
+            conditions.append("bucket_end >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append("bucket_start <= ?")
+            params.append(end_date)
+        sql = (
+            f"SELECT * FROM {ROLLUP_TABLE} WHERE {' AND '.join(conditions)} "
+            f"ORDER BY bucket_start DESC"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._query(sql, params).sort("bucket_start")
+
+    @cached_property
+    def _computed_forecasts(self) -> pl.DataFrame:
+        # Warehouses written before the ETL kept forecaster state
+        return compute_forecasts(self.get_daily_metrics(limit=None))
+
+    def get_forecasts(self) -> pl.DataFrame:
+        if not self._has_forecasts:
+            return self._computed_forecasts
+        return self._query(f"SELECT * FROM {FORECAST_TABLE} ORDER BY metric, horizon_days", [])
+
+    @cached_property
+    def _computed_correlations(self) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        # Warehouses written before the ETL stored correlations
+        frame = self.get_daily_metrics(limit=None)
+        return compute_correlations(frame), compute_cross_correlations(frame)
+
+    def get_correlations(
+        self, window: int, method: str, start_date: Optional[DateLike] = None
+    ) -> pl.DataFrame:
+        start_date = _as_date(start_date)
+        if not self._has_correlations:
+            return _select_correlations(self._computed_correlations[0], window, method, start_date)
+        sql = f"SELECT * FROM {CORRELATION_TABLE} WHERE window_days = ? AND method = ?"
+        params: List[Any] = [window, method]
+        if start_date is not None:
+            sql += " AND date >= ?"
+            params.append(start_date)
+        return self._query(f"{sql} ORDER BY driver, metric, date", params)
+
+    def get_cross_correlations(self, window: int, method: str) -> pl.DataFrame:
+        if not self._has_correlations:
+            return _select_correlations(
+                self._computed_correlations[1], window, method, order="lag"
+            )
+        return self._query(
+            f"SELECT * FROM {CROSS_CORRELATION_TABLE} WHERE window_days = ? AND method = ? "
+            f"ORDER BY driver, metric, lag",
+            [window, method],
+        )
+
+    def get_latest_row(self) -> Dict[str, Any]:
+        return self._recent_rows(1).row(0, named=True)
+
+    def get_previous_row(self) -> Optional[Dict[str, Any]]:
+        frame = self._recent_rows(1, offset=1)
+        if frame.height == 0:
+            return None
+        return frame.row(0, named=True)
+
+    def query_alerts(self, **filters: Any) -> List[Dict[str, Any]]:
+        return self._alert_rows(**filters).to_dicts()
+
+    def query_alert_frame(
+        self,
+        *,
+        before: Optional[datetime] = None,
+        after: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> pl.DataFrame:
+        return _as_alert_frame(
+            self._alert_rows(before=before, after=after, limit=limit, offset=offset)
+        )
+
+    def _alert_rows(
+        self,
+        *,
+        severity: Optional[str] = None,
+        metric: Optional[str] = None,
+        alert_type: Optional[str] = None,
+        before: Optional[datetime] = None,
+        after: Optional[datetime] = None,
+        limit: Optional[int] = 10,
+        offset: int = 0,
+    ) -> pl.DataFrame:
+        if not self._has_alerts:
+            return pl.DataFrame(schema=ALERT_SCHEMA)
+        conditions = []
+        params: List[Any] = []
+        for column, value in (("severity", severity), ("metric", metric), ("type", alert_type)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if before is not None:
+            conditions.append("timestamp < ?")
+            params.append(parse_timestamp(before))
+        if after is not None:
+            conditions.append("timestamp >= ?")
+            params.append(parse_timestamp(after))
+        sql = "SELECT * FROM alerts"
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        sql += " ORDER BY timestamp DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        elif offset:
+            sql += " OFFSET ?"
+            params.append(offset)
+        return self._query(sql, params)
+
+
+class WindowRepository(BaseRepository):
+    """The most recent days of another repository, read once and served from memory.
+
+    Lets a request that renders several views of the same recent window
+    share a single read. Anything outside the window falls through to the
+    source repository, so results always match reading the source directly.
+    """
+
+    def __init__(self, source: BaseRepository, days: int) -> None:
+        self._source = source
+        self._days = days
+        self.generation = source.generation
+        self._signature = source._signature
+        self._window = TimeSeriesStore(source.get_daily_metrics(limit=days))
+
+    def _source_files(self) -> List[Path]:
+        return self._source._source_files()
+
+    def is_stale(self) -> bool:
+        return self._source.is_stale()
+
+    def get_daily_metrics(
+        self,
+        limit: Optional[int] = 30,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+    ) -> pl.DataFrame:
+        if start_date is None and end_date is None and limit is not None and limit <= self._days:
+            return self._window.tail(limit)
+        return self._source.get_daily_metrics(limit, start_date, end_date)
+
+    def count_daily_metrics(self) -> int:
+        return self._source.count_daily_metrics()
+
+    def get_latest_row(self) -> Dict[str, Any]:
+        return self._window.latest()
+
+    def get_previous_row(self) -> Optional[Dict[str, Any]]:
+        return self._window.previous()
+
+    def query_alerts(self, **filters: Any) -> List[Dict[str, Any]]:
+        return self._source.query_alerts(**filters)
+
+    def query_alert_frame(self, **filters: Any) -> pl.DataFrame:
+        return self._source.query_alert_frame(**filters)
+
+    def get_daily_metrics_schema(self) -> pl.Schema:
+        return self._source.get_daily_metrics_schema()
+
+    def get_rollups(self, *args: Any, **kwargs: Any) -> pl.DataFrame:
+        return self._source.get_rollups(*args, **kwargs)
+
+    def get_forecasts(self) -> pl.DataFrame:
+        return self._source.get_forecasts()
+
+    def get_correlations(self, *args: Any, **kwargs: Any) -> pl.DataFrame:
+        return self._source.get_correlations(*args, **kwargs)
+
+    def get_cross_correlations(self, *args: Any, **kwargs: Any) -> pl.DataFrame:
+        return self._source.get_cross_correlations(*args, **kwargs)
+
+    def iter_daily_metrics(self, *args: Any, **kwargs: Any) -> Iterator[pl.DataFrame]:
+        return self._source.iter_daily_metrics(*args, **kwargs)
+
+    def _iter_hot_metrics(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        chunk_size: int,
+    ) -> Iterator[pl.DataFrame]:
+        return self._source._iter_hot_metrics(start_date, end_date, chunk_size)
+
+
+class _RepositoryRegistry:
+    """Holds the process-wide repository and swaps it when data changes.
+
+    Readers take a reference to the current snapshot without locking; a
+    reload builds a complete new ``DataRepository`` before publishing it, so
+    nobody ever observes a half-loaded state.
+    """
+
+    def __init__(self, factory: Callable[[int], BaseRepository]) -> None:
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._current: Optional[BaseRepository] = None
+        self._generation = 0
+        self._invalidated = False
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self) -> BaseRepository:
+        current = self._current
+        if current is not None and not self._invalidated and not current.is_stale():
+            return current
+        with self._lock:
+            current = self._current
+            if current is None or self._invalidated or current.is_stale():
+                self._invalidated = False
+                generation = self._generation + 1
+                current = self._factory(generation)
+                self._current = current
+                self._generation = generation
+                logger.info(f"Loaded data repository generation {generation}")
+            return current
+
+    def invalidate(self) -> None:
+        """Force the next ``get()`` to reload, e.g. after an ETL refresh."""
+        self._invalidated = True
+
+
+def _create_repository(generation: int) -> BaseRepository:
+    """Build the repository for the configured ``data_backend``."""
+    from ..config import settings
+
+    backend = settings.data_backend.lower()
+    published = resolve_published_path(settings.db_path)
+    # A published generation's snapshot was swapped in with its database
+    snapshot_dir = (
+        generation_snapshot_dir(published) if published is not None
+        else default_snapshot_dir(settings.db_path)
+    )
+    archive_dir = default_archive_dir(settings.db_path)
+    # Every backend also watches what the ETL publishes, so every worker
+    # process switches over on its own when a snapshot or generation appears
+    published_markers = [snapshot_pointer(snapshot_dir), pointer_path(settings.db_path)]
+    if backend == "snapshot" or (
+        backend == "auto" and (resolve_snapshot(snapshot_dir) / DAILY_METRICS_FILE).exists()
+    ):
+        return SnapshotRepository(
+            snapshot_dir,
+            generation=generation,
+            archive_dir=archive_dir,
+            watch_files=[pointer_path(settings.db_path)],
+        )
+    db_exists = published is not None or settings.db_path.exists()
+    if backend == "duckdb" or (backend == "auto" and db_exists):
+        try:
+            if published is not None:
+                # Published generations are never written again, so readers can
+                # open them read-only and drop pools of retired generations.
+                repository = DuckDBRepository(
+                    published,
+                    pool=get_connection_pool(published, read_only=True),
+                    generation=generation,
+                    watch_files=published_markers,
+                    archive_dir=archive_dir,
+                )
+                retire_connection_pools(keep=published)
+                return repository
+            return DuckDBRepository(
+                settings.db_path,
+                generation=generation,
+                watch_files=published_markers,
+                archive_dir=archive_dir,
+            )
+        except duckdb.Error as e:
+            if backend == "duckdb":
+                raise
+            logger.warning(f"DuckDB at {settings.db_path} not readable ({e}); using sample data")
+    return DataRepository(generation=generation, watch_files=published_markers)
+
+
+_registry = _RepositoryRegistry(_create_repository)
+
+
+def get_repository() -> BaseRepository:
+    """Return the shared repository, reloading it only if its data changed."""
+    return _registry.get()
 
 
-def get_repository() -> DataRepository:
-    return DataRepository()
+def invalidate_repository() -> None:
+    """Mark the shared repository stale so the next read picks up new data."""
+    _registry.invalidate()
@@ -0,0 +1,143 @@
+"""Small pool of DuckDB connections shared across API requests."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+
+class DuckDBConnectionPool:
+    """
+    Fixed-size pool of DuckDB connections to a single database file.
+
+    A DuckDB connection must not be used by two threads at once, so each
+    request checks one out for the duration of its query. Connections are
+    opened lazily and reused until the pool is closed.
+    """
+
+    def __init__(self, db_path: Path, size: int = 4, read_only: bool = True) -> None:
+        """
+        Initialize pool.
+
+        Args:
+            db_path: Path to DuckDB file
+            size: Maximum number of open connections
+            read_only: Open connections in read-only mode
+        """
+        self.db_path = db_path
+        self.size = size
+        self.read_only = read_only
+        self._idle: "queue.LifoQueue[duckdb.DuckDBPyConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+
+    @contextmanager
+    def connection(self, timeout: float = 30.0) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Check out a connection, blocking while all of them are busy."""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No DuckDB connection available for {self.db_path}")
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = duckdb.connect(str(self.db_path), read_only=self.read_only)
+            self._opened += 1
+            logger.debug(f"Opened DuckDB connection {self._opened} for {self.db_path.name}")
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                if self._closed:
+                    self._close_connection(conn)
+                else:
+                    self._idle.put(conn)
+            self._slots.release()
+
+    @staticmethod
+    def _close_connection(conn: duckdb.DuckDBPyConnection) -> None:
+        try:
+            conn.close()
+        except duckdb.Error:
+            logger.debug("Ignoring error while closing pooled connection", exc_info=True)
+
+    def close(self) -> None:
+        """
+        Retire the pool.
+
+        Idle connections close immediately and busy ones when they are
+        returned. Requests still holding a repository that uses this pool can
+        check out connections afterwards; those are closed after each use.
+        """
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    self._close_connection(self._idle.get_nowait())
+                except queue.Empty:
+                    break
+
+
+_pools: Dict[Path, DuckDBConnectionPool] = {}
+_pools_lock = threading.Lock()
+# Databases this process writes in place, whose pools must open read-write
+_written_in_place: Set[Path] = set()
+
+
+def get_connection_pool(db_path: Path, read_only: Optional[bool] = None) -> DuckDBConnectionPool:
+    """
+    Return the process-wide pool for ``db_path``, creating it on first use.
+
+    New pools open read-only (``settings.duckdb_read_only``) unless this
+    process writes ``db_path`` in place (see ``open_read_write``).
+
+    Args:
+        db_path: Path to DuckDB file
+        read_only: Override the mode of a new pool
+    """
+    from ..config import settings
+
+    key = db_path.resolve()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            if read_only is None:
+                read_only = settings.duckdb_read_only and key not in _written_in_place
+            pool = DuckDBConnectionPool(key, size=settings.duckdb_pool_size, read_only=read_only)
+            _pools[key] = pool
+        return pool
+
+
+def open_read_write(db_path: Path) -> None:
+    """
+    Have this process's pool for ``db_path`` open read-write from now on.
+
+    For the process whose ETL writes ``db_path`` in place, as DuckDB rejects
+    read-only and read-write connections to one file within a process. A
+    read-only pool already open is retired.
+    """
+    key = db_path.resolve()
+    with _pools_lock:
+        _written_in_place.add(key)
+        pool = _pools.get(key)
+        if pool is not None and pool.read_only:
+            _pools.pop(key).close()
+            logger.info(f"Reopening DuckDB connection pool for {key.name} read-write")
+
+
+def retire_connection_pools(keep: Path) -> None:
+    """Close every pool except the one for ``keep``, e.g. after a new generation is published."""
+    keep = keep.resolve()
+    with _pools_lock:
+        retired = [path for path in _pools if path != keep]
+        for path in retired:
+            _pools.pop(path).close()
+            logger.info(f"Retired DuckDB connection pool for {path.name}")
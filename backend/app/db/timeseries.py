@@ -0,0 +1,83 @@
+"""Date-indexed, in-memory store for daily time series."""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+import polars as pl
+
+
+class TimeSeriesStore:
+    """
+    Daily series kept sorted by date once, at construction.
+
+    Every read is a slice of the sorted frame: the latest and previous
+    rows are precomputed, the most recent N days are a zero-copy tail and
+    date ranges resolve by binary search over the date column.
+    """
+
+    def __init__(self, frame: pl.DataFrame, date_column: str = "date") -> None:
+        """
+        Initialize store.
+
+        Args:
+            frame: Daily rows in any order
+            date_column: Name of the Date column to index on
+        """
+        if frame[date_column].is_sorted():
+            # Already ordered (e.g. a memory-mapped snapshot): flag it instead of
+            # sorting, so the frame keeps pointing at the shared mapped pages
+            self._frame = frame.with_columns(pl.col(date_column).set_sorted())
+        else:
+            self._frame = frame.sort(date_column)
+        self._dates = self._frame[date_column]
+        height = self._frame.height
+        self._latest = self._frame.row(height - 1, named=True) if height else None
+        self._previous = self._frame.row(height - 2, named=True) if height > 1 else None
+
+    @property
+    def frame(self) -> pl.DataFrame:
+        return self._frame
+
+    @property
+    def height(self) -> int:
+        return self._frame.height
+
+    def latest(self) -> Dict[str, Any]:
+        if self._latest is None:
+            raise LookupError("Time series is empty")
+        return dict(self._latest)
+
+    def previous(self) -> Optional[Dict[str, Any]]:
+        return dict(self._previous) if self._previous is not None else None
+
+    def tail(self, n: int) -> pl.DataFrame:
+        """Return the last ``n`` rows, oldest first, without copying."""
+        return self._frame.tail(n)
+
+    def index_range(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Tuple[int, int]:
+        """Return the half-open ``[lo, hi)`` row positions covering the range."""
+        lo = 0 if start_date is None else int(self._dates.search_sorted(start_date, side="left"))
+        hi = (
+            self.height
+            if end_date is None
+            else int(self._dates.search_sorted(end_date, side="right"))
+        )
+        return lo, max(lo, hi)
+
+    def range(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: Optional[int] = None,
+    ) -> pl.DataFrame:
+        """Return rows within ``[start_date, end_date]``, keeping the last ``limit``."""
+        lo, hi = self.index_range(start_date, end_date)
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        return self._frame.slice(lo, hi - lo)
@@ -0,0 +1,69 @@
+"""Elect a single scheduler owner among the API worker processes."""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import IO, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerLock:
+    """
+    Non-blocking exclusive file lock marking the process that runs the ETL scheduler.
+
+    The lock is held for the life of the owning process and released by
+    the OS when it exits, so another worker can take over. Without
+    ``fcntl`` (non-POSIX) every process considers itself the owner.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initialize lock.
+
+        Args:
+            path: Lock file shared by all workers (created if missing)
+        """
+        self.path = path
+        self._handle: Optional[IO[str]] = None
+
+    @property
+    def held(self) -> bool:
+        return self._handle is not None
+
+    def try_acquire(self) -> bool:
+        """Take the lock if no other process holds it; never blocks."""
+        if self._handle is not None:
+            return True
+        if fcntl is None:
+            self._handle = open(os.devnull, "w")
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path, "a+")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        self._handle = handle
+        logger.info(f"Process {os.getpid()} owns the refresh scheduler ({self.path})")
+        return True
+
+    def release(self) -> None:
+        if self._handle is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+        self._handle.close()
+        self._handle = None
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from app.config import settings
+from ..config import settings
+from ..db.client import invalidate_repository
+from ..db.pool import open_read_write
+from .leader import SchedulerLock
 from .tasks import refresh_metrics_snapshot
 
 logger = logging.getLogger(__name__)
 
+REFRESH_JOB_ID = "refresh-metrics-snapshot"
+
 
 def create_scheduler() -> AsyncIOScheduler:
     """
@@ -25,7 +36,7 @@ def create_scheduler() -> AsyncIOScheduler:
         refresh_metrics_snapshot,
         "interval",
         minutes=settings.refresh_interval_minutes,
-        id="refresh-metrics-snapshot",
+        id=REFRESH_JOB_ID,
         replace_existing=True,
         coalesce=True,  # Skip duplicate runs if previous job is still running
     )
@@ -36,3 +47,74 @@ def create_scheduler() -> AsyncIOScheduler:
     )
 
     return scheduler
+
+
+def scheduler_lock_path(db_path: Path) -> Path:
+    """Lock file electing the scheduler owner; lives with the data all workers share."""
+    return db_path.parent / "scheduler.lock"
+
+
+def schedule_path(db_path: Path) -> Path:
+    """Where the scheduler owner records its refresh schedule for the other workers."""
+    return db_path.parent / "scheduler.schedule"
+
+
+def record_schedule(path: Path, first_run: datetime, interval_seconds: float) -> None:
+    """Publish an interval schedule: runs at ``first_run`` plus whole intervals."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(
+        json.dumps({"first_run": first_run.isoformat(), "interval_seconds": interval_seconds}),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, path)
+
+
+# Path -> (file identity, parsed schedule); a new record replaces the file
+_schedules: Dict[Path, Tuple[Tuple[int, int], Optional[Tuple[datetime, float]]]] = {}
+
+
+def read_schedule(path: Path) -> Optional[Tuple[datetime, float]]:
+    """The recorded ``(first_run, interval_seconds)``, or None if none was recorded."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    identity = (stat.st_ino, stat.st_mtime_ns)
+    cached = _schedules.get(path)
+    if cached is not None and cached[0] == identity:
+        return cached[1]
+    try:
+        recorded = json.loads(path.read_text(encoding="utf-8"))
+        schedule = (
+            datetime.fromisoformat(recorded["first_run"]),
+            float(recorded["interval_seconds"]),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        logger.warning(f"Ignoring unreadable refresh schedule {path}")
+        schedule = None
+    _schedules[path] = (identity, schedule)
+    return schedule
+
+
+async def run_scheduler_when_elected(scheduler: AsyncIOScheduler, lock: SchedulerLock) -> None:
+    """
+    Start ``scheduler`` once this process owns ``lock``.
+
+    With several workers exactly one runs the ETL refresh; the others keep
+    retrying so one of them takes over if the owner exits.
+    """
+    while not lock.try_acquire():
+        await asyncio.sleep(settings.refresh_interval_minutes * 60)
+    if not settings.publish_generations:
+        # This process now writes db_path in place, so it reads it read-write too
+        open_read_write(settings.db_path)
+        invalidate_repository()
+    logger.info("Starting APScheduler for metrics refresh")
+    scheduler.start()
+    # The interval trigger runs on a fixed grid from its first run, which the
+    # workers without the scheduler follow for their Cache-Control
+    record_schedule(
+        schedule_path(settings.db_path),
+        scheduler.get_job(REFRESH_JOB_ID).next_run_time,
+        settings.refresh_interval_minutes * 60,
+    )
@@ -10,7 +10,9 @@ if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
 from data.etl.pipeline import refresh_duckdb_from_samples, refresh_from_live_sources  # noqa: E402
-from app.config import settings  # noqa: E402
+from ..config import settings  # noqa: E402
+from ..db.client import invalidate_repository  # noqa: E402
+from ..services.events import announce_generation  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +28,10 @@ async def refresh_metrics_snapshot() -> Path:
     if settings.enable_live_data:
         logger.info("Refreshing metrics from live APIs...")
         try:
-            db_path = await refresh_from_live_sources()
+            db_path = await refresh_from_live_sources(publish=settings.publish_generations)
             logger.info(f"✓ Live metrics snapshot refreshed at {db_path}")
+            invalidate_repository()
+            await _announce()
             return db_path
         except Exception as e:
             logger.error(f"Live data refresh failed: {e}", exc_info=True)
@@ -38,6 +42,24 @@ async def refresh_metrics_snapshot() -> Path:
 
     # Fallback: use sample data
     loop = asyncio.get_event_loop()
-    db_path = await loop.run_in_executor(None, refresh_duckdb_from_samples)
+    db_path = await loop.run_in_executor(
+        None,
+        lambda: refresh_duckdb_from_samples(
+            db_path=settings.db_path,
+            publish=settings.publish_generations,
+            hot_days=settings.hot_window_days,
+        ),
+    )
     logger.info(f"Sample metrics snapshot refreshed at {db_path}")
+    invalidate_repository()
+    await _announce()
     return db_path
+
+
+async def _announce() -> None:
+    # Push the new generation to connected dashboards; a failure here must
+    # not fail the refresh itself
+    try:
+        await announce_generation()
+    except Exception as e:
+        logger.error(f"Failed to announce new data generation: {e}", exc_info=True)
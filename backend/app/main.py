@@ -1,27 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .api.caching import ConditionalGetMiddleware
 from .api.routes import router
-from .jobs.scheduler import create_scheduler
+from .config import settings
+from .jobs.leader import SchedulerLock
+from .jobs.scheduler import create_scheduler, run_scheduler_when_elected, scheduler_lock_path
+from .services.events import watch_generations
 
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # noqa: U100
+    # Every worker serves the shared snapshot, but only the lock owner refreshes it
     scheduler = create_scheduler()
-    logger.info("Starting APScheduler for metrics refresh")
-    scheduler.start()
+    app.state.scheduler = scheduler
+    lock = SchedulerLock(scheduler_lock_path(settings.db_path))
+    background = [
+        asyncio.create_task(run_scheduler_when_elected(scheduler, lock)),
+        asyncio.create_task(watch_generations()),
+    ]
     try:
         yield
     finally:
-        logger.info("Stopping APScheduler")
-        scheduler.shutdown(wait=False)
+        for task in background:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        if scheduler.running:
+            logger.info("Stopping APScheduler")
+            scheduler.shutdown(wait=False)
+        lock.release()
 
 
 app = FastAPI(
@@ -32,7 +48,10 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Add CORS middleware for frontend
+# Answer conditional GETs on the metrics routes before any service work
+app.add_middleware(ConditionalGetMiddleware, path_prefix="/api/metrics")
+
+# Add CORS middleware for frontend (registered last so it wraps 304s too)
 # Allow all origins for development and production flexibility
 # In production, consider restricting to specific domains for security
 app.add_middleware(
@@ -41,6 +60,7 @@ app.add_middleware(
     allow_credentials=False,  # Set to False when using allow_origins=["*"]
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 app.include_router(router, prefix="/api", tags=["metrics"])
@@ -111,9 +111,73 @@ class PoolAdoptionTrend(BaseModel):
     velocity: float  # Rate of change in adoption
 
 
+class MetricForecast(BaseModel):
+    metric: str
+    horizon_days: int
+    target_date: date
+    forecast: float
+    lower: Optional[float] = None  # 95% prediction interval, once enough history exists
+    upper: Optional[float] = None
+
+
+class ForecastResponse(BaseModel):
+    as_of: date  # Latest day the forecasters have seen
+    forecasts: List[MetricForecast]
+
+
+class CorrelationSeries(BaseModel):
+    driver: str  # Market column, e.g. "zec_price_usd"
+    metric: str  # Network column, e.g. "shielded_tx_ratio"
+    dates: List[date]
+    values: List[float]  # Correlation over the window ending on each date
+
+
+class CrossCorrelation(BaseModel):
+    driver: str
+    metric: str
+    lags: List[int]  # Positive: the driver leads the metric by that many days
+    values: List[float]
+    peak_lag: int  # Lag with the strongest (absolute) correlation
+    peak_correlation: float
+
+
+class CorrelationResponse(BaseModel):
+    window_days: int
+    method: Literal["pearson", "spearman"]
+    as_of: Optional[date]  # Last day of the lagged windows; None without market data
+    series: List[CorrelationSeries]
+    cross_correlations: List[CrossCorrelation]
+
+
 class PoolMigrationResponse(BaseModel):
     trends: List[PoolAdoptionTrend]
     current_adoption: float  # Current shielded %
     avg_7d_adoption: float  # 7-day average
     adoption_velocity: float  # Current velocity (positive = growing, negative = declining)
-    forecast_30d: float  # Simple 30-day forecast
+    forecast_30d: float  # Holt 30-day forecast of the shielded %
+    forecasts: List[MetricForecast] = []  # Shielded % forecasts at every horizon
+
+
+class TimeSeries(BaseModel):
+    metric: str
+    dates: List[date]
+    values: List[float]
+
+
+class TimeSeriesResponse(BaseModel):
+    series: List[TimeSeries]
+    total_points: int  # Days in the page (or range, when downsampled) before downsampling
+    downsampled: bool
+    next_cursor: Optional[str] = None  # Pass as ``cursor`` to fetch the next page
+
+
+class DashboardBundle(BaseModel):
+    """Every dashboard widget's data, computed from one dataset snapshot."""
+    daily: MetricsPayload
+    kpis: List[KPICard]
+    summary: MetricsSummary
+    privacy: PrivacyMetricsResponse
+    health: NetworkHealthDetailed
+    momentum: MomentumResponse
+    pool_migration: PoolMigrationResponse
+    metadata: MetadataResponse
@@ -0,0 +1,52 @@
+"""Incremental Parquet and Arrow IPC encoders for streamed exports."""
+
+from __future__ import annotations
+
+import io
+from typing import Callable, Iterable, Iterator, Mapping
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def _encode(
+    frames: Iterable[pl.DataFrame],
+    schema: Mapping[str, pl.DataType],
+    open_writer: Callable[[io.BytesIO, pa.Schema], object],
+) -> Iterator[bytes]:
+    # The schema comes from the source rather than the first chunk: a column
+    # that is null throughout one chunk would otherwise be typed Null for all
+    schema = pl.Schema(schema)
+    sink = io.BytesIO()
+    writer = open_writer(sink, pl.DataFrame(schema=schema).to_arrow().schema)
+    for frame in frames:
+        writer.write_table(frame.select(list(schema)).cast(dict(schema)).to_arrow())
+        data = _drain(sink)
+        if data:
+            yield data
+    writer.close()
+    yield _drain(sink)
+
+
+def stream_arrow_ipc(
+    frames: Iterable[pl.DataFrame], schema: Mapping[str, pl.DataType]
+) -> Iterator[bytes]:
+    """Encode frames as one Arrow IPC stream with ``schema``, one record batch per frame."""
+    return _encode(frames, schema, pa.ipc.new_stream)
+
+
+def stream_parquet(
+    frames: Iterable[pl.DataFrame], schema: Mapping[str, pl.DataType]
+) -> Iterator[bytes]:
+    """Encode frames as one zstd Parquet file with ``schema``, one row group per frame."""
+    return _encode(
+        frames, schema, lambda sink, schema: pq.ParquetWriter(sink, schema, compression="zstd")
+    )
@@ -0,0 +1,44 @@
+"""Vectorized downsampling of daily series for charting."""
+
+from __future__ import annotations
+
+import polars as pl
+
+
+def minmax_downsample(
+    frame: pl.DataFrame,
+    value_column: str,
+    max_points: int,
+    x_column: str = "date",
+) -> pl.DataFrame:
+    """
+    Reduce a series to at most ``max_points`` points, keeping each bucket's extremes.
+
+    Rows are split into ``max_points // 2`` equal-count buckets and the
+    minimum and maximum of each bucket are kept, so spikes and dips stay
+    visible however far the series is compressed. Null values are dropped.
+
+    Args:
+        frame: Rows sorted by ``x_column``
+        value_column: Column to downsample
+        max_points: Upper bound on returned points (at least 2)
+        x_column: Ordering column carried along with the values
+
+    Returns:
+        DataFrame with ``x_column`` and ``value_column``, in the original order
+    """
+    series = frame.select(x_column, value_column).drop_nulls(value_column)
+    if series.height <= max_points:
+        return series
+    buckets = max(1, max_points // 2)
+    extremes = (
+        series.with_row_index("row")
+        .with_columns((pl.col("row") * buckets // series.height).alias("bucket"))
+        .group_by("bucket")
+        .agg(
+            pl.col("row").get(pl.col(value_column).arg_min()).alias("low"),
+            pl.col("row").get(pl.col(value_column).arg_max()).alias("high"),
+        )
+    )
+    rows = pl.concat([extremes["low"], extremes["high"]]).unique().sort()
+    return series[rows]
@@ -0,0 +1,137 @@
+"""Fan-out of new-generation events to connected dashboards (Server-Sent Events)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Optional, Set, Tuple
+
+from ..db.client import BaseRepository, get_repository
+from .metrics_service import MetricsService
+
+logger = logging.getLogger(__name__)
+
+GENERATION_EVENT = "generation"
+# How often each worker checks whether another process published new data
+WATCH_INTERVAL_SECONDS = 5.0
+
+
+def format_event(event: str, data: str, event_id: Optional[str] = None) -> str:
+    """Encode one SSE message; ``data`` must be single-line JSON."""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.extend([f"event: {event}", f"data: {data}"])
+    return "\n".join(lines) + "\n\n"
+
+
+def build_generation_event(repository: Optional[BaseRepository] = None) -> Tuple[str, str]:
+    """
+    Render a dataset as a ``generation`` event.
+
+    The event carries the full dashboard bundle, so clients replace
+    their cached views without issuing a single request.
+
+    Args:
+        repository: Dataset to render (the current one by default)
+
+    Returns:
+        Tuple of (dataset version, encoded SSE message)
+    """
+    repository = repository or get_repository()
+    bundle = MetricsService(repository).get_dashboard()
+    payload = f'{{"version":"{repository.version}","dashboard":{bundle.model_dump_json()}}}'
+    return repository.version, format_event(GENERATION_EVENT, payload, repository.version)
+
+
+class GenerationBroadcaster:
+    """
+    Delivers each new-generation event to every subscriber of this process.
+
+    The message is encoded once per refresh and shared by all
+    subscribers; before the first announcement, the first subscriber
+    builds it for the rest. A subscriber that falls behind only loses
+    stale events: when its queue is full, the oldest message is dropped
+    for the newest.
+    """
+
+    def __init__(self, queue_size: int = 4) -> None:
+        """
+        Initialize broadcaster.
+
+        Args:
+            queue_size: Undelivered events kept per subscriber
+        """
+        self._queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._building = threading.Lock()
+        self.latest: Optional[Tuple[str, str]] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def is_announced(self, version: str) -> bool:
+        return self.latest is not None and self.latest[0] == version
+
+    def current_event(self) -> Tuple[str, str]:
+        """
+        The latest event, building the current generation's if none was announced yet.
+
+        Blocking: call it off the event loop. Concurrent callers wait for a
+        single build, which then counts as announced.
+        """
+        with self._building:
+            if self.latest is None:
+                self.latest = build_generation_event()
+            return self.latest
+
+    def publish(self, version: str, message: str) -> bool:
+        """Broadcast ``message`` unless ``version`` was already announced."""
+        if self.is_announced(version):
+            return False
+        self.latest = (version, message)
+        for queue in list(self._subscribers):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+        return True
+
+
+broadcaster = GenerationBroadcaster()
+
+
+async def announce_generation() -> None:
+    """Build the current generation's event off the event loop and broadcast it, if new."""
+    loop = asyncio.get_running_loop()
+    repository = await loop.run_in_executor(None, get_repository)
+    # The dashboard is only rendered for a version nobody has been sent yet
+    if broadcaster.is_announced(repository.version):
+        return
+    version, message = await loop.run_in_executor(None, build_generation_event, repository)
+    if broadcaster.publish(version, message):
+        logger.info(
+            f"Announced data version {version} to {broadcaster.subscriber_count} subscribers"
+        )
+
+
+async def watch_generations(interval: float = WATCH_INTERVAL_SECONDS) -> None:
+    """
+    Announce data published by another process (e.g. the worker that owns the scheduler).
+
+    ``get_repository()`` only stats the source files unless they changed,
+    and the dashboard is only rebuilt for a new version, so polling is cheap.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await announce_generation()
+        except Exception as e:
+            logger.warning(f"Generation watch failed: {e}")
@@ -0,0 +1,108 @@
+"""Process-wide memoization of computed service views."""
+
+from __future__ import annotations
+
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+from ..config import settings
+
+T = TypeVar("T")
+
+
+class MemoCache:
+    """
+    Bounded LRU cache with single-flight computation.
+
+    Concurrent misses on the same key wait for the first caller's result
+    instead of computing it again. Failures are handed to every waiter and
+    never cached.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Maximum number of cached results before LRU eviction
+        """
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._pending: Dict[Hashable, Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            pending = self._pending.get(key)
+            if pending is None:
+                self.misses += 1
+                owner = Future()
+                self._pending[key] = owner
+            else:
+                self.hits += 1
+        if pending is not None:
+            return pending.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            owner.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[key]
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        owner.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+view_cache = MemoCache(maxsize=settings.memo_cache_size)
+
+
+def memoized(method: Callable[..., T]) -> Callable[..., T]:
+    """
+    Cache a ``MetricsService`` method per (method, arguments, dataset version).
+
+    Results are shared between requests, so callers must not mutate them.
+    Entries for older dataset versions simply age out of the LRU.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args: Any, **kwargs: Any) -> T:
+        key = (
+            method.__name__,
+            args,
+            tuple(sorted(kwargs.items())),
+            self._repository.version,
+        )
+        return view_cache.get_or_compute(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
@@ -1,37 +1,207 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
 
-from ..db.client import DataRepository, get_repository
+import polars as pl
+
+from ..db.client import BaseRepository, WindowRepository, get_repository
 from ..models.metrics import (
     Alert,
     AlertFeed,
+    CorrelationResponse,
     DailyMetric,
+    DashboardBundle,
     ExportFormat,
+    ForecastResponse,
     KPICard,
     MetadataResponse,
     MetricsPayload,
     MetricsSummary,
     MomentumResponse,
     NetworkHealthDetailed,
-    PoolAdoptionTrend,
     PoolMigrationResponse,
     PrivacyMetricsResponse,
-    PrivacyTrend,
+    TimeSeries,
+    TimeSeriesResponse,
 )
+from .columnar import stream_arrow_ipc, stream_parquet
+from .downsampling import minmax_downsample
 from .insights_service import InsightBuilder
+from .memo import memoized
+from .serialization import conform_frame, render_json_payload
+
+# Importable once ..db.client has put the repository root on sys.path
+from data.etl.transformers.alert_generator import ALERT_SCHEMA  # noqa: E402
+from data.etl.transformers.correlations import WINDOWS as CORRELATION_WINDOWS  # noqa: E402
+from data.etl.transformers.forecasting import FORECAST_METRICS  # noqa: E402
+from data.etl.transformers.rollups import ROLLUP_METRICS, STATISTICS  # noqa: E402
+
+# Columns included in metrics exports: the daily schema plus market data when present.
+# Rolling aggregates and other derived analytics stay internal.
+EXPORT_COLUMNS = list(DailyMetric.model_fields) + [
+    "zec_price_usd",
+    "market_cap_usd",
+    "trading_volume_usd",
+]
+# Series returned by the time-series API when no metrics are requested
+DEFAULT_SERIES = [name for name in DailyMetric.model_fields if name != "date"]
+# Rows per chunk when streaming exports; bounds memory regardless of range length
+EXPORT_CHUNK_ROWS = 1000
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _baseline_health(
+    value: str,
+    baseline: str,
+    *,
+    higher_is_better: bool,
+    warning: float = 0.1,
+    critical: float = 0.2,
+) -> pl.Expr:
+    """Classify ``value`` against ``baseline`` as "good", "warning" or "critical" per row."""
+    delta = (pl.col(value) - pl.col(baseline)) / pl.col(baseline)
+    if not higher_is_better:
+        # Lower is better (e.g., fees)
+        delta = -delta
+    return (
+        pl.when(pl.col(baseline) == 0)
+        .then(pl.lit("good"))
+        .when(delta <= -critical)
+        .then(pl.lit("critical"))
+        .when(delta <= -warning)
+        .then(pl.lit("warning"))
+        .otherwise(pl.lit("good"))
+    )
 
 
 class MetricsService:
-    def __init__(self, repository: Optional[DataRepository] = None) -> None:
+    def __init__(self, repository: Optional[BaseRepository] = None) -> None:
         self._repository = repository or get_repository()
         self._insights = InsightBuilder()
 
+    @memoized
     def get_daily_metrics(self, limit: int = 30) -> MetricsPayload:
         frame = self._repository.get_daily_metrics(limit)
         metrics = [DailyMetric.model_validate(row) for row in frame.to_dicts()]
         return MetricsPayload(data=metrics)
 
+    @memoized
+    def get_daily_metrics_json(self, limit: int = 30) -> bytes:
+        """``get_daily_metrics`` rendered as JSON bytes straight from the frame."""
+        frame = conform_frame(self._repository.get_daily_metrics(limit), DailyMetric)
+        return render_json_payload(frame)
+
+    @memoized
+    def get_rollups_json(
+        self,
+        grain: str,
+        metrics: Sequence[str] = (),
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> bytes:
+        """
+        Week, month or quarter buckets as ``{"buckets": [...]}`` JSON bytes.
+
+        Each bucket carries ``bucket_start``, ``bucket_end``, ``days`` and
+        ``<metric>_<sum|mean|min|max|last>`` for every requested metric (all
+        rollup metrics when none are given).
+
+        Raises:
+            ValueError: If a requested metric is not rolled up
+        """
+        unknown = [name for name in metrics if name not in ROLLUP_METRICS]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+        frame = self._repository.get_rollups(grain, limit, start_date, end_date)
+        columns = [
+            f"{name}_{statistic}"
+            for name in (metrics or ROLLUP_METRICS)
+            for statistic in STATISTICS
+        ]
+        return render_json_payload(
+            frame.select("bucket_start", "bucket_end", "days", *columns), key="buckets"
+        )
+
+    @memoized
+    def get_timeseries(
+        self,
+        metrics: Sequence[str] = (),
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 1000,
+        max_points: Optional[int] = None,
+    ) -> TimeSeriesResponse:
+        """
+        Daily series over an arbitrary range, paginated or downsampled.
+
+        Without ``max_points`` this returns up to ``limit`` days after
+        ``cursor`` (or from ``start_date``) plus the cursor of the next page.
+        With ``max_points`` the whole range is reduced to at most that many
+        points per series by min/max bucketing, in a single page.
+
+        Raises:
+            ValueError: If a requested metric is not a numeric daily column
+        """
+        if cursor is not None:
+            after = date.fromisoformat(cursor) + timedelta(days=1)
+            start_date = max(after, date.fromisoformat(start_date)) if start_date else after
+        page_size = None if max_points is not None else limit
+
+        # Read only as far as needed: one row past the page tells us whether more follow
+        chunks: List[pl.DataFrame] = []
+        height = 0
+        for chunk in self._repository.iter_daily_metrics(start_date, end_date, EXPORT_CHUNK_ROWS):
+            chunks.append(chunk)
+            height += chunk.height
+            if page_size is not None and height > page_size:
+                break
+        frame = pl.concat(chunks, how="diagonal_relaxed") if chunks else pl.DataFrame()
+
+        names = list(metrics) or [name for name in DEFAULT_SERIES if name in frame.columns]
+        numeric = {name for name, dtype in frame.schema.items() if dtype.is_numeric()}
+        unknown = [name for name in names if frame.height and name not in numeric]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+
+        next_cursor = None
+        if page_size is not None and frame.height > page_size:
+            frame = frame.head(page_size)
+            next_cursor = frame["date"][-1].isoformat()
+
+        series = []
+        for name in names:
+            if frame.height == 0:
+                series.append(TimeSeries(metric=name, dates=[], values=[]))
+                continue
+            points = (
+                minmax_downsample(frame, name, max_points)
+                if max_points is not None
+                else frame.select("date", name).drop_nulls(name)
+            )
+            series.append(
+                TimeSeries(
+                    metric=name,
+                    dates=points["date"].to_list(),
+                    values=points[name].cast(pl.Float64).to_list(),
+                )
+            )
+        return TimeSeriesResponse(
+            series=series,
+            total_points=frame.height,
+            downsampled=max_points is not None and frame.height > max_points,
+            next_cursor=next_cursor,
+        )
+
+    @memoized
     def get_kpis(self) -> List[KPICard]:
         latest = self._repository.get_latest_row()
         previous = self._repository.get_previous_row()
@@ -88,44 +258,68 @@ class MetricsService:
         )
         return cards
 
-    def get_alerts(self, limit: int = 10) -> AlertFeed:
-        alerts = [Alert.model_validate(alert) for alert in self._repository.get_alerts(limit)]
+    @memoized
+    def get_alerts(
+        self,
+        limit: int = 10,
+        *,
+        severity: Optional[str] = None,
+        metric: Optional[str] = None,
+        alert_type: Optional[str] = None,
+        before: Optional[datetime] = None,
+        after: Optional[datetime] = None,
+        offset: int = 0,
+    ) -> AlertFeed:
+        rows = self._repository.query_alerts(
+            severity=severity,
+            metric=metric,
+            alert_type=alert_type,
+            before=before,
+            after=after,
+            limit=limit,
+            offset=offset,
+        )
+        alerts = [Alert.model_validate(alert) for alert in rows]
         return AlertFeed(alerts=alerts)
 
+    @memoized
     def get_summary(self) -> MetricsSummary:
-        frame = self._repository.get_daily_metrics(limit=30)
-        ordered = frame.sort("date")
-        latest_row = ordered.tail(1).row(0, named=True)
-        window = ordered.tail(7)
-        total_avg = float(window["total_transactions"].mean())
-        shielded_avg = float(window["shielded_tx_ratio"].mean())
-        fee_avg = float(window["avg_fee_zec"].mean())
-        address_avg = float(window["active_addresses"].mean())
-
-        throughput_health = self._compare_to_baseline(
-            latest_row["total_transactions"], total_avg, higher_is_better=True
-        )
-        privacy_health = self._compare_to_baseline(
-            latest_row["shielded_tx_ratio"], shielded_avg, higher_is_better=True, warning=0.05, critical=0.1
-        )
-        cost_health = self._compare_to_baseline(
-            latest_row["avg_fee_zec"], fee_avg, higher_is_better=False, warning=0.15, critical=0.3
-        )
-        participation_health = self._compare_to_baseline(
-            latest_row["active_addresses"], address_avg, higher_is_better=True
+        latest = (
+            self._repository.get_daily_metrics(limit=1)
+            .lazy()
+            .select(
+                "date",
+                pl.col("total_transactions_mean_7d").cast(pl.Float64).alias("total_avg"),
+                pl.col("shielded_tx_ratio_mean_7d").cast(pl.Float64).alias("shielded_avg"),
+                pl.col("avg_fee_zec_mean_7d").cast(pl.Float64).alias("fee_avg"),
+                pl.col("active_addresses_mean_7d").cast(pl.Float64).alias("address_avg"),
+                _baseline_health(
+                    "total_transactions", "total_transactions_mean_7d", higher_is_better=True
+                ).alias("throughput"),
+                _baseline_health(
+                    "shielded_tx_ratio", "shielded_tx_ratio_mean_7d",
+                    higher_is_better=True, warning=0.05, critical=0.1,
+                ).alias("privacy"),
+                _baseline_health(
+                    "avg_fee_zec", "avg_fee_zec_mean_7d",
+                    higher_is_better=False, warning=0.15, critical=0.3,
+                ).alias("cost"),
+                _baseline_health(
+                    "active_addresses", "active_addresses_mean_7d", higher_is_better=True
+                ).alias("participation"),
+            )
+            .collect()
+            .row(0, named=True)
         )
-
         return MetricsSummary(
-            latest_date=latest_row["date"],
-            total_transactions_7d_avg=round(total_avg, 2),
-            shielded_tx_ratio_7d_avg=round(shielded_avg, 4),
-            avg_fee_7d_avg=round(fee_avg, 6),
-            active_addresses_7d_avg=round(address_avg, 2),
+            latest_date=latest["date"],
+            total_transactions_7d_avg=round(latest["total_avg"], 2),
+            shielded_tx_ratio_7d_avg=round(latest["shielded_avg"], 4),
+            avg_fee_7d_avg=round(latest["fee_avg"], 6),
+            active_addresses_7d_avg=round(latest["address_avg"], 2),
             health={
-                "throughput": throughput_health,
-                "privacy": privacy_health,
-                "cost": cost_health,
-                "participation": participation_health,
+                component: latest[component]
+                for component in ("throughput", "privacy", "cost", "participation")
             },
         )
 
@@ -201,61 +395,30 @@ class MetricsService:
             return "critical"
         return "warning"
 
-    @staticmethod
-    def _compare_to_baseline(
-        value: float,
-        baseline: float,
-        *,
-        higher_is_better: bool,
-        warning: float = 0.1,
-        critical: float = 0.2,
-    ) -> str:
-        if baseline == 0:
-            return "good"
-        delta = (value - baseline) / baseline
-        if higher_is_better:
-            if delta >= warning:
-                return "good"
-            if delta <= -critical:
-                return "critical"
-            if delta <= -warning:
-                return "warning"
-            return "good"
-        # Lower is better (e.g., fees)
-        if delta <= -warning:
-            return "good"
-        if delta >= critical:
-            return "critical"
-        if delta >= warning:
-            return "warning"
-        return "good"
-
+    @memoized
     def get_privacy_metrics(self, days: int = 30) -> PrivacyMetricsResponse:
         """Calculate privacy-focused metrics from existing data."""
-        frame = self._repository.get_daily_metrics(days)
-        trends = []
-
-        for row in frame.to_dicts():
-            # Privacy score: weighted average (tx ratio 60%, volume ratio 40%)
-            score = (row['shielded_tx_ratio'] * 0.6 +
-                     row['shielded_volume_ratio'] * 0.4) * 100
-            trends.append(PrivacyTrend(
-                date=row['date'],
-                shielded_tx_pct=round(row['shielded_tx_ratio'] * 100, 2),
-                shielded_volume_pct=round(row['shielded_volume_ratio'] * 100, 2),
-                privacy_score=round(score, 2)
-            ))
-
-        latest = trends[-1].privacy_score
-        avg_7d = sum(t.privacy_score for t in trends[-7:]) / 7
-        grade = self._calculate_privacy_grade(avg_7d)
-
-        return PrivacyMetricsResponse(
-            trends=trends,
-            latest_score=latest,
-            avg_7d_score=round(avg_7d, 2),
-            privacy_grade=grade
-        )
+        plan = self._repository.get_daily_metrics(days).lazy()
+        trends, latest = pl.collect_all([
+            plan.select(
+                "date",
+                (pl.col("shielded_tx_ratio") * 100).round(2).alias("shielded_tx_pct"),
+                (pl.col("shielded_volume_ratio") * 100).round(2).alias("shielded_volume_pct"),
+                pl.col("privacy_score").round(2),
+            ),
+            plan.select(
+                pl.col("privacy_score").last().round(2).alias("latest_score"),
+                # Over the window's last 7 reported scores, a shorter window counting as zeros
+                (pl.col("privacy_score").round(2).tail(7).sum() / 7).alias("avg_7d_score"),
+            ),
+        ])
+        latest = latest.row(0, named=True)
+        return PrivacyMetricsResponse.model_validate({
+            "trends": trends.to_dicts(),
+            "latest_score": latest["latest_score"],
+            "avg_7d_score": round(latest["avg_7d_score"], 2),
+            "privacy_grade": self._calculate_privacy_grade(latest["avg_7d_score"]),
+        })
 
     @staticmethod
     def _calculate_privacy_grade(score: float) -> str:
@@ -268,6 +431,7 @@ class MetricsService:
             return "Fair"
         return "Poor"
 
+    @memoized
     def get_network_health_detailed(self) -> NetworkHealthDetailed:
         """Enhanced health score with component breakdown."""
         summary = self.get_summary()
@@ -306,16 +470,14 @@ class MetricsService:
             issues=issues
         )
 
+    @memoized
     def get_momentum(self) -> MomentumResponse:
         """Calculate Shielded Pool Momentum Index."""
-        frame = self._repository.get_daily_metrics(limit=30)
-
-        # Calculate 7-day momentum
-        recent_7d = frame.tail(7)
-        momentum_7d = self._calculate_momentum_score(recent_7d)
+        latest = self._repository.get_latest_row()
 
-        # Calculate 30-day momentum
-        momentum_30d = self._calculate_momentum_score(frame)
+        # 7-day and 30-day momentum are maintained by the ETL
+        momentum_7d = latest['momentum_7d']
+        momentum_30d = latest['momentum_30d']
 
         # Determine trend
         if momentum_7d > momentum_30d + 5:
@@ -342,36 +504,22 @@ class MetricsService:
             interpretation=interpretation
         )
 
-    @staticmethod
-    def _calculate_momentum_score(frame) -> float:
-        """
-        Calculate momentum score: (Δ shielded_volume / Δ transparent_volume) * 100
-        Positive = pro-privacy trend, Negative = pro-transparency trend
-        """
-        if len(frame) < 2:
-            return 0.0
-
-        # Get first and last values
-        first = frame.head(1).row(0, named=True)
-        last = frame.tail(1).row(0, named=True)
-
-        # Calculate deltas
-        delta_shielded = last['shielded_volume_zec'] - first['shielded_volume_zec']
-        delta_transparent = last['transparent_volume_zec'] - first['transparent_volume_zec']
-
-        # Avoid division by zero
-        if delta_transparent == 0:
-            return 100.0 if delta_shielded > 0 else -100.0
-
-        # Calculate momentum
-        momentum = (delta_shielded / delta_transparent) * 100
-
-        # Cap at reasonable bounds
-        return max(-100.0, min(100.0, momentum))
+    def get_dashboard(self, days: int = 30) -> DashboardBundle:
+        """All dashboard views from one repository snapshot and a single window read."""
+        view = MetricsService(WindowRepository(self._repository, days))
+        return DashboardBundle(
+            daily=view.get_daily_metrics(limit=days),
+            kpis=view.get_kpis(),
+            summary=view.get_summary(),
+            privacy=view.get_privacy_metrics(days=days),
+            health=view.get_network_health_detailed(),
+            momentum=view.get_momentum(),
+            pool_migration=view.get_pool_migration(days=days),
+            metadata=view.get_metadata(),
+        )
 
     def get_metadata(self) -> MetadataResponse:
         """Get metadata about the current dataset."""
-        from datetime import datetime, timedelta
         from ..config import settings
 
         frame = self._repository.get_daily_metrics(limit=1)
@@ -387,8 +535,7 @@ class MetricsService:
             next_refresh = datetime.now() + timedelta(minutes=settings.refresh_interval_minutes)
 
         # Get total record count
-        all_data = self._repository.get_daily_metrics(limit=1000)
-        total_records = len(all_data)
+        total_records = self._repository.count_daily_metrics()
 
         return MetadataResponse(
             last_updated=last_updated,
@@ -397,129 +544,220 @@ class MetricsService:
             total_records=total_records
         )
 
-    def export_metrics_csv(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> str:
-        """Export metrics data as CSV string."""
-        import polars as pl
-        from datetime import date as dt_date, timedelta
-
-        # Get data
-        frame = self._repository.get_daily_metrics(limit=1000)
-
-        # Filter by date range if provided
-        if start_date or end_date:
-            if start_date:
-                frame = frame.filter(pl.col("date") >= start_date)
-            if end_date:
-                frame = frame.filter(pl.col("date") <= end_date)
-
-        # Convert to CSV
-        csv_str = frame.write_csv()
-        return csv_str
-
-    def export_alerts_csv(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> str:
-        """Export alerts data as CSV string."""
-        import polars as pl
-
-        # Get alerts from database
-        alerts_data = self._repository.get_alerts(limit=1000)
-
-        # Convert to DataFrame
-        df = pl.DataFrame(alerts_data)
-
-        # Filter by date range if provided
-        if start_date or end_date:
-            if start_date:
-                df = df.filter(pl.col("timestamp") >= start_date)
-            if end_date:
-                df = df.filter(pl.col("timestamp") <= end_date)
-
-        # Convert to CSV
-        csv_str = df.write_csv()
-        return csv_str
-
-    def export_metrics_json(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[dict]:
-        """Export metrics data as JSON."""
-        import polars as pl
+    def _metric_export_schema(self) -> pl.Schema:
+        """Export columns the source has, typed as the source stores them."""
+        source = self._repository.get_daily_metrics_schema()
+        return pl.Schema({column: source[column] for column in EXPORT_COLUMNS if column in source})
+
+    def _metric_export_chunks(
+        self, start_date: Optional[str], end_date: Optional[str]
+    ) -> Iterator[pl.DataFrame]:
+        """Export columns of every day in the range, chunk by chunk, with a stable header."""
+        schema = self._metric_export_schema()
+        for chunk in self._repository.iter_daily_metrics(start_date, end_date, EXPORT_CHUNK_ROWS):
+            # Archived partitions may predate a column or store a narrower type
+            yield chunk.select(
+                (pl.col(column) if column in chunk.columns else pl.lit(None)).cast(dtype).alias(column)
+                for column, dtype in schema.items()
+            )
 
-        # Get data
-        frame = self._repository.get_daily_metrics(limit=1000)
+    @staticmethod
+    def _alert_export_range(
+        start_date: Optional[str], end_date: Optional[str]
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """``(after, before)`` bounds of alerts on or between the given days."""
+        after = before = None
+        if start_date:
+            after = datetime.combine(date.fromisoformat(start_date), datetime.min.time())
+        if end_date:
+            next_day = date.fromisoformat(end_date) + timedelta(days=1)
+            before = datetime.combine(next_day, datetime.min.time())
+        return after, before
+
+    def _alert_export_pages(
+        self, start_date: Optional[str], end_date: Optional[str]
+    ) -> Iterator[List[dict]]:
+        """Alerts whose timestamp falls on or between the given days, newest first."""
+        after, before = self._alert_export_range(start_date, end_date)
+        return self._repository.iter_alerts(
+            before=before, after=after, chunk_size=EXPORT_CHUNK_ROWS
+        )
 
-        # Filter by date range if provided
-        if start_date or end_date:
-            if start_date:
-                frame = frame.filter(pl.col("date") >= start_date)
-            if end_date:
-                frame = frame.filter(pl.col("date") <= end_date)
+    def _alert_export_frames(
+        self, start_date: Optional[str], end_date: Optional[str]
+    ) -> Iterator[pl.DataFrame]:
+        """The same alerts as ``ALERT_SCHEMA`` frames, read without going through dicts."""
+        after, before = self._alert_export_range(start_date, end_date)
+        return self._repository.iter_alert_frames(
+            before=before, after=after, chunk_size=EXPORT_CHUNK_ROWS
+        )
 
-        # Convert to list of dicts
-        return frame.to_dicts()
+    def export_metrics_csv(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Iterator[str]:
+        """Stream metrics data as CSV text chunks."""
+        for index, chunk in enumerate(self._metric_export_chunks(start_date, end_date)):
+            yield chunk.write_csv(include_header=index == 0)
+
+    def export_alerts_csv(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Iterator[str]:
+        """Stream alerts data as CSV text chunks."""
+        for index, page in enumerate(self._alert_export_pages(start_date, end_date)):
+            yield pl.DataFrame(page).write_csv(include_header=index == 0)
+
+    def export_metrics_json(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Iterator[str]:
+        """Stream metrics data as chunks of one JSON array."""
+        yield "["
+        for index, chunk in enumerate(self._metric_export_chunks(start_date, end_date)):
+            # Splice each chunk's array body into the enclosing array
+            yield ("," if index else "") + chunk.write_json()[1:-1]
+        yield "]"
+
+    def export_alerts_json(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Iterator[str]:
+        """Stream alerts data as chunks of one JSON array."""
+        yield "["
+        for index, page in enumerate(self._alert_export_pages(start_date, end_date)):
+            body = json.dumps(page, default=_json_default)[1:-1]
+            yield ("," if index else "") + body
+        yield "]"
+
+    def export_metrics_parquet(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """Stream metrics data as a Parquet file, one row group per chunk."""
+        return stream_parquet(
+            self._metric_export_chunks(start_date, end_date), self._metric_export_schema()
+        )
 
-    def export_alerts_json(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[dict]:
-        """Export alerts data as JSON."""
-        import polars as pl
+    def export_metrics_arrow(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """Stream metrics data in the Arrow IPC stream format."""
+        return stream_arrow_ipc(
+            self._metric_export_chunks(start_date, end_date), self._metric_export_schema()
+        )
 
-        # Get alerts from database
-        alerts_data = self._repository.get_alerts(limit=1000)
+    def export_alerts_parquet(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """Stream alerts data as a Parquet file, one row group per page."""
+        return stream_parquet(self._alert_export_frames(start_date, end_date), ALERT_SCHEMA)
+
+    def export_alerts_arrow(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """Stream alerts data in the Arrow IPC stream format."""
+        return stream_arrow_ipc(self._alert_export_frames(start_date, end_date), ALERT_SCHEMA)
+
+    @memoized
+    def get_correlations(
+        self, window: int = 30, method: str = "pearson", days: int = 90
+    ) -> CorrelationResponse:
+        """
+        Rolling correlations over the last ``days`` and the latest lag profile per pair.
 
-        # Convert to DataFrame
-        df = pl.DataFrame(alerts_data)
+        Both are precomputed by the ETL for every window and method; this
+        only selects and reshapes them.
 
-        # Filter by date range if provided
-        if start_date or end_date:
-            if start_date:
-                df = df.filter(pl.col("timestamp") >= start_date)
-            if end_date:
-                df = df.filter(pl.col("timestamp") <= end_date)
+        Raises:
+            ValueError: If ``window`` is not one of the precomputed windows
+        """
+        if window not in CORRELATION_WINDOWS:
+            raise ValueError(f"Unsupported window {window}; use one of {CORRELATION_WINDOWS}")
+        latest = self._repository.get_latest_row()["date"]
+        rolling = self._repository.get_correlations(
+            window, method, start_date=latest - timedelta(days=days - 1)
+        )
+        lagged = self._repository.get_cross_correlations(window, method)
+        series, profiles = pl.collect_all([
+            rolling.lazy()
+            .group_by("driver", "metric", maintain_order=True)
+            .agg(pl.col("date").alias("dates"), pl.col("correlation").round(4).alias("values")),
+            lagged.lazy()
+            .group_by("driver", "metric", maintain_order=True)
+            .agg(
+                pl.col("lag").alias("lags"),
+                pl.col("correlation").round(4).alias("values"),
+                pl.col("lag").get(pl.col("correlation").abs().arg_max()).alias("peak_lag"),
+                pl.col("correlation")
+                .get(pl.col("correlation").abs().arg_max())
+                .round(4)
+                .alias("peak_correlation"),
+            ),
+        ])
+        return CorrelationResponse.model_validate({
+            "window_days": window,
+            "method": method,
+            "as_of": lagged["as_of"].max() if lagged.height else None,
+            "series": series.to_dicts(),
+            "cross_correlations": profiles.to_dicts(),
+        })
+
+    @memoized
+    def get_forecasts(self, metrics: Sequence[str] = ()) -> ForecastResponse:
+        """
+        Stored 7/30/90-day forecasts with 95% intervals, as of the latest day.
 
-        # Convert to list of dicts
-        return df.to_dicts()
+        Raises:
+            ValueError: If a requested metric is not forecast
+        """
+        unknown = [name for name in metrics if name not in FORECAST_METRICS]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+        frame = self._repository.get_forecasts()
+        if metrics:
+            frame = frame.filter(pl.col("metric").is_in(list(metrics)))
+        if frame.height == 0:
+            latest = self._repository.get_latest_row()["date"]
+        else:
+            latest = frame["as_of"].max()
+        return ForecastResponse.model_validate({
+            "as_of": latest,
+            "forecasts": frame.drop("as_of").to_dicts(),
+        })
 
+    @memoized
     def get_pool_migration(self, days: int = 30) -> PoolMigrationResponse:
-        """Calculate shielded pool adoption trends and migration velocity."""
-        frame = self._repository.get_daily_metrics(limit=days)
-
-        trends = []
-        velocities = []
-
-        rows = frame.to_dicts()
-
-        for i, row in enumerate(rows):
-            adoption_pct = row['shielded_tx_ratio'] * 100
-
-            # Calculate velocity (rate of change)
-            if i > 0:
-                prev_adoption = rows[i-1]['shielded_tx_ratio'] * 100
-                velocity = adoption_pct - prev_adoption
-            else:
-                velocity = 0.0
-
-            velocities.append(velocity)
-
-            trends.append(PoolAdoptionTrend(
-                date=row['date'],
-                shielded_adoption_pct=round(adoption_pct, 2),
-                velocity=round(velocity, 3)
-            ))
-
-        # Current stats
-        latest = rows[-1]
-        current_adoption = latest['shielded_tx_ratio'] * 100
-
-        # 7-day average
-        recent_7d = rows[-7:] if len(rows) >= 7 else rows
-        avg_7d = sum(r['shielded_tx_ratio'] for r in recent_7d) / len(recent_7d) * 100
-
-        # Current velocity (avg of last 7 days)
-        avg_velocity = sum(velocities[-7:]) / min(7, len(velocities)) if velocities else 0.0
-
-        # Simple forecast: current + (velocity * 30)
-        forecast_30d = current_adoption + (avg_velocity * 30)
-        forecast_30d = max(0, min(100, forecast_30d))  # Cap at 0-100%
-
-        return PoolMigrationResponse(
-            trends=trends,
-            current_adoption=round(current_adoption, 2),
-            avg_7d_adoption=round(avg_7d, 2),
-            adoption_velocity=round(avg_velocity, 3),
-            forecast_30d=round(forecast_30d, 2)
+        """Calculate shielded pool adoption trends, migration velocity and its forecast."""
+        # Velocity is the day-over-day change in adoption within the window,
+        # so the window's first day has none
+        plan = (
+            self._repository.get_daily_metrics(limit=days)
+            .lazy()
+            .with_columns((pl.col("shielded_tx_ratio") * 100).alias("adoption_pct"))
+            .with_columns(pl.col("adoption_pct").diff().fill_null(0.0).alias("velocity"))
+        )
+        trends, latest = pl.collect_all([
+            plan.select(
+                "date",
+                pl.col("adoption_pct").round(2).alias("shielded_adoption_pct"),
+                pl.col("velocity").round(3),
+            ),
+            plan.select(
+                pl.col("adoption_pct").last().alias("current_adoption"),
+                pl.col("adoption_pct").tail(7).mean().alias("avg_7d_adoption"),
+                # Current velocity: average of the last 7 days
+                pl.col("velocity").tail(7).mean().alias("adoption_velocity"),
+            ),
+        ])
+        latest = latest.row(0, named=True)
+        # Fitted and stored by the ETL; reading it costs no model work per request
+        forecasts = self.get_forecasts(("shielded_adoption_pct",)).forecasts
+        forecast_30d = next(
+            (forecast.forecast for forecast in forecasts if forecast.horizon_days == 30),
+            # Without a stored 30-day horizon, extrapolate the current velocity
+            min(max(latest["current_adoption"] + latest["adoption_velocity"] * 30, 0), 100),
         )
+        return PoolMigrationResponse.model_validate({
+            "trends": trends.to_dicts(),
+            "current_adoption": round(latest["current_adoption"], 2),
+            "avg_7d_adoption": round(latest["avg_7d_adoption"], 2),
+            "adoption_velocity": round(latest["adoption_velocity"], 3),
+            "forecast_30d": round(forecast_30d, 2),
+            "forecasts": forecasts,
+        })
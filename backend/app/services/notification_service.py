@@ -200,7 +200,7 @@ async def send_alerts_if_configured(alerts: list):
     Args:
         alerts: List of alert dictionaries
     """
-    from app.config import settings
+    from ..config import settings
 
     if not alerts:
         return
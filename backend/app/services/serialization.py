@@ -0,0 +1,56 @@
+"""Render list responses straight from Polars frames as JSON bytes."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Dict, Type
+
+import annotated_types
+import polars as pl
+from pydantic import BaseModel
+
+_POLARS_TYPES = {
+    int: pl.Int64,
+    float: pl.Float64,
+    date: pl.Date,
+    datetime: pl.Datetime,
+    str: pl.String,
+}
+
+
+def model_schema(model: Type[BaseModel]) -> Dict[str, pl.DataType]:
+    """Polars dtype for each field of a flat, scalar-only model."""
+    return {name: _POLARS_TYPES[field.annotation] for name, field in model.model_fields.items()}
+
+
+def conform_frame(frame: pl.DataFrame, model: Type[BaseModel]) -> pl.DataFrame:
+    """
+    Select and cast ``model``'s columns, enforcing what per-row validation would.
+
+    Checks run on whole columns: every field must be present, castable,
+    non-null, and within its ``ge``/``le`` bounds.
+
+    Raises:
+        ValueError: If the frame does not satisfy the model
+    """
+    schema = model_schema(model)
+    missing = [name for name in schema if name not in frame.columns]
+    if missing:
+        raise ValueError(f"{model.__name__} columns missing from frame: {missing}")
+    conformed = frame.select(pl.col(name).cast(dtype, strict=True) for name, dtype in schema.items())
+
+    nulls = [name for name, count in conformed.null_count().row(0, named=True).items() if count]
+    if nulls:
+        raise ValueError(f"{model.__name__} fields with null values: {nulls}")
+    for name, field in model.model_fields.items():
+        for bound in field.metadata:
+            if isinstance(bound, annotated_types.Ge) and (conformed[name] < bound.ge).any():
+                raise ValueError(f"{model.__name__}.{name} below {bound.ge}")
+            if isinstance(bound, annotated_types.Le) and (conformed[name] > bound.le).any():
+                raise ValueError(f"{model.__name__}.{name} above {bound.le}")
+    return conformed
+
+
+def render_json_payload(frame: pl.DataFrame, key: str = "data") -> bytes:
+    """Render ``{"<key>": [row, ...]}`` with Polars' native JSON writer."""
+    return b'{"' + key.encode("utf-8") + b'":' + frame.write_json().encode("utf-8") + b"}"
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import random
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from data.etl.transformers.correlations import (
+    LAGS,
+    WINDOWS,
+    compute_correlations,
+    compute_cross_correlations,
+)
+
+SAMPLE_DIR = Path(__file__).resolve().parents[2] / "data" / "sample"
+LEAD_DAYS = 5
+
+
+def _history(days: int = 150) -> pl.DataFrame:
+    rng = random.Random(7)
+    prices = [40.0]
+    for _ in range(days - 1):
+        prices.append(prices[-1] * (1 + rng.gauss(0, 0.04)))
+    return pl.DataFrame({
+        "date": [date(2025, 1, 1) + timedelta(days=i) for i in range(days)],
+        "total_transactions": [20000 + rng.randint(0, 900) for _ in range(days)],
+        "shielded_transactions": [5000 + rng.randint(0, 400) for _ in range(days)],
+        "transparent_transactions": [15000] * days,
+        "shielded_volume_zec": [rng.uniform(1000, 2000) for _ in range(days)],
+        "transparent_volume_zec": [5000.0] * days,
+        "median_fee_zec": [0.0001] * days,
+        "avg_block_time_seconds": [75.0] * days,
+        "active_addresses": [12000] * days,
+        "zec_price_usd": prices,
+        # Every 9th day has no market data
+        "trading_volume_usd": [rng.uniform(1e6, 2e6) if i % 9 else None for i in range(days)],
+    }).with_columns(
+        # Fees follow the price LEAD_DAYS later
+        (pl.col("zec_price_usd").shift(LEAD_DAYS).fill_null(40.0) * 1e-5).alias("avg_fee_zec")
+    )
+
+
+def test_correlations_match_direct_window_computations():
+    history = _history()
+    full = history.with_columns(
+        (pl.col("shielded_transactions") / pl.col("total_transactions")).alias("shielded_tx_ratio")
+    )
+
+    lagged = compute_cross_correlations(history)
+    fees = lagged.filter(
+        (pl.col("window_days") == 90) & (pl.col("driver") == "zec_price_usd")
+        & (pl.col("metric") == "avg_fee_zec")
+    )
+    for method in ("pearson", "spearman"):
+        profile = fees.filter(pl.col("method") == method)
+        assert profile["lag"].to_list() == list(LAGS)
+        assert profile["lag"][profile["correlation"].abs().arg_max()] == LEAD_DAYS
+    for window in WINDOWS:
+        for lag in (-3, 0, 14):
+            driver = full["trading_volume_usd"].shift(lag).tail(window)
+            metric = full["shielded_tx_ratio"].tail(window)
+            row = lagged.filter(
+                (pl.col("window_days") == window) & (pl.col("lag") == lag)
+                & (pl.col("method") == "spearman") & (pl.col("driver") == "trading_volume_usd")
+                & (pl.col("metric") == "shielded_tx_ratio")
+            ).row(0, named=True)
+            expected = pl.DataFrame({"x": driver, "y": metric}).select(
+                pl.corr("x", "y", method="spearman")
+            ).item()
+            assert row["correlation"] == pytest.approx(expected)
+            assert row["days"] == (driver.is_not_null() & metric.is_not_null()).sum()
+
+    rolling = compute_correlations(history)
+    end = history["date"][100]
+    window = full.filter((pl.col("date") > end - timedelta(days=30)) & (pl.col("date") <= end))
+    row = rolling.filter(
+        (pl.col("date") == end) & (pl.col("window_days") == 30) & (pl.col("method") == "pearson")
+        & (pl.col("driver") == "trading_volume_usd") & (pl.col("metric") == "shielded_volume_zec")
+    ).row(0, named=True)
+    assert row["correlation"] == pytest.approx(
+        window.select(pl.corr("trading_volume_usd", "shielded_volume_zec")).item()
+    )
+    assert row["days"] == window["trading_volume_usd"].drop_nulls().len()
+    # A 7-day window needs 3 complete days, so the first two days have no rows
+    assert rolling.filter(pl.col("window_days") == 7)["date"].min() == history["date"][2]
+
+
+def test_correlations_are_stored_per_refresh_and_served_by_every_repository(tmp_path: Path):
+    from backend.app.db.client import DataRepository, DuckDBRepository, SnapshotRepository
+    from backend.app.db.pool import DuckDBConnectionPool
+    from backend.app.services.metrics_service import MetricsService
+    from data.etl.pipeline import refresh_duckdb_from_samples
+    from data.etl.snapshot import default_snapshot_dir
+
+    sample_dir = tmp_path / "sample"
+    sample_dir.mkdir()
+    (sample_dir / "daily_metrics_sample.json").write_text(
+        _history().with_columns(pl.col("date").dt.to_string()).write_json()
+    )
+    shutil.copy(SAMPLE_DIR / "alerts_sample.json", sample_dir)
+    db_path = refresh_duckdb_from_samples(sample_dir=sample_dir, db_path=tmp_path / "p.duckdb")
+
+    pool = DuckDBConnectionPool(db_path, size=1, read_only=True)
+    try:
+        repositories = [
+            DuckDBRepository(db_path, pool=pool),
+            SnapshotRepository(default_snapshot_dir(db_path)),
+            DataRepository(sample_dir=sample_dir),
+        ]
+        responses = [
+            MetricsService(repository).get_correlations(window=30, method="spearman", days=60)
+            for repository in repositories
+        ]
+    finally:
+        pool.close()
+
+    assert responses[0] == responses[1] == responses[2]
+    response = responses[0]
+    assert response.as_of == _history()["date"][-1]
+    assert len(response.series) == len(response.cross_correlations) == 6
+    assert all(len(series.dates) == 60 for series in response.series)
+    fees = next(
+        profile for profile in response.cross_correlations
+        if (profile.driver, profile.metric) == ("zec_price_usd", "avg_fee_zec")
+    )
+    assert fees.peak_lag == LEAD_DAYS
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+from backend.app.db.client import DataRepository, _RepositoryRegistry
+
+SAMPLE_DIR = Path(__file__).resolve().parents[2] / "data" / "sample"
+
+
+def _copy_samples(target: Path) -> Path:
+    sample_dir = target / "sample"
+    shutil.copytree(SAMPLE_DIR, sample_dir)
+    return sample_dir
+
+
+def test_registry_reuses_repository_until_invalidated(tmp_path):
+    sample_dir = _copy_samples(tmp_path)
+    registry = _RepositoryRegistry(
+        lambda generation: DataRepository(sample_dir=sample_dir, generation=generation)
+    )
+    first = registry.get()
+    assert registry.get() is first
+    assert first.generation == 1
+
+    registry.invalidate()
+    second = registry.get()
+    assert second is not first
+    assert second.generation == 2
+
+
+def test_registry_reloads_when_source_file_changes(tmp_path):
+    sample_dir = _copy_samples(tmp_path)
+    registry = _RepositoryRegistry(
+        lambda generation: DataRepository(sample_dir=sample_dir, generation=generation)
+    )
+    first = registry.get()
+
+    metrics_file = sample_dir / "daily_metrics_sample.json"
+    rows = json.loads(metrics_file.read_text())
+    metrics_file.write_text(json.dumps(rows[:-1]))
+    stat = metrics_file.stat()
+    os.utime(metrics_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    second = registry.get()
+    assert second is not first
+    assert second.get_daily_metrics(limit=1000).height == len(rows) - 1
+    # The old snapshot stays intact for readers still holding it.
+    assert first.get_daily_metrics(limit=1000).height == len(rows)
+
+
+def _build_duckdb(tmp_path: Path) -> Path:
+    from data.etl.pipeline import refresh_duckdb_from_samples
+
+    return refresh_duckdb_from_samples(sample_dir=SAMPLE_DIR, db_path=tmp_path / "pulse.duckdb")
+
+
+def test_duckdb_repository_matches_sample_repository(tmp_path):
+    from backend.app.db.client import DuckDBRepository
+    from backend.app.db.pool import DuckDBConnectionPool
+
+    pool = DuckDBConnectionPool(_build_duckdb(tmp_path), size=2, read_only=True)
+    try:
+        duck = DuckDBRepository(pool.db_path, pool=pool)
+        sample = DataRepository()
+
+        recent = duck.get_daily_metrics(limit=5)
+        assert recent["date"].to_list() == sample.get_daily_metrics(limit=5)["date"].to_list()
+        assert recent["shielded_tx_ratio"].to_list() == sample.get_daily_metrics(limit=5)[
+            "shielded_tx_ratio"
+        ].to_list()
+
+        ranged = duck.get_daily_metrics(limit=None, start_date="2025-11-25", end_date="2025-11-28")
+        assert ranged.height == 4
+        assert duck.get_latest_row()["date"] == sample.get_latest_row()["date"]
+        assert duck.get_previous_row()["date"] == sample.get_previous_row()["date"]
+        assert duck.count_daily_metrics() == sample.count_daily_metrics()
+        assert [a["id"] for a in duck.get_alerts(limit=2)] == [
+            a["id"] for a in sample.get_alerts(limit=2)
+        ]
+    finally:
+        pool.close()
+
+
+def test_rollups_and_forecasts_agree_across_repositories(tmp_path):
+    from backend.app.db.client import DuckDBRepository, SnapshotRepository
+    from backend.app.db.pool import DuckDBConnectionPool
+    from data.etl.snapshot import default_snapshot_dir
+
+    db_path = _build_duckdb(tmp_path)
+    pool = DuckDBConnectionPool(db_path, size=1, read_only=True)
+    try:
+        duck = DuckDBRepository(db_path, pool=pool)
+        snapshot = SnapshotRepository(default_snapshot_dir(db_path))
+        sample = DataRepository()
+
+        months = sample.get_rollups("month")
+        daily = sample.get_daily_metrics(limit=None)
+        assert months["days"].sum() == daily.height
+        assert months["total_transactions_sum"].sum() == daily["total_transactions"].sum()
+        assert months["privacy_score_last"][-1] == daily["privacy_score"][-1]
+        for repository in (duck, snapshot):
+            for grain in ("week", "month", "quarter"):
+                rollups = repository.get_rollups(grain)
+                expected = sample.get_rollups(grain)
+                assert rollups["bucket_start"].to_list() == expected["bucket_start"].to_list()
+                assert rollups["active_addresses_max"].to_list() == expected[
+                    "active_addresses_max"
+                ].to_list()
+        latest_week = duck.get_rollups("week", limit=1, end_date="2025-11-26")
+        assert latest_week["bucket_start"].to_list() == sample.get_rollups(
+            "week", start_date="2025-11-26", end_date="2025-11-26"
+        )["bucket_start"].to_list()
+
+        forecasts = sample.get_forecasts()
+        assert forecasts["horizon_days"].to_list()[:3] == [7, 30, 90]
+        for repository in (duck, snapshot):
+            assert repository.get_forecasts().equals(forecasts)
+    finally:
+        pool.close()
+
+
+def test_time_series_store_sorts_once_and_slices_ranges():
+    from datetime import date
+
+    import polars as pl
+
+    from backend.app.db.timeseries import TimeSeriesStore
+
+    days = [date(2025, 1, d) for d in (5, 1, 3, 2, 4)]
+    store = TimeSeriesStore(pl.DataFrame({"date": days, "value": [5, 1, 3, 2, 4]}))
+
+    assert store.latest()["value"] == 5
+    assert store.previous()["value"] == 4
+    assert store.tail(2)["value"].to_list() == [4, 5]
+    assert store.range(date(2025, 1, 2), date(2025, 1, 4))["value"].to_list() == [2, 3, 4]
+    assert store.range(date(2025, 1, 2), date(2025, 1, 4), limit=2)["value"].to_list() == [3, 4]
+    assert store.range(date(2025, 1, 6)).height == 0
+    assert store.range(end_date=date(2024, 12, 31)).height == 0
+
+
+def test_snapshot_repository_matches_sample_repository(tmp_path):
+    from data.etl.snapshot import default_snapshot_dir
+
+    from backend.app.db.client import SnapshotRepository
+
+    db_path = _build_duckdb(tmp_path)
+    snapshot = SnapshotRepository(default_snapshot_dir(db_path))
+    sample = DataRepository()
+
+    assert snapshot.get_daily_metrics(limit=None).equals(
+        sample.get_daily_metrics(limit=None).select(snapshot.get_daily_metrics().columns)
+    )
+    assert snapshot.get_latest_row()["privacy_score_mean_7d"] == sample.get_latest_row()[
+        "privacy_score_mean_7d"
+    ]
+    assert [a["id"] for a in snapshot.get_alerts(limit=3)] == [
+        a["id"] for a in sample.get_alerts(limit=3)
+    ]
+
+
+def test_alert_store_filters_and_paginates():
+    from datetime import datetime
+
+    from backend.app.db.alerts import AlertStore
+
+    alerts = [
+        {"id": f"a{i}", "timestamp": f"2025-12-{i:02d}T00:00:00Z",
+         "severity": "high" if i % 2 else "medium", "metric": "avg_fee_zec" if i % 3 else "x",
+         "type": "fees_spike"}
+        for i in range(1, 11)
+    ]
+    store = AlertStore(reversed(alerts))
+
+    assert [a["id"] for a in store.query(limit=3)] == ["a10", "a9", "a8"]
+    assert [a["id"] for a in store.query(limit=2, offset=2)] == ["a8", "a7"]
+    high_fees = store.query(severity="high", metric="avg_fee_zec", limit=None)
+    assert [a["id"] for a in high_fees] == ["a7", "a5", "a1"]
+    windowed = store.query(
+        before=datetime(2025, 12, 8), after=datetime(2025, 12, 4), severity="medium", limit=None
+    )
+    assert [a["id"] for a in windowed] == ["a6", "a4"]
+    assert store.query(severity="low") == []
+
+
+def test_archived_history_reads_across_tiers(tmp_path, monkeypatch):
+    from datetime import date, timedelta
+
+    from data.etl.archive import default_archive_dir, list_partitions
+    from data.etl.pipeline import refresh_duckdb_from_samples
+    from data.etl.snapshot import default_snapshot_dir
+
+    from backend.app.db import client
+    from backend.app.db.client import DuckDBRepository, SnapshotRepository
+    from backend.app.db.pool import DuckDBConnectionPool
+
+    sample_dir = _copy_samples(tmp_path)
+    template = json.loads((SAMPLE_DIR / "daily_metrics_sample.json").read_text())
+    start = date(2024, 1, 1)
+    rows = [
+        {**template[i % len(template)], "date": (start + timedelta(days=i)).isoformat(),
+         "total_transactions": 18000 + i}
+        for i in range(420)
+    ]
+    (sample_dir / "daily_metrics_sample.json").write_text(json.dumps(rows))
+    full = DataRepository(sample_dir=sample_dir)
+
+    db_path = refresh_duckdb_from_samples(
+        sample_dir=sample_dir, db_path=tmp_path / "pulse.duckdb", hot_days=90
+    )
+    archive_dir = default_archive_dir(db_path)
+    assert list_partitions(archive_dir)
+
+    pool = DuckDBConnectionPool(db_path, size=2, read_only=True)
+    try:
+        repositories = [
+            DuckDBRepository(db_path, pool=pool, archive_dir=archive_dir),
+            SnapshotRepository(default_snapshot_dir(db_path), archive_dir=archive_dir),
+        ]
+        for repository in repositories:
+            assert repository.count_daily_metrics() == 420
+            spanning = repository.get_daily_metrics(
+                limit=None, start_date="2024-02-10", end_date="2024-12-31"
+            )
+            expected = full.get_daily_metrics(
+                limit=None, start_date="2024-02-10", end_date="2024-12-31"
+            )
+            assert spanning["date"].to_list() == expected["date"].to_list()
+            assert spanning["total_transactions"].to_list() == expected[
+                "total_transactions"
+            ].to_list()
+            assert spanning["privacy_score_mean_30d"].to_list() == expected[
+                "privacy_score_mean_30d"
+            ].to_list()
+            recent = repository.get_daily_metrics(limit=400)
+            assert recent["date"].to_list() == full.get_daily_metrics(limit=400)["date"].to_list()
+
+            chunks = list(repository.iter_daily_metrics("2024-01-15", chunk_size=50))
+            assert max(chunk.height for chunk in chunks) <= 50
+            streamed = [day for chunk in chunks for day in chunk["date"].to_list()]
+            assert streamed == full.get_daily_metrics(limit=None, start_date="2024-01-15")[
+                "date"
+            ].to_list()
+
+        # DuckDB answers cold-tier queries itself rather than through Polars
+        with monkeypatch.context() as patch:
+            patch.setattr(client, "scan_archive", None)
+            duckdb_only = DuckDBRepository(db_path, pool=pool, archive_dir=archive_dir)
+            assert duckdb_only.count_daily_metrics() == 420
+            recent = duckdb_only.get_daily_metrics(limit=400)
+            assert recent["date"].to_list() == full.get_daily_metrics(limit=400)["date"].to_list()
+
+        # Recent queries never open archive partitions
+        list_partitions(archive_dir)[0].write_bytes(b"not parquet")
+        for repository in repositories:
+            assert repository.get_daily_metrics(limit=30).height == 30
+            assert repository.get_daily_metrics(
+                limit=None, start_date="2024-06-01", end_date="2024-06-30"
+            ).height == 30
+    finally:
+        pool.close()
+
+
+def test_backends_missing_an_interface_method_fail_at_construction():
+    import pytest
+
+    from backend.app.db.client import BaseRepository, DuckDBRepository
+
+    class Incomplete(DuckDBRepository):
+        get_forecasts = BaseRepository.get_forecasts
+
+    with pytest.raises(TypeError, match="get_forecasts"):
+        Incomplete(Path("unused.duckdb"))
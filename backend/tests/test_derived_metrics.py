@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import duckdb
+
+from data.etl.transformers.alert_generator import (
+    MONITORED_METRICS,
+    AnomalyDetector,
+    ensure_alerts_table,
+    insert_alerts,
+)
+from data.etl.transformers.baselines import (
+    read_day,
+    rebuild_baselines,
+    update_baselines,
+)
+from data.etl.transformers.derived_metrics import (
+    DERIVED_TABLE,
+    load_baseline_stats,
+    rebuild_derived_metrics,
+    update_derived_metrics,
+)
+from data.etl.transformers.forecasting import (
+    FORECAST_TABLE,
+    HoltState,
+    load_forecast_states,
+    rebuild_forecasts,
+    update_forecasts,
+)
+from data.etl.transformers.rollups import ROLLUP_TABLE, rebuild_rollups, update_rollups
+
+SAMPLE_FILE = Path(__file__).resolve().parents[2] / "data" / "sample" / "daily_metrics_sample.json"
+
+
+def _connect_with_samples() -> duckdb.DuckDBPyConnection:
+    conn = duckdb.connect()
+    conn.execute("CREATE TABLE daily_metrics AS SELECT * FROM read_json_auto(?)", [str(SAMPLE_FILE)])
+    return conn
+
+
+def test_incremental_update_matches_full_rebuild():
+    conn = _connect_with_samples()
+    rebuild_derived_metrics(conn)
+    conn.execute(
+        "UPDATE daily_metrics SET total_transactions = total_transactions + 5000 "
+        "WHERE date = '2025-11-27'"
+    )
+
+    rewritten = update_derived_metrics(conn, ["2025-11-27"])
+    incremental = conn.execute(f"SELECT * FROM {DERIVED_TABLE} ORDER BY date").pl()
+    rebuild_derived_metrics(conn)
+    full = conn.execute(f"SELECT * FROM {DERIVED_TABLE} ORDER BY date").pl()
+
+    assert rewritten == 6  # the changed day and every later row in its windows
+    assert incremental.equals(full)
+
+
+def test_incremental_rollups_match_full_rebuild():
+    conn = _connect_with_samples()
+    rebuild_derived_metrics(conn)
+    rebuild_rollups(conn)
+    conn.execute(
+        "UPDATE daily_metrics SET shielded_transactions = shielded_transactions + 900 "
+        "WHERE date = '2025-11-30'"
+    )
+    conn.execute(
+        "INSERT INTO daily_metrics SELECT * REPLACE (DATE '2025-12-03' AS date) "
+        "FROM daily_metrics WHERE date = '2025-12-02'"
+    )
+
+    update_derived_metrics(conn, ["2025-11-30", "2025-12-03"])
+    update_rollups(conn, ["2025-11-30", "2025-12-03"])
+    query = f"SELECT * FROM {ROLLUP_TABLE} ORDER BY grain, bucket_start"
+    incremental = conn.execute(query).pl()
+    rebuild_rollups(conn)
+    full = conn.execute(query).pl()
+
+    assert set(full["grain"]) == {"week", "month", "quarter"}
+    assert incremental.equals(full)
+
+
+def test_alerts_from_baseline_stats_match_full_history():
+    conn = _connect_with_samples()
+    conn.execute(
+        "UPDATE daily_metrics SET total_transactions = total_transactions * 2, "
+        "avg_fee_zec = avg_fee_zec * 3 WHERE date = (SELECT MAX(date) FROM daily_metrics)"
+    )
+    rebuild_derived_metrics(conn)
+    history = conn.execute("SELECT * FROM daily_metrics ORDER BY date").pl()
+    detector = AnomalyDetector()
+
+    full = detector.generate_alerts(history)
+    stats = load_baseline_stats(conn, history["date"][-1])
+    incremental = detector.generate_alerts(history.tail(1), baseline_stats=stats)
+
+    # Doubling the transactions also halves the shielded share
+    assert {a["metric"] for a in full} == {
+        "total_transactions", "avg_fee_zec", "shielded_tx_ratio"
+    }
+    assert [(a["metric"], a["severity"]) for a in full if a["metric"] in stats] == [
+        (a["metric"], a["severity"]) for a in incremental
+    ]
+
+
+def test_running_baselines_match_recomputed_window():
+    import pytest
+
+    conn = _connect_with_samples()
+    held_back = conn.execute(
+        "SELECT * FROM daily_metrics ORDER BY date DESC LIMIT 3"
+    ).fetchall()[::-1]
+    conn.execute("DELETE FROM daily_metrics WHERE date >= ?", [held_back[0][0]])
+    window = 5
+    rebuild_baselines(conn, window)
+
+    for row in held_back:
+        conn.execute(f"INSERT INTO daily_metrics VALUES ({', '.join('?' * len(row))})", list(row))
+        update_baselines(conn, row[0], None, window)
+    edited = held_back[0][0]
+    previous = read_day(conn, edited)
+    conn.execute(
+        "UPDATE daily_metrics SET avg_fee_zec = avg_fee_zec * 4 WHERE date = ?", [edited]
+    )
+    running = update_baselines(conn, edited, previous, window)
+    expected = rebuild_baselines(conn, window)
+
+    assert running.as_of == expected.as_of == held_back[-1][0]
+    assert running.window_start == expected.window_start
+    assert running.days == expected.days == window
+    for column, (mean, std) in expected.as_baseline().items():
+        assert running.as_baseline()[column] == (pytest.approx(mean), pytest.approx(std))
+
+
+def test_forecasts_advance_like_a_replay_with_the_fitted_parameters():
+    import pytest
+
+    conn = _connect_with_samples()
+    held_back = conn.execute(
+        "SELECT * FROM daily_metrics ORDER BY date DESC LIMIT 3"
+    ).fetchall()[::-1]
+    conn.execute("DELETE FROM daily_metrics WHERE date >= ?", [held_back[0][0]])
+    fitted = rebuild_forecasts(conn)
+
+    for row in held_back:
+        conn.execute(f"INSERT INTO daily_metrics VALUES ({', '.join('?' * len(row))})", list(row))
+        update_forecasts(conn, row[0], None)
+    latest = held_back[-1][0]
+    previous = read_day(conn, latest)
+    conn.execute("UPDATE daily_metrics SET avg_fee_zec = avg_fee_zec * 4 WHERE date = ?", [latest])
+    running = update_forecasts(conn, latest, previous)
+
+    assert running.as_of == latest
+    assert [state.as_of for state in load_forecast_states(conn)] == [held_back[-2][0], latest]
+    fees = [row[0] for row in conn.execute(
+        "SELECT avg_fee_zec FROM daily_metrics ORDER BY date"
+    ).fetchall()]
+    model = fitted.models["avg_fee_zec"]
+    replay = HoltState(model.alpha, model.beta)
+    for fee in fees:
+        replay.step(fee)
+    assert running.models["avg_fee_zec"].level == pytest.approx(replay.level)
+    assert running.models["avg_fee_zec"].trend == pytest.approx(replay.trend)
+    assert running.models["avg_fee_zec"].errors == replay.errors
+
+    forecasts = conn.execute(
+        f"SELECT metric, horizon_days, forecast, lower, upper FROM {FORECAST_TABLE} "
+        f"WHERE metric = 'avg_fee_zec' ORDER BY horizon_days"
+    ).fetchall()
+    assert [row[1] for row in forecasts] == [7, 30, 90]
+    for _, horizon, forecast, lower, upper in forecasts:
+        point, _, _ = replay.forecast(horizon)
+        assert forecast == pytest.approx(max(point, 0.0))
+        assert lower <= forecast <= upper
+    # Intervals widen with the horizon
+    widths = [upper - lower for *_, lower, upper in forecasts]
+    assert widths == sorted(widths)
+
+
+def test_backfill_flags_every_day_like_latest_day_checks():
+    from datetime import date, timedelta
+
+    import polars as pl
+
+    days = 400
+    history = pl.DataFrame({
+        "date": [date(2024, 1, 1) + timedelta(days=i) for i in range(days)],
+        "total_transactions": [20000 + (i * 37) % 900 for i in range(days)],
+        "shielded_volume_zec": [15000.0 + (i * 53) % 700 for i in range(days)],
+        "avg_fee_zec": [0.0002 + ((i * 17) % 11) * 1e-6 for i in range(days)],
+        "active_addresses": [12000 + (i * 29) % 500 for i in range(days)],
+    }).with_columns(
+        pl.when(pl.int_range(pl.len()).is_in([45, 210, 399]))
+        .then(pl.col("avg_fee_zec") * 3)
+        .otherwise(pl.col("avg_fee_zec")),
+        pl.when(pl.int_range(pl.len()) == 300)
+        .then(pl.col("total_transactions") // 2)
+        .otherwise(pl.col("total_transactions")),
+    )
+    detector = AnomalyDetector()
+
+    backfilled = detector.backfill_alerts(history)
+    expected = []
+    for end in range(2, days + 1):
+        for alert in detector.generate_alerts(history.head(end)):
+            expected.append((history["date"][end - 1], alert["type"], alert["severity"],
+                             alert["summary"]))
+    assert list(zip(
+        backfilled["timestamp"].dt.date(), backfilled["type"], backfilled["severity"],
+        backfilled["summary"],
+    )) == sorted(expected, key=lambda item: (item[0], item[1]))
+    assert {"fees_spike", "transactions_drop"} <= set(backfilled["type"])
+
+    conn = duckdb.connect()
+    assert insert_alerts(conn, backfilled) == backfilled.height
+    insert_alerts(conn, detector.backfill_alerts(history))
+    assert conn.execute("SELECT COUNT(*) FROM alerts").fetchone()[0] == backfilled.height
+
+
+def test_backfill_scores_every_metric_at_the_detector_threshold():
+    from datetime import date, timedelta
+
+    import polars as pl
+
+    days = 120
+    history = pl.DataFrame({
+        "date": [date(2025, 1, 1) + timedelta(days=i) for i in range(days)],
+        "total_transactions": [20000 + (i * 37) % 900 for i in range(days)],
+        "shielded_transactions": [5000 + (i * 53) % 400 for i in range(days)],
+        "avg_fee_zec": [0.0002 + ((i * 17) % 11) * 1e-6 for i in range(days)],
+        "median_fee_zec": [0.0001 + ((i * 13) % 7) * 1e-6 for i in range(days)],
+    }).with_columns(
+        # A jump in a metric without a MONITORED_METRICS rule
+        pl.when(pl.int_range(pl.len()) == 100)
+        .then(pl.col("median_fee_zec") + 8e-6)
+        .otherwise(pl.col("median_fee_zec")),
+    )
+    loose, strict = AnomalyDetector(threshold=2.5), AnomalyDetector(threshold=6.0)
+
+    backfilled = loose.backfill_alerts(history)
+    jump = backfilled.filter(pl.col("metric") == "median_fee_zec")
+    assert jump["timestamp"].dt.date().to_list() == [history["date"][100]]
+    assert jump.select("type", "severity").row(0) == ("median_fee_zec_spike", "medium")
+    # Derived ratios are scored too
+    assert "shielded_tx_ratio" in backfilled["metric"].to_list()
+
+    # The threshold governs metrics without their own rule
+    tightened = strict.backfill_alerts(history)
+    assert "median_fee_zec" not in tightened["metric"].to_list()
+    monitored = pl.col("metric").is_in([rule[0] for rule in MONITORED_METRICS])
+    assert tightened.filter(monitored).equals(backfilled.filter(monitored))
+
+    # The live check of that day raises the same alert under the same id
+    live = [alert for alert in loose.generate_alerts(history.head(101))
+            if alert["metric"] == "median_fee_zec"]
+    assert [alert["id"] for alert in live] == jump["id"].to_list()
+
+    # An alert raised live under an older random id is not duplicated
+    conn = duckdb.connect()
+    insert_alerts(conn, jump.with_columns(pl.lit("alert-3f9c2a7b1d0e").alias("id")))
+    insert_alerts(conn, backfilled)
+    assert conn.execute(
+        "SELECT COUNT(*) FROM alerts WHERE metric = 'median_fee_zec'"
+    ).fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM alerts").fetchone()[0] == backfilled.height
+
+
+def test_live_refresh_applies_the_configured_threshold_and_detectors(tmp_path: Path):
+    from datetime import date, timedelta
+
+    import polars as pl
+
+    from data.etl.pipeline import _detect_alerts
+
+    days = 70
+    history = pl.DataFrame({
+        "date": [date(2025, 1, 1) + timedelta(days=i) for i in range(days)],
+        "total_transactions": [20000 + (i * 37) % 900 for i in range(days)],
+        "shielded_transactions": [5000 + (i * 53) % 400 for i in range(days)],
+        "shielded_volume_zec": [15000.0 + (i * 53) % 700 for i in range(days)],
+        "avg_fee_zec": [0.0002 + ((i * 17) % 11) * 1e-6 for i in range(days)],
+        # Jumps on the latest day in metrics without a MONITORED_METRICS rule
+        "transparent_volume_zec": [5000.0 + (i * 7) % 50 + (60 if i == days - 1 else 0)
+                                   for i in range(days)],
+        "median_fee_zec": [0.0001 + ((i * 13) % 7) * 1e-6 + (8e-6 if i == days - 1 else 0)
+                           for i in range(days)],
+        # Market data is not alerted on
+        "zec_price_usd": [400.0 if i == days - 1 else 40.0 + i % 5 for i in range(days)],
+        # An earlier spike inflates the mean/std baseline of the latest day's jump
+        "active_addresses": [40000 if i == 60 else 12300 if i == days - 1 else 12000 + i % 3 * 10
+                             for i in range(days)],
+    })
+    flagged = {}
+    for path, dates in (("single", history["date"][-1:]), ("multi", history["date"][-3:])):
+        for config, detector in (
+            ("default", AnomalyDetector(threshold=2.5, detectors={})),
+            ("tuned", AnomalyDetector(threshold=6.0, detectors={"*": ["mad"]})),
+        ):
+            db_path = tmp_path / f"{path}-{config}.duckdb"
+            with duckdb.connect(str(db_path)) as conn:
+                conn.execute("CREATE TABLE daily_metrics AS SELECT * FROM history")
+                ensure_alerts_table(conn)
+            alerts = _detect_alerts(db_path, tmp_path / "archive", dates.to_list(), detector)
+            # Every alert is stored; the newest day's are returned to notify about
+            with duckdb.connect(str(db_path)) as conn:
+                stored = conn.execute(
+                    "SELECT id FROM alerts WHERE id LIKE ? ORDER BY id",
+                    [f"alert-{history['date'][-1]:%Y%m%d}-%"],
+                ).fetchall()
+            assert sorted((alert["id"],) for alert in alerts) == stored
+            flagged[path, config] = {alert["metric"] for alert in alerts}
+
+    # A day gets the same alerts whether it was fetched alone or in a batch
+    for config in ("default", "tuned"):
+        assert flagged["single", config] == flagged["multi", config]
+    assert flagged["single", "default"] == {"transparent_volume_zec", "median_fee_zec"}
+    assert flagged["single", "tuned"] == {"active_addresses"}
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import statistics
+from datetime import date, timedelta
+
+import polars as pl
+import pytest
+
+from data.etl.transformers.detectors import (
+    DETECTORS,
+    MAD_SCALE,
+    detect,
+    lookback_days,
+    score_metrics,
+)
+
+
+def _history(values, start=date(2025, 1, 6)) -> pl.DataFrame:
+    return pl.DataFrame({
+        "date": [start + timedelta(days=i) for i in range(len(values))],
+        "total_transactions": values,
+    })
+
+
+def test_every_detector_scores_every_metric_in_one_frame():
+    frame = _history([100.0 + (i % 5) for i in range(60)]).with_columns(
+        (pl.col("total_transactions") * 0.25).alias("shielded_transactions")
+    )
+    scores = score_metrics(frame, {"*": list(DETECTORS)})
+
+    # shielded_tx_ratio is derived on the fly for raw daily rows
+    assert set(scores["metric"]) == {
+        "total_transactions", "shielded_transactions", "shielded_tx_ratio"
+    }
+    assert set(scores["detector"]) == {"zscore", "mad", "ewma", "seasonal"}
+    assert scores.height == 60 * 3 * len(DETECTORS)
+    # Baselines only use earlier days, so day one is never scored
+    assert scores.filter(pl.col("date") == frame["date"][0])["score"].null_count() == 12
+
+    with pytest.raises(ValueError):
+        score_metrics(frame, {"total_transactions": ["nope"]})
+
+
+def test_median_mad_is_not_masked_by_an_earlier_spike():
+    values = [100.0 + (i % 3) for i in range(40)]
+    values[30] = 400.0  # inflates the mean/std baseline of the days after it
+    values[35] = 160.0
+    frame = _history(values)
+
+    flagged = detect(frame, threshold=3.0, detectors={"*": ["zscore", "mad"]})
+    second = flagged.filter(pl.col("date") == frame["date"][35])
+    assert second["detector"].to_list() == ["mad"]
+
+
+def test_seasonal_baseline_expects_the_weekly_dip():
+    # Every Sunday carries a fifth of the weekday load
+    frame = _history([
+        20.0 + i % 2 if (date(2025, 1, 6) + timedelta(days=i)).weekday() == 6 else 100.0 + i % 3
+        for i in range(70)
+    ])
+    late = pl.col("date") >= frame["date"][42]
+
+    plain = detect(frame, detectors={"*": ["zscore"]}).filter(late)
+    seasonal = detect(frame, detectors={"*": ["seasonal"]}).filter(late)
+    assert plain.height > 0
+    assert seasonal.height == 0
+
+
+def test_mad_is_the_median_deviation_from_the_window_median():
+    # A trend, so every day's trailing median differs
+    values = [100.0 + 2 * i + (i * 7) % 5 for i in range(60)]
+    scores = score_metrics(_history(values), {"*": ["mad"]}, window=30)
+
+    for day in (3, 30, 59):
+        window = values[max(day - 30, 0):day]
+        median = statistics.median(window)
+        row = scores.row(day, named=True)
+        assert row["center"] == pytest.approx(median)
+        assert row["scale"] == pytest.approx(
+            statistics.median(abs(value - median) for value in window) * MAD_SCALE
+        )
+
+
+@pytest.mark.parametrize("name", sorted(DETECTORS))
+def test_latest_day_scores_need_only_the_lookback(name):
+    values = [100.0 + (i * 37) % 23 + (i % 7 == 6) * 30 for i in range(400)]
+    frame = _history(values)
+    detectors = {"*": [name]}
+    recent = frame.tail(lookback_days(detectors, window=30) + 1)
+
+    full = score_metrics(frame, detectors, window=30).row(-1, named=True)
+    windowed = score_metrics(recent, detectors, window=30).row(-1, named=True)
+    assert windowed["score"] == pytest.approx(full["score"], rel=1e-3)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from backend.app.services.events import GenerationBroadcaster, build_generation_event
+
+
+def test_broadcaster_fans_out_once_per_version_and_drops_stale_events():
+    async def scenario():
+        broadcaster = GenerationBroadcaster(queue_size=2)
+        fast, slow = broadcaster.subscribe(), broadcaster.subscribe()
+
+        assert broadcaster.publish("v1", "one")
+        assert not broadcaster.publish("v1", "one again")
+        assert await fast.get() == "one"
+
+        broadcaster.publish("v2", "two")
+        broadcaster.publish("v3", "three")
+        assert [slow.get_nowait() for _ in range(slow.qsize())] == ["two", "three"]
+
+        broadcaster.unsubscribe(fast)
+        assert broadcaster.subscriber_count == 1
+
+    asyncio.run(scenario())
+
+
+def test_generation_event_carries_dashboard_bundle():
+    version, message = build_generation_event()
+    lines = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    assert lines["id"] == version
+    assert lines["event"] == "generation"
+    payload = json.loads(lines["data"])
+    assert payload["version"] == version
+    assert {"daily", "kpis", "summary", "pool_migration"} <= payload["dashboard"].keys()
+
+
+def test_announce_skips_building_for_an_announced_version(monkeypatch):
+    from backend.app.services import events
+
+    class Repository:
+        version = "v1"
+
+    built = []
+
+    def build(repository=None):
+        built.append(repository.version)
+        return repository.version, f"event {repository.version}"
+
+    monkeypatch.setattr(events, "get_repository", lambda: Repository)
+    monkeypatch.setattr(events, "build_generation_event", build)
+    monkeypatch.setattr(events, "broadcaster", GenerationBroadcaster())
+
+    async def scenario():
+        for _ in range(3):
+            await events.announce_generation()
+        Repository.version = "v2"
+        await events.announce_generation()
+
+    asyncio.run(scenario())
+    assert built == ["v1", "v2"]
+    assert events.broadcaster.latest == ("v2", "event v2")
+
+
+def test_subscribers_share_one_build_before_the_first_announcement(monkeypatch):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from backend.app.services import events
+
+    built = []
+
+    def build(repository=None):
+        built.append(threading.get_ident())
+        time.sleep(0.05)
+        return "v1", "event v1"
+
+    monkeypatch.setattr(events, "build_generation_event", build)
+    broadcaster = GenerationBroadcaster()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        served = list(pool.map(lambda _: broadcaster.current_event(), range(8)))
+
+    assert len(built) == 1
+    assert served == [("v1", "event v1")] * 8
+    # The cached event counts as announced, so the watcher does not resend it
+    assert not broadcaster.publish("v1", "event v1")
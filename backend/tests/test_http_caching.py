@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.api import caching
+
+
+class _Repository:
+    def __init__(self, version: str) -> None:
+        self.version = version
+
+
+def test_conditional_get_answers_304_until_data_version_changes(monkeypatch):
+    repository = _Repository("v1")
+    calls = []
+    monkeypatch.setattr(caching, "get_repository", lambda: repository)
+
+    app = FastAPI()
+    app.add_middleware(caching.ConditionalGetMiddleware, path_prefix="/api/metrics")
+
+    @app.get("/api/metrics/kpis")
+    def kpis(days: int = 30):
+        calls.append(days)
+        return {"days": days}
+
+    client = TestClient(app)
+    first = client.get("/api/metrics/kpis")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert "max-age=" in first.headers["cache-control"]
+
+    cached = client.get("/api/metrics/kpis", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert calls == [30]
+
+    # Query parameters are part of the validator
+    assert client.get("/api/metrics/kpis?days=7").headers["etag"] != etag
+
+    repository.version = "v2"
+    refreshed = client.get("/api/metrics/kpis", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+
+def test_repository_is_loaded_off_the_event_loop(monkeypatch):
+    loops = []
+
+    def get_repository():
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return _Repository("v1")
+
+    monkeypatch.setattr(caching, "get_repository", get_repository)
+    app = FastAPI()
+    app.add_middleware(caching.ConditionalGetMiddleware, path_prefix="/api/metrics")
+
+    @app.get("/api/metrics/kpis")
+    def kpis():
+        return {}
+
+    assert TestClient(app).get("/api/metrics/kpis").status_code == 200
+    assert loops == [None]
+
+
+def test_every_worker_sends_the_owners_remaining_time(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from backend.app.config import settings
+    from backend.app.jobs.leader import SchedulerLock
+    from backend.app.jobs.scheduler import create_scheduler, run_scheduler_when_elected
+
+    monkeypatch.setattr(settings, "db_path", tmp_path / "zcash_pulse.duckdb")
+    worker = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+    # Nothing recorded yet: clients revalidate right away
+    assert caching.seconds_until_refresh(worker) == 0
+
+    owner = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(scheduler=None)))
+
+    async def elect():
+        scheduler = create_scheduler()
+        owner.app.state.scheduler = scheduler
+        await run_scheduler_when_elected(scheduler, SchedulerLock(tmp_path / "scheduler.lock"))
+        try:
+            return caching.seconds_until_refresh(owner), caching.seconds_until_refresh(worker)
+        finally:
+            scheduler.shutdown(wait=False)
+
+    owned, followed = asyncio.run(elect())
+    assert owned > 0
+    assert abs(owned - followed) <= 1
+
+    # Partway through an interval, the remaining part of it
+    from datetime import datetime, timedelta, timezone
+
+    from backend.app.jobs.scheduler import record_schedule, schedule_path
+
+    interval = settings.refresh_interval_minutes * 60
+    record_schedule(
+        schedule_path(settings.db_path), datetime.now(timezone.utc) - timedelta(seconds=1000),
+        interval,
+    )
+    assert abs(caching.seconds_until_refresh(worker) - (interval - 1000 % interval)) <= 1
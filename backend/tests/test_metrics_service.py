@@ -28,3 +28,257 @@ def test_summary_contains_health_scores():
     service = MetricsService()
     summary = service.get_summary()
     assert summary.health.keys() == {"throughput", "privacy", "cost", "participation"}
+
+
+def test_memo_cache_single_flight_and_lru():
+    import threading
+    import time
+
+    from backend.app.services.memo import MemoCache
+
+    cache = MemoCache(maxsize=2)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    threads = [
+        threading.Thread(target=lambda: cache.get_or_compute("k", slow)) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 4, "misses": 3, "evictions": 1}
+
+
+def test_service_views_are_memoized_per_dataset_version():
+    service = MetricsService()
+    assert service.get_summary() is MetricsService().get_summary()
+    assert service.get_daily_metrics(limit=5) is not service.get_daily_metrics(limit=6)
+
+
+def test_dashboard_bundle_matches_individual_views():
+    from backend.app.db.client import DataRepository, WindowRepository
+
+    repository = DataRepository()
+    window = WindowRepository(repository, days=5)
+    assert window.get_daily_metrics(limit=3).equals(repository.get_daily_metrics(limit=3))
+    assert window.get_daily_metrics(limit=None).height == repository.count_daily_metrics()
+
+    service = MetricsService(repository)
+    bundle = service.get_dashboard()
+    assert bundle.kpis == service.get_kpis()
+    assert bundle.summary == service.get_summary()
+    assert bundle.pool_migration == service.get_pool_migration()
+    assert len(bundle.daily.data) == len(service.get_daily_metrics().data)
+
+
+def test_daily_metrics_json_matches_model_serialization():
+    import json
+
+    import polars as pl
+    import pytest
+
+    from backend.app.models.metrics import DailyMetric
+    from backend.app.services.serialization import conform_frame
+
+    service = MetricsService()
+    fast = json.loads(service.get_daily_metrics_json(limit=5))
+    assert fast == json.loads(service.get_daily_metrics(limit=5).model_dump_json())
+
+    frame = service._repository.get_daily_metrics(limit=5)
+    with pytest.raises(ValueError):
+        conform_frame(frame.with_columns(pl.lit(1.5).alias("shielded_tx_ratio")), DailyMetric)
+    with pytest.raises(ValueError):
+        conform_frame(frame.drop("active_addresses"), DailyMetric)
+
+
+def test_exports_stream_in_chunks(monkeypatch):
+    import io
+    import json
+
+    import polars as pl
+
+    from backend.app.services import metrics_service
+
+    monkeypatch.setattr(metrics_service, "EXPORT_CHUNK_ROWS", 3)
+    service = MetricsService()
+    expected = service._repository.get_daily_metrics(limit=None)
+
+    csv_chunks = list(service.export_metrics_csv())
+    assert len(csv_chunks) > 1
+    exported = pl.read_csv(io.StringIO("".join(csv_chunks)), try_parse_dates=True)
+    assert exported["date"].to_list() == expected["date"].to_list()
+
+    rows = json.loads("".join(service.export_metrics_json(start_date="2025-11-25")))
+    assert [row["date"] for row in rows] == [
+        day.isoformat() for day in expected["date"].to_list() if day.isoformat() >= "2025-11-25"
+    ]
+
+    alerts = json.loads("".join(service.export_alerts_json()))
+    assert [alert["id"] for alert in alerts] == [
+        alert["id"] for alert in service._repository.query_alerts(limit=None)
+    ]
+
+
+def test_columnar_exports_round_trip(monkeypatch):
+    import io
+
+    import polars as pl
+
+    from backend.app.services import metrics_service
+
+    monkeypatch.setattr(metrics_service, "EXPORT_CHUNK_ROWS", 4)
+    service = MetricsService()
+    expected = service._repository.get_daily_metrics(limit=None, start_date="2025-11-24")
+
+    parquet = pl.read_parquet(io.BytesIO(b"".join(service.export_metrics_parquet("2025-11-24"))))
+    assert parquet["date"].to_list() == expected["date"].to_list()
+    assert parquet["avg_fee_zec"].to_list() == expected["avg_fee_zec"].to_list()
+
+    arrow = pl.read_ipc_stream(io.BytesIO(b"".join(service.export_metrics_arrow("2025-11-24"))))
+    assert arrow.equals(parquet)
+
+    alerts = pl.read_ipc_stream(io.BytesIO(b"".join(service.export_alerts_arrow())))
+    assert alerts.height == len(service._repository.query_alerts(limit=None))
+    assert pl.read_parquet(io.BytesIO(b"".join(service.export_alerts_parquet()))).equals(alerts)
+
+
+def test_columnar_exports_keep_columns_that_start_null(monkeypatch, tmp_path):
+    import io
+    import json
+    from datetime import date, timedelta
+    from pathlib import Path
+
+    import polars as pl
+
+    from backend.app.db.client import DuckDBRepository
+    from backend.app.db.pool import DuckDBConnectionPool
+    from backend.app.services import metrics_service
+    from data.etl.archive import default_archive_dir, list_partitions
+    from data.etl.pipeline import refresh_duckdb_from_samples
+
+    sample_dir = Path(__file__).resolve().parents[2] / "data" / "sample"
+    template = json.loads((sample_dir / "daily_metrics_sample.json").read_text())
+    rows = [
+        {**template[i % len(template)], "date": (date(2025, 1, 1) + timedelta(days=i)).isoformat(),
+         "zec_price_usd": 30.0 + i if i >= 45 else None}
+        for i in range(60)
+    ]
+    alert_template = json.loads((sample_dir / "alerts_sample.json").read_text())[0]
+    alerts = [
+        {**alert_template, "id": f"alert-{i}", "timestamp": f"2025-02-{i + 1:02d}T00:00:00Z",
+         "baseline_value": 100.0 + i if i < 6 else None}
+        for i in range(10)
+    ]
+    (tmp_path / "daily_metrics_sample.json").write_text(json.dumps(rows))
+    (tmp_path / "alerts_sample.json").write_text(json.dumps(alerts))
+    db_path = refresh_duckdb_from_samples(
+        sample_dir=tmp_path, db_path=tmp_path / "pulse.duckdb", hot_days=20
+    )
+    # Partitions archived before market data was collected have no price column
+    archive_dir = default_archive_dir(db_path)
+    for partition in list_partitions(archive_dir):
+        pl.read_parquet(partition).drop("zec_price_usd").write_parquet(partition)
+
+    monkeypatch.setattr(metrics_service, "EXPORT_CHUNK_ROWS", 4)
+    pool = DuckDBConnectionPool(db_path, size=1, read_only=True)
+    try:
+        service = MetricsService(DuckDBRepository(db_path, pool=pool, archive_dir=archive_dir))
+        exported = [
+            pl.read_parquet(io.BytesIO(b"".join(service.export_metrics_parquet()))),
+            pl.read_ipc_stream(io.BytesIO(b"".join(service.export_metrics_arrow()))),
+        ]
+        exported_alerts = [
+            pl.read_parquet(io.BytesIO(b"".join(service.export_alerts_parquet()))),
+            pl.read_ipc_stream(io.BytesIO(b"".join(service.export_alerts_arrow()))),
+        ]
+    finally:
+        pool.close()
+
+    for frame in exported:
+        assert frame.schema["zec_price_usd"] == pl.Float64
+        assert frame["zec_price_usd"].to_list() == [row["zec_price_usd"] for row in rows]
+    # Newest first, so the first pages hold only null baselines
+    for frame in exported_alerts:
+        assert frame.schema["baseline_value"] == pl.Float64
+        assert frame["baseline_value"].to_list() == [
+            alert["baseline_value"] for alert in reversed(alerts)
+        ]
+
+
+def test_timeseries_pages_by_cursor_and_downsamples():
+    import pytest
+
+    service = MetricsService()
+    all_dates = service._repository.get_daily_metrics(limit=None)["date"].to_list()
+
+    dates, cursor = [], None
+    while True:
+        page = service.get_timeseries(("total_transactions",), cursor=cursor, limit=4)
+        dates.extend(page.series[0].dates)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert dates == all_dates
+
+    sampled = service.get_timeseries(("avg_fee_zec", "active_addresses"), max_points=4)
+    assert sampled.downsampled and sampled.total_points == len(all_dates)
+    assert all(len(series.dates) <= 4 for series in sampled.series)
+    fees = service._repository.get_daily_metrics(limit=None)["avg_fee_zec"]
+    assert max(sampled.series[0].values) == fees.max()
+
+    with pytest.raises(ValueError):
+        service.get_timeseries(("not_a_metric",))
+
+
+def test_vectorized_views_match_row_values():
+    import polars as pl
+
+    from backend.app.services.metrics_service import _baseline_health
+
+    service = MetricsService()
+    frame = service._repository.get_daily_metrics(limit=None)
+
+    privacy = service.get_privacy_metrics(days=10_000)
+    assert len(privacy.trends) == frame.height
+    assert privacy.trends[-1].shielded_tx_pct == round(frame["shielded_tx_ratio"][-1] * 100, 2)
+    assert privacy.latest_score == privacy.trends[-1].privacy_score
+
+    migration = service.get_pool_migration(days=10_000)
+    assert [trend.date for trend in migration.trends] == frame["date"].to_list()
+    assert 0 <= migration.forecast_30d <= 100
+
+    fees = pl.DataFrame({"fee": [0.8, 1.1, 1.2, 1.4, 1.0], "baseline": [1.0, 1.0, 1.0, 1.0, 0.0]})
+    health = fees.select(
+        _baseline_health("fee", "baseline", higher_is_better=False, warning=0.15, critical=0.3)
+    ).to_series()
+    assert health.to_list() == ["good", "good", "warning", "critical", "good"]
+
+
+def test_window_statistics_only_see_the_requested_days():
+    service = MetricsService()
+    for days in (3, 30):
+        rows = service._repository.get_daily_metrics(limit=days).to_dicts()
+
+        scores = [
+            round((row["shielded_tx_ratio"] * 0.6 + row["shielded_volume_ratio"] * 0.4) * 100, 2)
+            for row in rows
+        ]
+        assert service.get_privacy_metrics(days=days).avg_7d_score == round(sum(scores[-7:]) / 7, 2)
+
+        adoption = [row["shielded_tx_ratio"] * 100 for row in rows]
+        velocities = [0.0] + [today - yesterday for yesterday, today in zip(adoption, adoption[1:])]
+        migration = service.get_pool_migration(days=days)
+        assert [trend.velocity for trend in migration.trends] == [round(v, 3) for v in velocities]
+        assert migration.avg_7d_adoption == round(sum(adoption[-7:]) / len(adoption[-7:]), 2)
+        assert migration.adoption_velocity == round(
+            sum(velocities[-7:]) / len(velocities[-7:]), 3
+        )
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from data.etl.pipeline import refresh_duckdb_from_samples
+from data.etl.pipeline import backfill_alerts
+from data.etl.publishing import (
+    generation_snapshot_dir,
+    generations_dir,
+    resolve_published_path,
+    staging_database,
+)
+from data.etl import snapshot as snapshot_module
+from data.etl.snapshot import DAILY_METRICS_FILE, default_snapshot_dir, resolve_snapshot
+
+from backend.app.db.client import DuckDBRepository, SnapshotRepository
+from backend.app.db.pool import DuckDBConnectionPool
+
+SAMPLE_DIR = Path(__file__).resolve().parents[2] / "data" / "sample"
+
+
+def test_refresh_publishes_new_generation_without_touching_readers(tmp_path):
+    db_path = tmp_path / "pulse.duckdb"
+    refresh_duckdb_from_samples(sample_dir=SAMPLE_DIR, db_path=db_path, publish=True)
+    first = resolve_published_path(db_path)
+    assert first is not None and not db_path.exists()
+
+    pool = DuckDBConnectionPool(first, size=1, read_only=True)
+    try:
+        reader = DuckDBRepository(first, pool=pool)
+        latest = reader.get_latest_row()["date"]
+
+        # A writer in the same process stages the next generation while the
+        # reader keeps its read-only connection to the published one.
+        with staging_database(db_path) as work_path:
+            with duckdb.connect(str(work_path)) as conn:
+                conn.execute("DELETE FROM daily_metrics WHERE date = ?", [latest])
+            assert reader.get_latest_row()["date"] == latest
+            assert resolve_published_path(db_path) == first
+
+        second = resolve_published_path(db_path)
+        assert second != first
+        assert reader.get_latest_row()["date"] == latest
+        with duckdb.connect(str(second), read_only=True) as conn:
+            assert conn.execute("SELECT MAX(date) FROM daily_metrics").fetchone()[0] < latest
+    finally:
+        pool.close()
+
+
+def test_failed_refresh_keeps_previous_generation(tmp_path):
+    db_path = tmp_path / "pulse.duckdb"
+    refresh_duckdb_from_samples(sample_dir=SAMPLE_DIR, db_path=db_path, publish=True)
+    published = resolve_published_path(db_path)
+
+    with pytest.raises(RuntimeError):
+        with staging_database(db_path):
+            raise RuntimeError("fetch failed")
+
+    assert resolve_published_path(db_path) == published
+    assert sorted(p.name for p in generations_dir(db_path).iterdir()) == [
+        "CURRENT",
+        published.name,
+        generation_snapshot_dir(published).name,
+    ]
+
+
+def test_snapshot_is_swapped_in_with_its_generation(tmp_path):
+    db_path = tmp_path / "pulse.duckdb"
+    refresh_duckdb_from_samples(sample_dir=SAMPLE_DIR, db_path=db_path, publish=True)
+    first = resolve_published_path(db_path)
+    reader = SnapshotRepository(generation_snapshot_dir(first))
+    assert not default_snapshot_dir(db_path).exists()
+
+    backfill_alerts(db_path, publish=True)
+    second = resolve_published_path(db_path)
+    assert second != first
+    # The earlier generation's snapshot is left untouched for its readers
+    assert not reader.is_stale()
+    assert (resolve_snapshot(generation_snapshot_dir(second)) / DAILY_METRICS_FILE).exists()
+
+    with pytest.raises(RuntimeError):
+        with staging_database(db_path) as work_path:
+            staged_snapshot = generation_snapshot_dir(work_path)
+            assert staged_snapshot.is_dir()
+            raise RuntimeError("export failed")
+    assert not staged_snapshot.exists()
+    assert resolve_published_path(db_path) == second
+
+
+def test_concurrent_refreshes_stage_distinct_generations(tmp_path):
+    db_path = tmp_path / "pulse.duckdb"
+    refresh_duckdb_from_samples(sample_dir=SAMPLE_DIR, db_path=db_path, publish=True)
+
+    with staging_database(db_path) as first, staging_database(db_path) as second:
+        assert first != second
+        with duckdb.connect(str(first)) as conn:
+            conn.execute("DELETE FROM alerts")
+
+    # The outer refresh published last, and the inner one's generation survived it
+    assert resolve_published_path(db_path) == first
+    assert second.exists()
+
+
+def test_in_place_snapshot_is_never_read_half_written(tmp_path, monkeypatch):
+    db_path = tmp_path / "pulse.duckdb"
+    refresh_duckdb_from_samples(sample_dir=SAMPLE_DIR, db_path=db_path)
+    snapshot_dir = default_snapshot_dir(db_path)
+    first = resolve_snapshot(snapshot_dir)
+    reader = SnapshotRepository(snapshot_dir)
+    expected_days = reader.get_daily_metrics().height
+
+    readers = []
+    write = snapshot_module._write
+
+    def write_and_read(frame, path):
+        write(frame, path)
+        # A worker loading between two files of the refresh
+        readers.append(SnapshotRepository(snapshot_dir))
+
+    monkeypatch.setattr(snapshot_module, "_write", write_and_read)
+    with duckdb.connect(str(db_path)) as conn:
+        latest = conn.execute("SELECT MAX(date) FROM daily_metrics").fetchone()[0]
+        conn.execute("DELETE FROM daily_metrics WHERE date = ?", [latest])
+        snapshot_module.publish_snapshot(conn, snapshot_dir)
+
+    assert readers and all(r.get_daily_metrics().height == expected_days for r in readers)
+    assert reader.is_stale() and all(r.is_stale() for r in readers)
+    second = resolve_snapshot(snapshot_dir)
+    assert second != first
+    assert SnapshotRepository(snapshot_dir).get_daily_metrics().height == expected_days - 1
+    assert sorted(p.name for p in snapshot_dir.iterdir()) == ["CURRENT", first.name, second.name]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from backend.app.jobs.leader import SchedulerLock
+
+
+def test_only_one_scheduler_owner_until_released(tmp_path):
+    path = tmp_path / "scheduler.lock"
+    owner, follower = SchedulerLock(path), SchedulerLock(path)
+
+    assert owner.try_acquire()
+    assert not follower.try_acquire()
+    assert owner.try_acquire()
+
+    owner.release()
+    assert follower.try_acquire()
+    assert follower.held
+    follower.release()
+
+
+HOLD_LOCK = (
+    "import fcntl, sys, time\n"
+    "handle = open(sys.argv[1], 'a')\n"
+    "fcntl.flock(handle.fileno(), fcntl.LOCK_EX)\n"
+    "print('locked', flush=True)\n"
+    "time.sleep(60)\n"
+)
+
+
+def test_worker_without_the_scheduler_still_serves_metrics(tmp_path, monkeypatch):
+    import subprocess
+    import sys
+
+    import pytest
+    from fastapi.testclient import TestClient
+
+    pytest.importorskip("fcntl")
+    from backend.app import main
+
+    lock_path = tmp_path / "scheduler.lock"
+    monkeypatch.setattr(main, "scheduler_lock_path", lambda db_path: lock_path)
+    owner = subprocess.Popen(
+        [sys.executable, "-c", HOLD_LOCK, str(lock_path)], stdout=subprocess.PIPE, text=True
+    )
+    try:
+        assert owner.stdout.readline().strip() == "locked"
+        with TestClient(main.app) as client:
+            response = client.get("/api/metrics/kpis")
+            assert not main.app.state.scheduler.running
+    finally:
+        owner.kill()
+        owner.wait()
+
+    assert response.status_code == 200
+    assert "max-age=" in response.headers["cache-control"]
+
+
+READ_TABLE = (
+    "import duckdb, sys\n"
+    "with duckdb.connect(sys.argv[1], read_only=True) as conn:\n"
+    "    print(conn.execute('SELECT COUNT(*) FROM t').fetchone()[0])\n"
+)
+
+
+def test_only_the_in_place_writer_opens_the_warehouse_read_write(tmp_path, monkeypatch):
+    import asyncio
+    import subprocess
+    import sys
+
+    import duckdb
+
+    from backend.app.config import settings
+    from backend.app.db import pool as pools
+    from backend.app.jobs.scheduler import create_scheduler, run_scheduler_when_elected
+
+    db_path = tmp_path / "zcash_pulse.duckdb"
+    with duckdb.connect(str(db_path)) as conn:
+        conn.execute("CREATE TABLE t AS SELECT 1 AS x")
+    monkeypatch.setattr(pools, "_pools", {})
+    monkeypatch.setattr(pools, "_written_in_place", set())
+    monkeypatch.setattr(settings, "db_path", db_path)
+    monkeypatch.setattr(settings, "publish_generations", False)
+
+    # API workers share the file read-only
+    reader = pools.get_connection_pool(db_path)
+    with reader.connection() as conn:
+        conn.execute("SELECT * FROM t").fetchall()
+        other_worker = subprocess.run(
+            [sys.executable, "-c", READ_TABLE, str(db_path)], capture_output=True, text=True
+        )
+    assert reader.read_only
+    assert other_worker.stdout.strip() == "1"
+
+    # The elected worker refreshes in place, so its own reads switch to read-write
+    scheduler = create_scheduler()
+
+    async def elect():
+        await run_scheduler_when_elected(scheduler, SchedulerLock(tmp_path / "scheduler.lock"))
+        scheduler.shutdown(wait=False)
+
+    asyncio.run(elect())
+    writer = pools.get_connection_pool(db_path)
+    assert writer is not reader and not writer.read_only
+    with writer.connection() as conn, duckdb.connect(str(db_path)) as etl:
+        etl.execute("INSERT INTO t VALUES (2)")
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2
+    writer.close()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import polars as pl
+
+from data.etl.transformers.alert_generator import AnomalyDetector
+from data.etl.tuning import main, sweep_thresholds, threshold_grid
+
+
+def _history(days: int = 500) -> pl.DataFrame:
+    return pl.DataFrame({
+        "date": [date(2023, 1, 1) + timedelta(days=i) for i in range(days)],
+        "total_transactions": [20000 + (i * 37) % 900 + (4000 if i % 97 == 0 else 0)
+                               for i in range(days)],
+        "avg_fee_zec": [0.0002 + ((i * 17) % 11) * 1e-6 + (3e-4 if i % 61 == 0 else 0)
+                        for i in range(days)],
+        # No MONITORED_METRICS rule: alerts above anomaly_zscore_threshold
+        "median_fee_zec": [0.0001 + ((i * 13) % 7) * 1e-6 + (8e-6 if i % 43 == 0 else 0)
+                           for i in range(days)],
+    })
+
+
+def _alert_counts(alerts: pl.DataFrame) -> dict:
+    return {
+        "alerts": alerts.height,
+        "high": (alerts["severity"] == "high").sum(),
+        "alert_days": alerts["timestamp"].dt.date().n_unique(),
+    }
+
+
+def test_sweep_cells_match_backfilled_alerts():
+    history = _history()
+    axes = dict(windows=(14, 30), thresholds=(2.5, 3.5),
+                warnings=(1.5, 2.0, 2.5), criticals=(2.0, 2.5, 3.0))
+    results = sweep_thresholds(history, workers=1, **axes)
+    # 8 (warning, critical) pairs with critical >= warning
+    assert results.height == threshold_grid(**axes).height == 2 * 2 * 8
+
+    # The production rules of the monitored metrics here: warning 2.0σ, critical 2.5σ
+    for threshold in axes["thresholds"]:
+        alerts = AnomalyDetector(threshold=threshold).backfill_alerts(history, baseline_days=30)
+        cell = results.filter(
+            (pl.col("window") == 30) & (pl.col("threshold") == threshold)
+            & (pl.col("warning") == 2.0) & (pl.col("critical") == 2.5)
+        ).row(0, named=True)
+        assert {key: cell[key] for key in ("alerts", "high", "alert_days")} == (
+            _alert_counts(alerts)
+        )
+        assert "median_fee_zec" in alerts["metric"].to_list()
+
+    fees = sweep_thresholds(history, metrics=["avg_fee_zec"], workers=1, **axes)
+    alerts = AnomalyDetector().backfill_alerts(history).filter(pl.col("metric") == "avg_fee_zec")
+    cell = fees.filter(
+        (pl.col("window") == 30) & (pl.col("threshold") == 2.5)
+        & (pl.col("warning") == 2.0) & (pl.col("critical") == 2.5)
+    ).row(0, named=True)
+    assert cell["alerts"] == alerts.height > 0
+
+    # Counts only shrink as either threshold rises
+    for _, group in results.partition_by("window", "threshold", "critical", as_dict=True).items():
+        assert group.sort("warning")["alerts"].is_sorted(descending=True)
+    for _, group in results.partition_by("window", "warning", "critical", as_dict=True).items():
+        assert group.sort("threshold")["alerts"].is_sorted(descending=True)
+
+
+def test_sweep_splits_the_grid_across_worker_processes():
+    history = _history(200)
+    grid = dict(windows=(14,), thresholds=(2.0, 3.0), warnings=(2.0, 3.0), criticals=(3.0,))
+
+    # More workers than windows: the grid cells are what is spread over the pool
+    assert sweep_thresholds(history, workers=3, **grid).equals(
+        sweep_thresholds(history, workers=1, **grid)
+    )
+
+
+def test_cli_passes_detectors_through(tmp_path, capsys):
+    import duckdb
+
+    db_path = tmp_path / "history.duckdb"
+    history = _history(120)
+    with duckdb.connect(str(db_path)) as conn:
+        conn.execute("CREATE TABLE daily_metrics AS SELECT * FROM history")
+
+    args = ["--db", str(db_path), "--windows", "30", "--thresholds", "2.5",
+            "--warning", "2.0", "--critical", "2.5", "--workers", "1"]
+    counts = {}
+    for name in ("zscore", "seasonal"):
+        main([*args, "--detectors", f'{{"*": ["{name}"]}}', "--output", str(tmp_path / "s.csv")])
+        counts[name] = pl.read_csv(tmp_path / "s.csv")["alerts"].item()
+    capsys.readouterr()
+
+    assert counts == {
+        name: AnomalyDetector(detectors={"*": [name]}).backfill_alerts(history).height
+        for name in ("zscore", "seasonal")
+    }
+    assert counts["zscore"] != counts["seasonal"]
@@ -0,0 +1,172 @@
+"""Cold-tier history: date-partitioned, zstd-compressed Parquet next to the hot DuckDB window.
+
+Layout, for ``db_path = data/zcash_pulse.duckdb``::
+
+    data/zcash_pulse.archive/year=2024/month=03/data.parquet
+
+Each file holds one calendar month of daily metrics joined with their
+derived analytics. Readers combine the archive with the hot tables and
+prune partitions by their ``year=``/``month=`` directory before opening any file.
+The DuckDB repository queries the surviving partitions through
+``read_parquet``; the in-memory backends scan them with Polars.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import polars as pl
+
+from .transformers.derived_metrics import DERIVED_TABLE, MAX_WINDOW
+from .transformers.rollups import ROLLUP_SPAN_DAYS
+
+logger = logging.getLogger(__name__)
+
+PARTITION_FILE = "data.parquet"
+_PARTITION_PATTERN = re.compile(r"^year=(\d{4})/month=(\d{2})$")
+
+
+def default_archive_dir(db_path: Path) -> Path:
+    return db_path.parent / f"{db_path.stem}.archive"
+
+
+def _partition_month(path: Path) -> Optional[Tuple[int, int]]:
+    match = _PARTITION_PATTERN.match(path.parent.parent.name + "/" + path.parent.name)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def list_partitions(
+    archive_dir: Path,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> List[Path]:
+    """
+    Partition files whose month overlaps ``[start_date, end_date]``, oldest first.
+
+    Pruning happens on directory names alone, so files for months outside
+    the range are never opened (not even for their footer).
+    """
+    if not archive_dir.exists():
+        return []
+    low = (start_date.year, start_date.month) if start_date is not None else None
+    high = (end_date.year, end_date.month) if end_date is not None else None
+    selected = []
+    for path in archive_dir.glob(f"year=*/month=*/{PARTITION_FILE}"):
+        month = _partition_month(path)
+        if month is None or (low and month < low) or (high and month > high):
+            continue
+        selected.append((month, path))
+    return [path for _, path in sorted(selected)]
+
+
+def has_archive(archive_dir: Path) -> bool:
+    return bool(list_partitions(archive_dir))
+
+
+def _write_partition(path: Path, rows: pl.DataFrame) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        # Late-arriving days replace any archived copy of the same date
+        existing = pl.read_parquet(path).join(rows.select("date"), on="date", how="anti")
+        rows = pl.concat([existing, rows], how="diagonal_relaxed")
+    tmp_path = path.with_name(path.name + ".tmp")
+    rows.sort("date").write_parquet(tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+
+def archive_cold_history(conn, archive_dir: Path, hot_days: int) -> int:
+    """
+    Move whole months older than the hot window out of DuckDB into the Parquet archive.
+
+    The hot window never shrinks below the rolling-window context that
+    ``update_derived_metrics`` needs, nor below the span of a quarterly
+    rollup bucket, so incremental upserts keep working.
+
+    Args:
+        conn: Open DuckDB connection to the warehouse
+        archive_dir: Root of the partitioned archive
+        hot_days: Days of history to keep in DuckDB
+
+    Returns:
+        Number of days moved to the archive
+    """
+    hot_days = max(hot_days, MAX_WINDOW, ROLLUP_SPAN_DAYS)
+    latest = conn.execute("SELECT MAX(date) FROM daily_metrics").fetchone()[0]
+    if latest is None:
+        return 0
+    oldest_hot = latest - timedelta(days=hot_days)
+    cutoff = oldest_hot.replace(day=1)
+
+    cold = conn.execute(
+        f"SELECT m.*, d.* EXCLUDE (date) FROM daily_metrics m "
+        f"JOIN {DERIVED_TABLE} d ON d.date = m.date WHERE m.date < ? ORDER BY m.date",
+        [cutoff],
+    ).pl()
+    if cold.height == 0:
+        return 0
+
+    months = cold.with_columns(
+        pl.col("date").dt.year().alias("year"),
+        pl.col("date").dt.month().alias("month"),
+    ).partition_by(["year", "month"], as_dict=True)
+    for (year, month), rows in months.items():
+        path = archive_dir / f"year={year}" / f"month={month:02d}" / PARTITION_FILE
+        _write_partition(path, rows.drop("year", "month"))
+
+    conn.execute(f"DELETE FROM {DERIVED_TABLE} WHERE date < ?", [cutoff])
+    conn.execute("DELETE FROM daily_metrics WHERE date < ?", [cutoff])
+    logger.info(f"Archived {cold.height} days before {cutoff} into {len(months)} partitions")
+    return cold.height
+
+
+def scan_archive(
+    archive_dir: Path,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Optional[pl.LazyFrame]:
+    """Lazily scan archived days in ``[start_date, end_date]``; None if no partition overlaps."""
+    files = list_partitions(archive_dir, start_date, end_date)
+    if not files:
+        return None
+    frame = pl.concat([pl.scan_parquet(path) for path in files], how="diagonal_relaxed")
+    if start_date is not None:
+        frame = frame.filter(pl.col("date") >= start_date)
+    if end_date is not None:
+        frame = frame.filter(pl.col("date") <= end_date)
+    return frame
+
+
+def archive_relation(
+    archive_dir: Path,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Optional[str]:
+    """
+    DuckDB ``read_parquet`` over partitions overlapping ``[start_date, end_date]``, or None.
+
+    The files are listed rather than globbed: DuckDB binds a glob by
+    reading the first file's footer, which would open a month outside the
+    range, so partitions are pruned by directory name here first.
+    """
+    files = list_partitions(archive_dir, start_date, end_date)
+    if not files:
+        return None
+    quoted = ", ".join("'" + str(path).replace("'", "''") + "'" for path in files)
+    return f"read_parquet([{quoted}], union_by_name = true)"
+
+
+def read_daily_history(conn, archive_dir: Path) -> pl.DataFrame:
+    """Every raw ``daily_metrics`` row, archived months included, oldest first."""
+    history = conn.execute("SELECT * FROM daily_metrics ORDER BY date").pl()
+    if history.height == 0:
+        return history
+    cold = scan_archive(archive_dir, end_date=history["date"][0] - timedelta(days=1))
+    if cold is None:
+        return history
+    cold = cold.select(history.columns).collect()
+    return pl.concat([cold, history], how="vertical_relaxed")
@@ -2,11 +2,35 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from contextlib import nullcontext
 from datetime import date, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import duckdb
+import polars as pl
+
+from .archive import archive_cold_history, default_archive_dir, read_daily_history
+from .publishing import generation_snapshot_dir, staging_database
+from .snapshot import default_snapshot_dir, publish_snapshot
+from .transformers.alert_generator import (
+    BACKFILL_ID_PATTERN,
+    AnomalyDetector,
+    ensure_alerts_table,
+    insert_alerts,
+    persist_alerts,
+)
+from .transformers.baselines import (
+    load_baseline_state,
+    read_day,
+    rebuild_baselines,
+    update_baselines,
+)
+from .transformers.correlations import rebuild_correlations
+from .transformers.derived_metrics import rebuild_derived_metrics, update_derived_metrics
+from .transformers.detectors import lookback_days
+from .transformers.forecasting import rebuild_forecasts, update_forecasts
+from .transformers.rollups import rebuild_rollups, update_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -15,18 +39,33 @@ def refresh_duckdb_from_samples(
     *,
     sample_dir: Path | None = None,
     db_path: Path | None = None,
+    snapshot_dir: Path | None = None,
+    publish: bool = False,
+    hot_days: Optional[int] = None,
+    archive_dir: Path | None = None,
 ) -> Path:
-    """Load sample JSON snapshots into a DuckDB file for local experimentation."""
+    """
+    Load sample JSON snapshots into a DuckDB file and publish an API snapshot.
+
+    With ``publish=True`` the load is written to a new database generation
+    that replaces the live one atomically, together with its own snapshot
+    (see ``publishing.py``); ``snapshot_dir`` only applies otherwise. With
+    ``hot_days`` set, history older than that window moves to the Parquet
+    archive (see ``archive.py``).
+    """
     root_dir = Path(__file__).resolve().parents[2]
     sample_dir = sample_dir or root_dir / "data" / "sample"
     db_path = db_path or root_dir / "data" / "zcash_pulse.duckdb"
+    snapshot_dir = snapshot_dir or default_snapshot_dir(db_path)
+    archive_dir = archive_dir or default_archive_dir(db_path)
 
     daily_metrics_path = sample_dir / "daily_metrics_sample.json"
     alerts_path = sample_dir / "alerts_sample.json"
 
     logger.info("Persisting sample data to DuckDB at %s", db_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    with duckdb.connect(str(db_path)) as connection:
+    target = staging_database(db_path) if publish else nullcontext(db_path)
+    with target as work_path, duckdb.connect(str(work_path)) as connection:
         connection.execute(
             "CREATE OR REPLACE TABLE daily_metrics AS SELECT * FROM read_json_auto(?)",
             [str(daily_metrics_path)],
@@ -35,14 +74,84 @@ def refresh_duckdb_from_samples(
             "CREATE OR REPLACE TABLE alerts AS SELECT * FROM read_json_auto(?)",
             [str(alerts_path)],
         )
+        rebuild_derived_metrics(connection)
+        rebuild_rollups(connection)
+        rebuild_baselines(connection)
+        rebuild_forecasts(connection)
+        rebuild_correlations(connection)
+        if hot_days is not None:
+            archive_cold_history(connection, archive_dir, hot_days)
+        publish_snapshot(connection, generation_snapshot_dir(work_path) if publish else snapshot_dir)
     return db_path
 
 
+def _backfill_alerts_into(
+    conn,
+    archive_dir: Path,
+    detector: AnomalyDetector,
+    baseline_days: int = 30,
+    replace: bool = False,
+) -> pl.DataFrame:
+    """Detect anomalies on every stored day, archived ones included, and bulk insert them."""
+    history = read_daily_history(conn, archive_dir)
+    alerts = detector.backfill_alerts(history, baseline_days=baseline_days)
+    ensure_alerts_table(conn)
+    if replace:
+        conn.execute("DELETE FROM alerts WHERE regexp_matches(id, ?)", [BACKFILL_ID_PATTERN])
+    insert_alerts(conn, alerts)
+    logger.info(f"Backfilled {alerts.height} alerts over {history.height} days")
+    return alerts
+
+
+def backfill_alerts(
+    db_path: Path,
+    *,
+    baseline_days: int = 30,
+    replace: bool = True,
+    threshold: float = 2.5,
+    detectors: Optional[Dict[str, List[str]]] = None,
+    snapshot_dir: Path | None = None,
+    archive_dir: Path | None = None,
+    publish: bool = False,
+) -> int:
+    """
+    Generate alerts for every historical day and publish them.
+
+    Use after importing history or changing the detection thresholds.
+
+    Args:
+        db_path: Path to DuckDB file
+        baseline_days: Number of days to use as baseline
+        replace: Drop previously backfilled alerts first, so days that no
+            longer qualify lose theirs
+        threshold: Z-score threshold of metrics without their own alert rule
+        detectors: Detector names per metric (see ``detectors.py``)
+        snapshot_dir: Where to publish the API snapshot (defaults next to db_path);
+            published generations carry their own
+        archive_dir: Root of the cold Parquet archive (defaults next to db_path)
+        publish: Write into a new database generation and swap it in atomically
+
+    Returns:
+        Number of alerts backfilled
+    """
+    snapshot_dir = snapshot_dir or default_snapshot_dir(db_path)
+    archive_dir = archive_dir or default_archive_dir(db_path)
+    with staging_database(db_path) if publish else nullcontext(db_path) as work_path:
+        with duckdb.connect(str(work_path)) as conn:
+            detector = AnomalyDetector(threshold=threshold, detectors=detectors)
+            alerts = _backfill_alerts_into(conn, archive_dir, detector, baseline_days, replace)
+            publish_snapshot(conn, generation_snapshot_dir(work_path) if publish else snapshot_dir)
+    return alerts.height
+
+
 async def refresh_from_live_sources(
     *,
     dates: Optional[List[date]] = None,
     db_path: Path | None = None,
     backfill_days: int = 7,
+    snapshot_dir: Path | None = None,
+    publish: bool = False,
+    archive_dir: Path | None = None,
 ) -> Path:
     """
     Fetch live data from Zchain + CoinGecko APIs and persist to DuckDB.
@@ -51,6 +160,11 @@ async def refresh_from_live_sources(
         dates: Specific dates to fetch (defaults to today)
         db_path: Path to DuckDB file
         backfill_days: Number of historical days to backfill if database is empty
+        snapshot_dir: Where to publish the API snapshot (defaults next to db_path);
+            published generations carry their own
+        publish: Write into a new database generation and swap it in atomically
+            once the refresh succeeds, instead of updating db_path in place
+        archive_dir: Root of the cold Parquet archive (defaults next to db_path)
 
     Returns:
         Path to updated DuckDB file
@@ -67,6 +181,19 @@ async def refresh_from_live_sources(
     root_dir = Path(__file__).resolve().parents[2]
     db_path = db_path or settings.db_path
     db_path.parent.mkdir(parents=True, exist_ok=True)
+    snapshot_dir = snapshot_dir or default_snapshot_dir(db_path)
+    archive_dir = archive_dir or default_archive_dir(db_path)
+
+    if publish:
+        with staging_database(db_path) as work_path:
+            await refresh_from_live_sources(
+                dates=dates,
+                db_path=work_path,
+                backfill_days=backfill_days,
+                snapshot_dir=generation_snapshot_dir(work_path),
+                archive_dir=archive_dir,
+            )
+        return db_path
 
     logger.info(f"Starting live data refresh to {db_path}")
 
@@ -81,11 +208,19 @@ async def refresh_from_live_sources(
         if not zchain_ok:
             logger.error("Zchain API connection failed!")
             logger.warning("Falling back to sample data...")
-            return refresh_duckdb_from_samples(db_path=db_path)
+            return refresh_duckdb_from_samples(
+                db_path=db_path,
+                snapshot_dir=snapshot_dir,
+                hot_days=settings.hot_window_days,
+                archive_dir=archive_dir,
+            )
 
         if not coingecko_ok:
             logger.warning("CoinGecko API connection failed - price data unavailable")
 
+        # Ensure daily_metrics table exists
+        _ensure_tables_exist(db_path)
+
         # Determine which dates to fetch
         if dates is None:
             # Check if database is empty
@@ -107,9 +242,6 @@ async def refresh_from_live_sources(
             finally:
                 conn.close()
 
-        # Ensure daily_metrics table exists
-        _ensure_tables_exist(db_path)
-
         # Fetch data for each date
         success_count = 0
         for target_date in dates:
@@ -142,23 +274,15 @@ async def refresh_from_live_sources(
         if settings.enable_anomaly_detection:
             logger.info("Running anomaly detection...")
             try:
-                from .transformers.alert_generator import AnomalyDetector, persist_alerts
                 from app.services.notification_service import send_alerts_if_configured
-                import polars as pl
-
-                # Load all metrics from database
-                conn = duckdb.connect(str(db_path))
-                metrics_df = conn.execute("SELECT * FROM daily_metrics ORDER BY date").pl()
-                conn.close()
 
-                # Detect anomalies and generate alerts
-                detector = AnomalyDetector(threshold=settings.anomaly_zscore_threshold)
-                alerts = detector.generate_alerts(metrics_df)
+                detector = AnomalyDetector(
+                    threshold=settings.anomaly_zscore_threshold,
+                    detectors=settings.anomaly_detectors,
+                )
+                alerts = _detect_alerts(db_path, archive_dir, dates, detector)
 
                 if alerts:
-                    # Persist to database
-                    persist_alerts(db_path, alerts)
-
                     # Send notifications
                     await send_alerts_if_configured(alerts)
 
@@ -169,9 +293,88 @@ async def refresh_from_live_sources(
             except Exception as e:
                 logger.error(f"Anomaly detection failed: {e}", exc_info=True)
 
+    # Correlations span the whole history, so they are recomputed once per refresh;
+    # then roll old history into the archive and publish the snapshot the API loads from
+    conn = duckdb.connect(str(db_path))
+    try:
+        rebuild_correlations(conn, read_daily_history(conn, archive_dir))
+        archive_cold_history(conn, archive_dir, settings.hot_window_days)
+        publish_snapshot(conn, snapshot_dir)
+    finally:
+        conn.close()
+
     return db_path
 
 
+def _detect_alerts(
+    db_path: Path,
+    archive_dir: Path,
+    dates: List[date],
+    detector: AnomalyDetector,
+    baseline_days: int = 30,
+) -> List[dict]:
+    """
+    Check freshly fetched days for anomalies and store the alerts raised.
+
+    Args:
+        db_path: Path to DuckDB file
+        archive_dir: Root of the cold Parquet archive
+        dates: Days the refresh fetched
+        detector: Detector configured with the alert threshold and detectors
+        baseline_days: Number of days to use as baseline
+
+    Returns:
+        Alerts of the newest day, the ones worth notifying about
+    """
+    if len(dates) > 1 or detector.detectors:
+        conn = duckdb.connect(str(db_path))
+        try:
+            if len(dates) > 1:
+                # An import of several days: check the whole history in one pass
+                alerts = _backfill_alerts_into(conn, archive_dir, detector, baseline_days)
+                newest = max(dates)
+            else:
+                # Configured detectors need the recent days themselves rather
+                # than running statistics: just the days the latest one's
+                # scores depend on are read, and only its alerts are stored
+                newest = conn.execute("SELECT MAX(date) FROM daily_metrics").fetchone()[0]
+                if newest is None:
+                    return []
+                since = newest - timedelta(
+                    days=lookback_days(detector.detectors, window=baseline_days)
+                )
+                recent = conn.execute(
+                    "SELECT * FROM daily_metrics WHERE date >= ? ORDER BY date", [since]
+                ).pl()
+                alerts = detector.backfill_alerts(recent, baseline_days).filter(
+                    pl.col("timestamp").dt.date() == newest
+                )
+                insert_alerts(conn, alerts)
+        finally:
+            conn.close()
+        return (
+            alerts.filter(pl.col("timestamp").dt.date() == newest)
+            .with_columns(pl.col("timestamp").dt.to_string("%Y-%m-%dT%H:%M:%S"))
+            .to_dicts()
+        )
+
+    # Only the latest day is checked; its baseline comes from the
+    # running statistics each upsert keeps current.
+    conn = duckdb.connect(str(db_path))
+    try:
+        latest_df = conn.execute("SELECT * FROM daily_metrics ORDER BY date DESC LIMIT 1").pl()
+        state = load_baseline_state(conn)
+        if len(latest_df) and (state is None or state.as_of != latest_df["date"][0]):
+            state = rebuild_baselines(conn)
+        baseline_stats = state.as_baseline() if state is not None else {}
+    finally:
+        conn.close()
+
+    alerts = detector.generate_alerts(latest_df, baseline_stats=baseline_stats)
+    persist_alerts(db_path, alerts)
+    return alerts
+
+
 def _ensure_tables_exist(db_path: Path):
     """Create database tables if they don't exist."""
     conn = duckdb.connect(str(db_path))
@@ -217,9 +420,10 @@ def _ensure_tables_exist(db_path: Path):
 
 
 def _upsert_daily_metric(db_path: Path, metrics_data: dict):
-    """Insert or update a single day's metrics in DuckDB."""
+    """Insert or update a single day's metrics and everything maintained from them in DuckDB."""
     conn = duckdb.connect(str(db_path))
     try:
+        previous = read_day(conn, metrics_data.get("date"))
         # Use INSERT OR REPLACE (upsert)
         conn.execute("""
             INSERT OR REPLACE INTO daily_metrics (
@@ -242,5 +446,10 @@ def _upsert_daily_metric(db_path: Path, metrics_data: dict):
             metrics_data.get("market_cap_usd"),
             metrics_data.get("trading_volume_usd"),
         ])
+        # Keep rolling aggregates current for the days this upsert affects
+        update_derived_metrics(conn, [metrics_data.get("date")])
+        update_rollups(conn, [metrics_data.get("date")])
+        update_baselines(conn, metrics_data.get("date"), previous)
+        update_forecasts(conn, metrics_data.get("date"), previous)
     finally:
         conn.close()
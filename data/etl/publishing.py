@@ -0,0 +1,172 @@
+"""Copy-on-write publishing of versioned DuckDB generations.
+
+The ETL never writes to the database file readers have open. Each refresh
+copies the current generation to a new versioned file, writes there, and
+then atomically repoints ``CURRENT`` at it. Readers keep serving the
+generation they opened until they notice the pointer moved.
+
+Each generation has its own API snapshot directory, published by the same
+pointer swap, so the database and the snapshot readers load always come
+from the same refresh. Creating that directory also reserves the
+generation number, so concurrent refreshes never stage into the same file.
+
+Layout, for ``db_path = data/zcash_pulse.duckdb``::
+
+    data/zcash_pulse.generations/CURRENT                   # "zcash_pulse.gen-000042.duckdb"
+    data/zcash_pulse.generations/zcash_pulse.gen-000042.duckdb
+    data/zcash_pulse.generations/zcash_pulse.gen-000042.snapshot/
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+POINTER_FILE = "CURRENT"
+SNAPSHOT_SUFFIX = ".snapshot"
+KEEP_GENERATIONS = 3
+
+
+def generations_dir(db_path: Path) -> Path:
+    return db_path.parent / f"{db_path.stem}.generations"
+
+
+def pointer_path(db_path: Path) -> Path:
+    return generations_dir(db_path) / POINTER_FILE
+
+
+def _generation_pattern(db_path: Path) -> re.Pattern:
+    return re.compile(
+        rf"^{re.escape(db_path.stem)}\.gen-(\d+)"
+        rf"(?:{re.escape(db_path.suffix)}|{re.escape(SNAPSHOT_SUFFIX)})$"
+    )
+
+
+def _generation_path(db_path: Path, number: int) -> Path:
+    return generations_dir(db_path) / f"{db_path.stem}.gen-{number:06d}{db_path.suffix}"
+
+
+def generation_snapshot_dir(generation: Path) -> Path:
+    """API snapshot directory published together with a generation file."""
+    return generation.with_suffix(SNAPSHOT_SUFFIX)
+
+
+def _list_generations(db_path: Path) -> List[Path]:
+    """Published, staged and reserved generation files, oldest first."""
+    directory = generations_dir(db_path)
+    if not directory.exists():
+        return []
+    pattern = _generation_pattern(db_path)
+    numbers = set()
+    for path in directory.iterdir():
+        match = pattern.match(path.name)
+        if match:
+            numbers.add(int(match.group(1)))
+    return [_generation_path(db_path, number) for number in sorted(numbers)]
+
+
+def resolve_published_path(db_path: Path) -> Optional[Path]:
+    """Return the generation file ``CURRENT`` points at, or None if nothing is published."""
+    try:
+        name = pointer_path(db_path).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    published = generations_dir(db_path) / name
+    return published if published.exists() else None
+
+
+def _reserve_generation_path(db_path: Path) -> Path:
+    """Claim the next generation number by exclusively creating its snapshot directory."""
+    existing = _list_generations(db_path)
+    pattern = _generation_pattern(db_path)
+    number = int(pattern.match(existing[-1].name).group(1)) + 1 if existing else 1
+    while True:
+        staging = _generation_path(db_path, number)
+        try:
+            generation_snapshot_dir(staging).mkdir()
+        except FileExistsError:
+            # Another refresh claimed this number first
+            number += 1
+            continue
+        return staging
+
+
+def _remove_generation(path: Path) -> None:
+    for leftover in (path, path.with_name(path.name + ".wal")):
+        try:
+            leftover.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Could not remove old generation {leftover}: {e}")
+    shutil.rmtree(generation_snapshot_dir(path), ignore_errors=True)
+
+
+def _write_pointer(db_path: Path, target: Path) -> None:
+    pointer = pointer_path(db_path)
+    # Per-generation temporary name, so concurrent publishers never share it
+    tmp_pointer = pointer.with_name(f"{pointer.name}.{target.name}.tmp")
+    tmp_pointer.write_text(target.name, encoding="utf-8")
+    os.replace(tmp_pointer, pointer)
+
+
+def _prune(db_path: Path, keep: int) -> None:
+    current = resolve_published_path(db_path)
+    generations = _list_generations(db_path)
+    # Only retire generations older than the published one: newer ones are
+    # still being staged by a concurrent refresh
+    if current in generations:
+        generations = generations[: generations.index(current)]
+    # Readers may still hold the newest retired generations open
+    for path in generations[: max(0, len(generations) - (keep - 1))]:
+        _remove_generation(path)
+
+
+@contextmanager
+def staging_database(db_path: Path, keep: int = KEEP_GENERATIONS) -> Iterator[Path]:
+    """
+    Yield a private copy of the current database to write a refresh into.
+
+    The API snapshot of the refresh belongs in
+    ``generation_snapshot_dir(staging)``. On success the copy is
+    checkpointed and published, snapshot included, by atomically replacing
+    the ``CURRENT`` pointer; on failure both are discarded and the previous
+    generation stays live.
+
+    Args:
+        db_path: Logical database path (as configured in settings)
+        keep: Number of generations to retain on disk, including the current one
+    """
+    directory = generations_dir(db_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    base = resolve_published_path(db_path) or (db_path if db_path.exists() else None)
+    staging = _reserve_generation_path(db_path)
+
+    try:
+        if base is not None:
+            shutil.copy2(base, staging)
+            base_wal = base.with_name(base.name + ".wal")
+            if base_wal.exists():
+                shutil.copy2(base_wal, staging.with_name(staging.name + ".wal"))
+        logger.info(f"Staging refresh in {staging} (base: {base or 'empty'})")
+        yield staging
+        # Fold any WAL into the file so readers can open it read-only
+        with duckdb.connect(str(staging)) as conn:
+            conn.execute("CHECKPOINT")
+    except BaseException:
+        _remove_generation(staging)
+        logger.warning(f"Discarded staged generation {staging.name}")
+        raise
+
+    _write_pointer(db_path, staging)
+    logger.info(f"Published database generation {staging.name}")
+    _prune(db_path, keep)
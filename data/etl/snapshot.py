@@ -0,0 +1,172 @@
+"""Columnar snapshots of the warehouse that the API can memory-map at startup.
+
+Every publish writes a fresh version directory inside the snapshot
+directory and then atomically swaps the ``CURRENT`` pointer to it, so a
+reader that resolves the pointer once loads all files from one refresh.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import List
+
+import polars as pl
+
+from .transformers.derived_metrics import DERIVED_TABLE
+from .transformers.correlations import CORRELATION_TABLE, CROSS_CORRELATION_TABLE
+from .transformers.forecasting import FORECAST_TABLE
+from .transformers.rollups import ROLLUP_TABLE
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIRNAME = "snapshot"
+DAILY_METRICS_FILE = "daily_metrics.arrow"
+ALERTS_FILE = "alerts.arrow"
+ROLLUPS_FILE = "rollups.arrow"
+FORECASTS_FILE = "forecasts.arrow"
+CORRELATIONS_FILE = "correlations.arrow"
+CROSS_CORRELATIONS_FILE = "cross_correlations.arrow"
+SNAPSHOT_POINTER = "CURRENT"
+
+_VERSION_PATTERN = re.compile(r"^v-(\d+)$")
+
+
+def default_snapshot_dir(db_path: Path) -> Path:
+    """Snapshots of in-place refreshes live next to the DuckDB file they are exported from.
+
+    Published generations carry their own (see ``publishing.generation_snapshot_dir``).
+    """
+    return db_path.parent / SNAPSHOT_DIRNAME
+
+
+def snapshot_pointer(snapshot_dir: Path) -> Path:
+    return snapshot_dir / SNAPSHOT_POINTER
+
+
+def resolve_snapshot(snapshot_dir: Path) -> Path:
+    """
+    Directory holding the files of the snapshot published at ``snapshot_dir``.
+
+    Snapshots published before versioning keep their files in
+    ``snapshot_dir`` itself.
+    """
+    try:
+        name = snapshot_pointer(snapshot_dir).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return snapshot_dir
+    return snapshot_dir / name
+
+
+def _versions(snapshot_dir: Path) -> List[int]:
+    versions = []
+    for path in snapshot_dir.iterdir():
+        match = _VERSION_PATTERN.match(path.name)
+        if match and path.is_dir():
+            versions.append(int(match.group(1)))
+    return sorted(versions)
+
+
+def _version_dir(snapshot_dir: Path, number: int) -> Path:
+    return snapshot_dir / f"v-{number:06d}"
+
+
+def _reserve_version(snapshot_dir: Path) -> Path:
+    """Claim the next version number by exclusively creating its directory."""
+    number = max(_versions(snapshot_dir), default=0) + 1
+    while True:
+        path = _version_dir(snapshot_dir, number)
+        try:
+            path.mkdir()
+            return path
+        except FileExistsError:
+            number += 1
+
+
+def _write_pointer(snapshot_dir: Path, version_dir: Path) -> None:
+    pointer = snapshot_pointer(snapshot_dir)
+    tmp_pointer = pointer.with_name(f"{pointer.name}.{version_dir.name}.tmp")
+    tmp_pointer.write_text(version_dir.name, encoding="utf-8")
+    os.replace(tmp_pointer, pointer)
+
+
+def _prune(snapshot_dir: Path, current: Path) -> None:
+    # Keep the version before the current one for readers that resolved the
+    # pointer just before the swap; newer ones are still being written
+    current_number = int(_VERSION_PATTERN.match(current.name).group(1))
+    older = [number for number in _versions(snapshot_dir) if number < current_number]
+    for number in older[:-1]:
+        shutil.rmtree(_version_dir(snapshot_dir, number), ignore_errors=True)
+    if older:
+        # Files of a snapshot published before versioning
+        for path in snapshot_dir.glob("*.arrow"):
+            path.unlink(missing_ok=True)
+
+
+def _write(frame: pl.DataFrame, path: Path) -> None:
+    # Uncompressed IPC so readers can memory-map the file without decoding it
+    frame.write_ipc(path, compression="uncompressed")
+
+
+def publish_snapshot(conn, snapshot_dir: Path) -> Path:
+    """
+    Export daily metrics with derived analytics, precomputed views and alerts as Arrow IPC files.
+
+    The files are written into a new version directory that the pointer
+    is swapped to afterwards, so a reader never sees a partially written
+    snapshot or files of two refreshes.
+
+    Args:
+        conn: Open DuckDB connection to the warehouse
+        snapshot_dir: Directory to publish into
+
+    Returns:
+        The snapshot directory
+    """
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    version_dir = _reserve_version(snapshot_dir)
+    try:
+        days = _export(conn, version_dir)
+    except BaseException:
+        shutil.rmtree(version_dir, ignore_errors=True)
+        raise
+    _write_pointer(snapshot_dir, version_dir)
+    _prune(snapshot_dir, version_dir)
+    logger.info(f"Published snapshot with {days} days to {version_dir}")
+    return snapshot_dir
+
+
+def _export(conn, snapshot_dir: Path) -> int:
+    """Write every snapshot file into ``snapshot_dir``; returns the number of days."""
+    tables = {row[0] for row in conn.execute("SHOW TABLES").fetchall()}
+
+    daily_metrics = conn.execute(
+        f"SELECT m.*, d.* EXCLUDE (date) FROM daily_metrics m "
+        f"JOIN {DERIVED_TABLE} d ON d.date = m.date ORDER BY m.date"
+    ).pl()
+    _write(daily_metrics, snapshot_dir / DAILY_METRICS_FILE)
+
+    if ROLLUP_TABLE in tables:
+        rollups = conn.execute(f"SELECT * FROM {ROLLUP_TABLE} ORDER BY grain, bucket_start").pl()
+        _write(rollups, snapshot_dir / ROLLUPS_FILE)
+
+    if FORECAST_TABLE in tables:
+        forecasts = conn.execute(
+            f"SELECT * FROM {FORECAST_TABLE} ORDER BY metric, horizon_days"
+        ).pl()
+        _write(forecasts, snapshot_dir / FORECASTS_FILE)
+
+    if CORRELATION_TABLE in tables:
+        correlations = conn.execute(f"SELECT * FROM {CORRELATION_TABLE}").pl()
+        _write(correlations, snapshot_dir / CORRELATIONS_FILE)
+        cross_correlations = conn.execute(f"SELECT * FROM {CROSS_CORRELATION_TABLE}").pl()
+        _write(cross_correlations, snapshot_dir / CROSS_CORRELATIONS_FILE)
+
+    if "alerts" in tables:
+        alerts = conn.execute("SELECT * FROM alerts ORDER BY timestamp DESC").pl()
+        _write(alerts, snapshot_dir / ALERTS_FILE)
+
+    return daily_metrics.height
@@ -3,14 +3,49 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
-from typing import List, Tuple
-from uuid import uuid4
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 import polars as pl
 
+from .detectors import _ratio_columns, alert_metrics, score_metrics
+
 logger = logging.getLogger(__name__)
 
+# (column, alert type prefix, higher is better, warning z, critical z)
+MONITORED_METRICS = (
+    ("total_transactions", "transactions", True, 2.0, 2.5),
+    ("shielded_volume_zec", "shielded_volume", True, 2.5, 3.0),
+    ("avg_fee_zec", "fees", False, 2.0, 2.5),
+    ("active_addresses", "addresses", True, 2.0, 2.5),
+)
+
+ALERT_SCHEMA = {
+    "id": pl.String,
+    "timestamp": pl.Datetime("us"),
+    "type": pl.String,
+    "severity": pl.String,
+    "metric": pl.String,
+    "current_value": pl.Float64,
+    "baseline_value": pl.Float64,
+    "delta_percent": pl.Float64,
+    "summary": pl.String,
+    "explanation": pl.String,
+}
+
+# Alerts get one stable id per day and metric, whether raised live or backfilled,
+# so re-running detection over a day is idempotent
+BACKFILL_ID_PATTERN = r"^alert-\d{8}-"
+
+# (column, alert type prefix, higher is better, warning z, critical z)
+AlertRule = Tuple[str, str, Optional[bool], float, float]
+
+
+def alert_id(day: date | str, metric: str) -> str:
+    """Stable id of the alert on ``metric`` for ``day``."""
+    day = date.fromisoformat(day) if isinstance(day, str) else day
+    return f"alert-{day:%Y%m%d}-{metric}"
+
 
 class AnomalyDetector:
     """
@@ -20,14 +55,40 @@ class AnomalyDetector:
     a value is from the mean.
     """
 
-    def __init__(self, threshold: float = 2.5):
+    def __init__(
+        self,
+        threshold: float = 2.5,
+        detectors: Optional[Mapping[str, Sequence[str]]] = None,
+    ):
         """
         Initialize detector.
 
         Args:
-            threshold: Z-score threshold (default 2.5σ = ~99% confidence)
+            threshold: Z-score threshold (default 2.5σ = ~99% confidence);
+                metrics without a ``MONITORED_METRICS`` rule alert above it
+            detectors: Detector names per metric for ``backfill_alerts``
+                (``"*"`` for the default); z-score only when not given
         """
         self.threshold = threshold
+        self.detectors = detectors
+
+    def alert_rules(self, metrics: Iterable[str]) -> List[AlertRule]:
+        """
+        The ``MONITORED_METRICS`` rules of ``metrics``, then one for each other metric.
+
+        Other metrics alert when they deviate more than ``threshold``; with
+        no known good direction their alerts are never problems, so at
+        most medium severity.
+        """
+        metrics = list(metrics)
+        rules = [rule for rule in MONITORED_METRICS if rule[0] in metrics]
+        monitored = {rule[0] for rule in rules}
+        rules.extend(
+            (metric, metric, None, self.threshold, self.threshold)
+            for metric in metrics
+            if metric not in monitored
+        )
+        return rules
 
     def detect_anomalies(
         self,
@@ -56,73 +117,75 @@ class AnomalyDetector:
             logger.warning(f"Zero std dev for {metric_name} - cannot detect anomalies")
             return []
 
-        # Calculate z-scores
-        z_scores = (series - mean) / std
-
         # Find values beyond threshold
-        anomalies = []
-        for idx, (value, z_score) in enumerate(zip(series, z_scores)):
-            if abs(z_score) > self.threshold:
-                anomalies.append((idx, value, z_score))
-                logger.info(
-                    f"Anomaly detected in {metric_name}: "
-                    f"value={value:.2f}, z-score={z_score:.2f}σ"
-                )
+        anomalies = (
+            series.to_frame("value")
+            .with_row_index("index")
+            .with_columns(((pl.col("value") - mean) / std).alias("z_score"))
+            .filter(pl.col("z_score").abs() > self.threshold)
+        )
+        for _, value, z_score in anomalies.iter_rows():
+            logger.info(
+                f"Anomaly detected in {metric_name}: "
+                f"value={value:.2f}, z-score={z_score:.2f}σ"
+            )
 
-        return anomalies
+        return list(anomalies.iter_rows())
 
     def generate_alerts(
         self,
         daily_metrics: pl.DataFrame,
-        baseline_days: int = 30
+        baseline_days: int = 30,
+        baseline_stats: Optional[Dict[str, Tuple[float, float]]] = None,
     ) -> List[dict]:
         """
         Generate alert objects for detected anomalies.
 
-        Checks latest day against baseline of previous days.
+        Checks latest day against baseline of previous days, over the
+        on-chain metrics and derived ratios in ``ALERT_METRICS``; market
+        data such as the price is not alerted on.
 
         Args:
             daily_metrics: DataFrame with daily metrics (sorted by date)
             baseline_days: Number of days to use as baseline
+            baseline_stats: Precomputed ``{metric: (mean, std)}`` of the baseline
+                window (see ``baselines.py``). When given, only the latest row
+                of ``daily_metrics`` is read and no baseline is recomputed.
 
         Returns:
             List of alert dicts ready for insertion into alerts table
         """
-        if len(daily_metrics) < 2:
-            logger.warning("Not enough data to generate alerts")
+        daily_metrics = daily_metrics.with_columns(_ratio_columns(daily_metrics))
+        if baseline_stats is None:
+            if len(daily_metrics) < 2:
+                logger.warning("Not enough data to generate alerts")
+                return []
+
+            # Get baseline (all rows except latest)
+            baseline = daily_metrics[:-1].tail(baseline_days)
+            baseline_stats = {
+                column: (baseline[column].mean(), baseline[column].std())
+                for column in alert_metrics(baseline)
+            }
+
+        if len(daily_metrics) == 0 or not baseline_stats:
+            logger.warning("No baseline data available")
             return []
 
         # Get latest row
         latest = daily_metrics.row(-1, named=True)
-        latest_date = latest["date"]
-
-        # Get baseline (all rows except latest)
-        baseline = daily_metrics[:-1].tail(baseline_days)
-
-        if len(baseline) == 0:
-            logger.warning("No baseline data available")
-            return []
 
         alerts = []
 
-        # Check key metrics for anomalies
-        metrics_to_check = [
-            ("total_transactions", "transactions", True, 2.0, 2.5),
-            ("shielded_volume_zec", "shielded_volume", True, 2.5, 3.0),
-            ("avg_fee_zec", "fees", False, 2.0, 2.5),
-            ("active_addresses", "addresses", True, 2.0, 2.5),
-        ]
-
-        for column, metric_type, higher_is_better, warning_threshold, critical_threshold in metrics_to_check:
-            if column not in baseline.columns:
+        # Check every metric with a baseline for anomalies
+        for column, metric_type, higher_is_better, warning_threshold, critical_threshold in (
+            self.alert_rules(baseline_stats)
+        ):
+            if latest.get(column) is None:
                 continue
 
-            baseline_series = baseline[column]
             current_value = latest[column]
-
-            # Calculate baseline statistics
-            baseline_mean = baseline_series.mean()
-            baseline_std = baseline_series.std()
+            baseline_mean, baseline_std = baseline_stats[column]
 
             if baseline_std == 0 or baseline_std is None:
                 continue
@@ -142,7 +205,7 @@ class AnomalyDetector:
 
             # Determine if this is good or bad
             is_spike = z_score > 0
-            is_problem = (is_spike and not higher_is_better) or (not is_spike and higher_is_better)
+            is_problem = higher_is_better is not None and is_spike != higher_is_better
 
             # Adjust severity: only high severity for problems
             if not is_problem and severity == "high":
@@ -157,7 +220,7 @@ class AnomalyDetector:
             explanation = self._generate_explanation(metric_type, direction, z_score, is_problem)
 
             alert = {
-                "id": f"alert-{uuid4().hex[:12]}",
+                "id": alert_id(latest["date"], column),
                 "timestamp": datetime.now().isoformat(),
                 "type": f"{metric_type}_{direction}",
                 "severity": severity,
@@ -174,14 +237,108 @@ class AnomalyDetector:
 
         return alerts
 
+    def backfill_alerts(
+        self,
+        daily_metrics: pl.DataFrame,
+        baseline_days: int = 30,
+    ) -> pl.DataFrame:
+        """
+        Check every day of ``daily_metrics`` against its own trailing baseline.
+
+        The configured detectors (see ``detectors.py``) score all days and
+        every ``ALERT_METRICS`` metric in one vectorized pass, and
+        the rules of ``generate_alerts`` (see ``alert_rules``) apply to the
+        strongest score of each day and metric; only the anomalous rows are
+        materialized.
+
+        Args:
+            daily_metrics: DataFrame with daily metrics (any order)
+            baseline_days: Number of days to use as baseline
+
+        Returns:
+            Alerts as a frame with ``ALERT_SCHEMA`` columns, oldest first.
+            Each is stamped with its day and has a stable id, so backfilling
+            the same history twice yields the same alerts.
+        """
+        scores = score_metrics(daily_metrics, self.detectors, window=baseline_days)
+        rules = pl.DataFrame(
+            self.alert_rules(scores["metric"].unique(maintain_order=True)),
+            schema={
+                "metric": pl.String,
+                "metric_type": pl.String,
+                "higher_is_better": pl.Boolean,
+                "warning": pl.Float64,
+                "critical": pl.Float64,
+            },
+            orient="row",
+        )
+
+        is_spike = pl.col("z_score") > 0
+        anomalies = (
+            scores.lazy()
+            .rename({"value": "current_value", "center": "baseline_value", "score": "z_score"})
+            .join(rules.lazy(), on="metric")
+            .filter(pl.col("z_score").abs() > pl.col("warning"))
+            # One alert per day and metric, from the detector that deviates most
+            .sort(pl.col("z_score").abs(), descending=True)
+            .unique(["date", "metric"], keep="first")
+            .with_columns(
+                pl.when(is_spike).then(pl.lit("spike")).otherwise(pl.lit("drop")).alias("direction"),
+                (is_spike != pl.col("higher_is_better")).fill_null(False).alias("is_problem"),
+                pl.when(pl.col("baseline_value") != 0)
+                .then(
+                    (pl.col("current_value") - pl.col("baseline_value"))
+                    / pl.col("baseline_value") * 100
+                )
+                .otherwise(0.0)
+                .alias("delta_percent"),
+            )
+            .with_columns(
+                # Only problems are high severity
+                pl.when((pl.col("z_score").abs() > pl.col("critical")) & pl.col("is_problem"))
+                .then(pl.lit("high"))
+                .otherwise(pl.lit("medium"))
+                .alias("severity"),
+            )
+            .sort("date", "metric")
+            .collect()
+        )
+
+        rows = anomalies.select(
+            "date", "metric_type", "direction", "severity", "is_problem", "z_score", "delta_percent"
+        ).iter_rows()
+        summaries, explanations = [], []
+        for _, metric_type, direction, severity, is_problem, z, delta_percent in rows:
+            summaries.append(
+                self._generate_summary(metric_type, direction, abs(delta_percent), severity)
+            )
+            explanations.append(
+                self._generate_explanation(metric_type, direction, z, is_problem)
+            )
+
+        return anomalies.select(
+            pl.format(
+                "alert-{}-{}", pl.col("date").dt.strftime("%Y%m%d"), pl.col("metric")
+            ).alias("id"),
+            pl.col("date").cast(pl.Datetime("us")).alias("timestamp"),
+            pl.format("{}_{}", pl.col("metric_type"), pl.col("direction")).alias("type"),
+            "severity",
+            "metric",
+            "current_value",
+            "baseline_value",
+            "delta_percent",
+            pl.Series("summary", summaries, dtype=pl.String),
+            pl.Series("explanation", explanations, dtype=pl.String),
+        )
+
     def _generate_summary(self, metric_type: str, direction: str, pct_change: float, severity: str) -> str:
         """Generate human-readable alert summary."""
         icon = "🔴" if severity == "high" else "🟡" if severity == "medium" else "🟢"
 
         if direction == "spike":
-            return f"{icon} {metric_type.title()} spiked {pct_change:.1f}% above normal"
+            return f"{icon} {metric_type.replace('_', ' ').title()} spiked {pct_change:.1f}% above normal"
         else:
-            return f"{icon} {metric_type.title()} dropped {pct_change:.1f}% below normal"
+            return f"{icon} {metric_type.replace('_', ' ').title()} dropped {pct_change:.1f}% below normal"
 
     def _generate_explanation(self, metric_type: str, direction: str, z_score: float, is_problem: bool) -> str:
         """Generate technical explanation of the anomaly."""
@@ -214,6 +371,52 @@ class AnomalyDetector:
         return explanation
 
 
+def ensure_alerts_table(conn) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS alerts (
+            id VARCHAR PRIMARY KEY,
+            timestamp TIMESTAMP,
+            type VARCHAR,
+            severity VARCHAR,
+            metric VARCHAR,
+            current_value DOUBLE,
+            baseline_value DOUBLE,
+            delta_percent DOUBLE,
+            summary VARCHAR,
+            explanation VARCHAR
+        )
+    """)
+
+
+def insert_alerts(conn, alerts: pl.DataFrame) -> int:
+    """
+    Bulk insert an ``ALERT_SCHEMA`` frame into the alerts table in one statement.
+
+    Alerts whose id already exists are skipped, as are alerts of a type
+    already stored for the same day and metric (e.g. ones raised live
+    before ids were derived from the day).
+
+    Returns:
+        Number of alerts offered for insertion
+    """
+    ensure_alerts_table(conn)
+    if alerts.height == 0:
+        return 0
+    batch = alerts.select(pl.col(name).cast(dtype) for name, dtype in ALERT_SCHEMA.items())
+    conn.register("alert_batch", batch)
+    try:
+        # Anti-join rather than OR IGNORE: tables loaded from JSON have no primary key
+        conn.execute(
+            "INSERT INTO alerts BY NAME SELECT * FROM alert_batch b "
+            "WHERE b.id NOT IN (SELECT id FROM alerts) AND NOT EXISTS ("
+            "SELECT 1 FROM alerts a WHERE CAST(a.timestamp AS DATE) = CAST(b.timestamp AS DATE) "
+            "AND a.metric = b.metric AND a.type = b.type)"
+        )
+    finally:
+        conn.unregister("alert_batch")
+    return alerts.height
+
+
 def persist_alerts(db_path, alerts: List[dict]):
     """
     Persist generated alerts to DuckDB.
@@ -228,42 +431,12 @@ def persist_alerts(db_path, alerts: List[dict]):
 
     import duckdb
 
+    frame = pl.DataFrame(alerts).with_columns(
+        pl.col("timestamp").str.to_datetime(time_unit="us")
+    )
     conn = duckdb.connect(str(db_path))
     try:
-        # Create alerts table if it doesn't exist
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS alerts (
-                id VARCHAR PRIMARY KEY,
-                timestamp TIMESTAMP,
-                type VARCHAR,
-                severity VARCHAR,
-                metric VARCHAR,
-                current_value DOUBLE,
-                baseline_value DOUBLE,
-                delta_percent DOUBLE,
-                summary VARCHAR,
-                explanation VARCHAR
-            )
-        """)
-
-        # Insert alerts (skip duplicates)
-        for alert in alerts:
-            conn.execute("""
-                INSERT OR IGNORE INTO alerts
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, [
-                alert["id"],
-                alert["timestamp"],
-                alert["type"],
-                alert["severity"],
-                alert["metric"],
-                alert["current_value"],
-                alert["baseline_value"],
-                alert["delta_percent"],
-                alert["summary"],
-                alert["explanation"],
-            ])
-
+        insert_alerts(conn, frame)
         logger.info(f"Persisted {len(alerts)} alerts to database")
     finally:
         conn.close()
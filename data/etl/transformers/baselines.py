@@ -0,0 +1,242 @@
+"""Running per-metric baseline statistics for anomaly detection, kept in DuckDB.
+
+The baseline of the latest day is the mean/std of each metric over the
+``MAX_WINDOW`` days before it, for the same ``ALERT_METRICS`` the
+backfill scores, so a day gets the same alerts however it was fetched. It is held as Welford accumulators
+(count, mean, M2) that support adding and removing a value, so an upsert
+updates it in O(1) instead of re-reading the window.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .derived_metrics import MAX_WINDOW, _table_exists
+from .detectors import ALERT_METRICS, RATIO_METRICS
+
+logger = logging.getLogger(__name__)
+
+BASELINE_TABLE = "metric_baselines"
+
+# Metric -> (SQL expression over daily_metrics, columns it needs)
+BASELINE_METRICS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    metric: RATIO_METRICS.get(metric, (metric, (metric,))) for metric in ALERT_METRICS
+}
+
+
+class RunningStats:
+    """Welford accumulator over a multiset of values that supports removal."""
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0) -> None:
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def push(self, value: Optional[float]) -> None:
+        if value is None:
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def pop(self, value: Optional[float]) -> None:
+        if value is None:
+            return
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        # Clamp the rounding error that removal can leave behind
+        self.m2 = max(self.m2 - delta * (value - self.mean), 0.0)
+
+    @classmethod
+    def of(cls, values: Iterable[Optional[float]]) -> "RunningStats":
+        stats = cls()
+        for value in values:
+            stats.push(value)
+        return stats
+
+    @property
+    def std(self) -> Optional[float]:
+        """Sample standard deviation (ddof=1), as Polars computes it."""
+        if self.count < 2:
+            return None
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+class BaselineState:
+    """Accumulators for the ``days`` days before ``as_of``, starting at ``window_start``."""
+
+    def __init__(
+        self,
+        as_of: date,
+        window_start: Optional[date],
+        days: int,
+        stats: Dict[str, RunningStats],
+    ) -> None:
+        self.as_of = as_of
+        self.window_start = window_start
+        self.days = days
+        self.stats = stats
+
+    def as_baseline(self) -> Dict[str, Tuple[float, Optional[float]]]:
+        """``{column: (mean, std)}`` in the form ``AnomalyDetector.generate_alerts`` takes."""
+        return {
+            column: (stats.mean, stats.std)
+            for column, stats in self.stats.items()
+            if stats.count
+        }
+
+
+def baseline_metrics(conn) -> Dict[str, str]:
+    """SQL expression of each ``BASELINE_METRICS`` metric ``daily_metrics`` can provide."""
+    columns = {row[0] for row in conn.execute("DESCRIBE daily_metrics").fetchall()}
+    return {
+        metric: sql
+        for metric, (sql, inputs) in BASELINE_METRICS.items()
+        if set(inputs) <= columns
+    }
+
+
+def _select(metrics: Dict[str, str]) -> str:
+    return ", ".join(f"{sql} AS {metric}" for metric, sql in metrics.items())
+
+
+def read_day(conn, day: date | str) -> Optional[Dict[str, Any]]:
+    """The baseline metrics of one stored day, or None if the day is not stored."""
+    metrics = baseline_metrics(conn)
+    row = conn.execute(
+        f"SELECT {_select(metrics)} FROM daily_metrics WHERE date = ?", [day]
+    ).fetchone()
+    return dict(zip(metrics, row)) if row is not None else None
+
+
+def load_baseline_state(conn) -> Optional[BaselineState]:
+    """The stored state, or None if there is none or it tracks other metrics."""
+    if not _table_exists(conn, BASELINE_TABLE):
+        return None
+    rows = conn.execute(
+        f"SELECT metric, as_of, window_start, days, count, mean, m2 FROM {BASELINE_TABLE}"
+    ).fetchall()
+    if not rows or {row[0] for row in rows} != set(baseline_metrics(conn)):
+        return None
+    stats = {row[0]: RunningStats(*row[4:]) for row in rows}
+    return BaselineState(rows[0][1], rows[0][2], rows[0][3], stats)
+
+
+def _save(conn, state: BaselineState) -> None:
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {BASELINE_TABLE} (metric VARCHAR PRIMARY KEY, "
+        f"as_of DATE, window_start DATE, days BIGINT, count BIGINT, mean DOUBLE, m2 DOUBLE)"
+    )
+    conn.execute(f"DELETE FROM {BASELINE_TABLE}")
+    conn.executemany(
+        f"INSERT INTO {BASELINE_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            [
+                metric,
+                state.as_of,
+                state.window_start,
+                state.days,
+                stats.count,
+                stats.mean,
+                stats.m2,
+            ]
+            for metric, stats in state.stats.items()
+        ],
+    )
+
+
+def rebuild_baselines(conn, window: int = MAX_WINDOW) -> Optional[BaselineState]:
+    """Recompute the accumulators from the ``window`` days before the latest day."""
+    latest = conn.execute("SELECT MAX(date) FROM daily_metrics").fetchone()[0]
+    if latest is None:
+        return None
+    metrics = baseline_metrics(conn)
+    rows = conn.execute(
+        f"SELECT date, {_select(metrics)} FROM daily_metrics "
+        f"WHERE date < ? ORDER BY date DESC LIMIT ?",
+        [latest, window],
+    ).fetchall()
+    state = BaselineState(
+        as_of=latest,
+        window_start=rows[-1][0] if rows else None,
+        days=len(rows),
+        stats={
+            column: RunningStats.of(row[index + 1] for row in rows)
+            for index, column in enumerate(metrics)
+        },
+    )
+    _save(conn, state)
+    return state
+
+
+def update_baselines(
+    conn,
+    day: date | str,
+    previous: Optional[Dict[str, Any]],
+    window: int = MAX_WINDOW,
+) -> Optional[BaselineState]:
+    """
+    Fold an upsert of ``day`` into the running baseline.
+
+    Args:
+        conn: Open DuckDB connection, after the upsert
+        day: Date that was inserted or updated
+        previous: ``read_day(conn, day)`` from before the upsert (None for a new day)
+        window: Baseline length in days
+
+    Returns:
+        The updated state
+    """
+    day = date.fromisoformat(day) if isinstance(day, str) else day
+    state = load_baseline_state(conn)
+    if state is None:
+        return rebuild_baselines(conn, window)
+
+    if day > state.as_of:
+        # A new latest day: the old latest joins the window, the oldest day leaves it
+        joining = read_day(conn, state.as_of)
+        between = conn.execute(
+            "SELECT COUNT(*) FROM daily_metrics WHERE date > ? AND date < ?",
+            [state.as_of, day],
+        ).fetchone()[0]
+        if previous is not None or joining is None or between:
+            # Days were written without going through here
+            return rebuild_baselines(conn, window)
+        for column, stats in state.stats.items():
+            stats.push(joining[column])
+        state.days += 1
+        if state.window_start is None:
+            state.window_start = state.as_of
+        if state.days > window:
+            leaving = read_day(conn, state.window_start)
+            for column, stats in state.stats.items():
+                stats.pop(leaving[column])
+            state.window_start = conn.execute(
+                "SELECT MIN(date) FROM daily_metrics WHERE date > ?", [state.window_start]
+            ).fetchone()[0]
+            state.days -= 1
+        state.as_of = day
+    elif day == state.as_of:
+        # The latest day is not part of its own baseline
+        return state
+    elif previous is None:
+        # A backfilled day reshapes the window; rare enough to recompute
+        return rebuild_baselines(conn, window)
+    elif state.window_start is not None and day >= state.window_start:
+        current = read_day(conn, day)
+        for column, stats in state.stats.items():
+            stats.pop(previous[column])
+            stats.push(current[column])
+    else:
+        return state
+
+    _save(conn, state)
+    return state
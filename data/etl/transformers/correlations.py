@@ -0,0 +1,231 @@
+"""Rolling and lagged correlations between market data and shielded activity.
+
+Every (window, method, driver, metric) combination is an expression of one
+Polars query: rolling correlations are a single ``rolling`` aggregation per
+window, and cross-correlations at every lag a single ``group_by`` over the
+stacked lagged frames. The ETL computes both once per refresh and stores
+them for the API to read.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import List, Optional, Sequence
+
+import polars as pl
+
+from .detectors import _ratio_columns
+
+logger = logging.getLogger(__name__)
+
+CORRELATION_TABLE = "metric_correlations"
+CROSS_CORRELATION_TABLE = "metric_cross_correlations"
+
+WINDOWS = (7, 30, 90)
+METHODS = ("pearson", "spearman")
+# Positive lags: the driver leads the metric by that many days
+LAGS = tuple(range(-14, 15))
+
+CORRELATION_DRIVERS = ("zec_price_usd", "trading_volume_usd")
+CORRELATION_METRICS = ("shielded_tx_ratio", "shielded_volume_zec", "avg_fee_zec")
+
+CORRELATION_SCHEMA = {
+    "date": pl.Date,
+    "window_days": pl.Int64,
+    "method": pl.String,
+    "driver": pl.String,
+    "metric": pl.String,
+    "correlation": pl.Float64,
+    "days": pl.Int64,
+}
+CROSS_CORRELATION_SCHEMA = {
+    "as_of": pl.Date,
+    "window_days": pl.Int64,
+    "method": pl.String,
+    "driver": pl.String,
+    "metric": pl.String,
+    "lag": pl.Int64,
+    "correlation": pl.Float64,
+    "days": pl.Int64,
+}
+
+
+def min_days(window: int) -> int:
+    """Complete (driver, metric) days a window needs before its correlation is reported."""
+    return max(3, window // 2)
+
+
+def _prepare(daily: pl.DataFrame) -> pl.DataFrame:
+    frame = daily.sort("date")
+    frame = frame.with_columns(_ratio_columns(frame))
+    missing = [
+        pl.lit(None, dtype=pl.Float64).alias(column)
+        for column in (*CORRELATION_DRIVERS, *CORRELATION_METRICS)
+        if column not in frame.columns
+    ]
+    return frame.with_columns(missing).select(
+        "date", *(pl.col(column).cast(pl.Float64)
+                  for column in (*CORRELATION_DRIVERS, *CORRELATION_METRICS))
+    )
+
+
+def _aggregations(x: pl.Expr, y: pl.Expr, name: str) -> List[pl.Expr]:
+    """Correlations of ``x`` and ``y`` over their complete pairs, and the pair count."""
+    return [
+        *(pl.corr(x, y, method=method).alias(f"{method}:{name}") for method in METHODS),
+        (x.is_not_null() & y.is_not_null()).sum().cast(pl.Int64).alias(f"days:{name}"),
+    ]
+
+
+def _pairs(window: int, name: str, driver: str, metric: str) -> List[pl.Expr]:
+    """One struct column per method from the columns ``_aggregations`` produced."""
+    days = pl.col(f"days:{name}")
+    return [
+        pl.struct(
+            pl.lit(window, dtype=pl.Int64).alias("window_days"),
+            pl.lit(method).alias("method"),
+            pl.lit(driver).alias("driver"),
+            pl.lit(metric).alias("metric"),
+            pl.when(days >= min_days(window))
+            .then(pl.col(f"{method}:{name}").fill_nan(None))
+            .alias("correlation"),
+            days.alias("days"),
+        ).alias(f"{method}:{name}")
+        for method in METHODS
+    ]
+
+
+def _long(wide: pl.LazyFrame, index: str) -> pl.LazyFrame:
+    return (
+        wide.unpivot(index=index, value_name="pair")
+        .select(index, pl.col("pair").struct.unnest())
+        .filter(pl.col("correlation").is_not_null())
+    )
+
+
+def compute_correlations(
+    daily: pl.DataFrame,
+    windows: Sequence[int] = WINDOWS,
+) -> pl.DataFrame:
+    """
+    Trailing-window correlations of every driver with every metric, per day.
+
+    Args:
+        daily: Daily rows (any order) with the driver and metric columns;
+            missing columns just produce no rows
+        windows: Window lengths in calendar days
+
+    Returns:
+        Long frame of ``date, window_days, method, driver, metric,
+        correlation, days`` with one row per day whose window holds
+        ``min_days`` complete pairs
+    """
+    frame = _prepare(daily).lazy()
+    pairs = [(driver, metric) for driver in CORRELATION_DRIVERS for metric in CORRELATION_METRICS]
+    plans = []
+    for window in windows:
+        wide = frame.rolling("date", period=f"{window}d").agg(
+            expression
+            for driver, metric in pairs
+            for expression in _aggregations(pl.col(driver), pl.col(metric), f"{driver}:{metric}")
+        )
+        plans.append(_long(
+            wide.select(
+                "date",
+                *(expression
+                  for driver, metric in pairs
+                  for expression in _pairs(window, f"{driver}:{metric}", driver, metric)),
+            ),
+            "date",
+        ))
+    frames = [result for result in pl.collect_all(plans) if result.height]
+    if not frames:
+        return pl.DataFrame(schema=CORRELATION_SCHEMA)
+    return (
+        pl.concat(frames)
+        .select(list(CORRELATION_SCHEMA))
+        .sort("window_days", "method", "driver", "metric", "date")
+    )
+
+
+def compute_cross_correlations(
+    daily: pl.DataFrame,
+    windows: Sequence[int] = WINDOWS,
+    lags: Sequence[int] = LAGS,
+) -> pl.DataFrame:
+    """
+    Each metric over the latest ``window`` days against the driver ``lag`` days earlier.
+
+    Rows are taken as consecutive days, as the ETL stores one per day.
+
+    Returns:
+        Long frame of ``as_of, window_days, method, driver, metric, lag,
+        correlation, days``
+    """
+    frame = _prepare(daily)
+    if frame.height == 0:
+        return pl.DataFrame(schema=CROSS_CORRELATION_SCHEMA)
+    pairs = [(driver, metric) for driver in CORRELATION_DRIVERS for metric in CORRELATION_METRICS]
+    # Every lag's shifted drivers stacked into one frame, so one group_by covers all lags;
+    # ``age`` counts rows back from the latest day
+    shifted = pl.concat([
+        frame.lazy()
+        .select(
+            pl.lit(lag, dtype=pl.Int64).alias("lag"),
+            (pl.len() - 1 - pl.int_range(pl.len())).alias("age"),
+            *(pl.col(driver).shift(lag) for driver in CORRELATION_DRIVERS),
+            *CORRELATION_METRICS,
+        )
+        .tail(max(windows))
+        for lag in lags
+    ])
+    wide = shifted.group_by("lag").agg(
+        expression
+        for window in windows
+        for driver, metric in pairs
+        for expression in _aggregations(
+            pl.col(driver).filter(pl.col("age") < window),
+            pl.col(metric).filter(pl.col("age") < window),
+            f"{window}:{driver}:{metric}",
+        )
+    )
+    lagged = wide.select(
+        "lag",
+        *(expression
+          for window in windows
+          for driver, metric in pairs
+          for expression in _pairs(window, f"{window}:{driver}:{metric}", driver, metric)),
+    )
+    return (
+        _long(lagged, "lag")
+        .with_columns(pl.lit(frame["date"][-1]).alias("as_of"))
+        .select(list(CROSS_CORRELATION_SCHEMA))
+        .sort("window_days", "method", "driver", "metric", "lag")
+        .collect()
+    )
+
+
+def rebuild_correlations(conn, history: Optional[pl.DataFrame] = None) -> int:
+    """
+    Recompute both correlation tables.
+
+    Args:
+        conn: Open DuckDB connection to the warehouse
+        history: Raw daily rows, archived ones included (the hot
+            ``daily_metrics`` rows by default)
+
+    Returns:
+        Number of rolling correlation rows written
+    """
+    if history is None:
+        history = conn.execute("SELECT * FROM daily_metrics").pl()
+    rolling = compute_correlations(history)
+    lagged = compute_cross_correlations(history)
+    for table, frame in ((CORRELATION_TABLE, rolling), (CROSS_CORRELATION_TABLE, lagged)):
+        conn.register("correlation_batch", frame)
+        try:
+            conn.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM correlation_batch")
+        finally:
+            conn.unregister("correlation_batch")
+    logger.info(f"Stored {rolling.height} rolling and {lagged.height} lagged correlations")
+    return rolling.height
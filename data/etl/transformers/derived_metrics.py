@@ -0,0 +1,220 @@
+"""Derived daily analytics (ratios, rolling statistics, deltas) and their upkeep in DuckDB."""
+
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+DERIVED_TABLE = "daily_metrics_derived"
+
+# Rolling windows, in rows (one row per day)
+WINDOWS = (7, 30)
+MAX_WINDOW = max(WINDOWS)
+
+ROLLING_METRICS = (
+    "total_transactions",
+    "shielded_transactions",
+    "shielded_volume_zec",
+    "transparent_volume_zec",
+    "avg_fee_zec",
+    "active_addresses",
+    "shielded_tx_ratio",
+    "shielded_volume_ratio",
+    "privacy_score",
+    "adoption_velocity",
+)
+
+DELTA_METRICS = (
+    "total_transactions",
+    "shielded_tx_ratio",
+    "avg_fee_zec",
+    "active_addresses",
+)
+
+
+def _momentum(window: int) -> pl.Expr:
+    """(Δ shielded volume / Δ transparent volume) * 100 over the trailing window, capped ±100."""
+    def delta(column: str) -> pl.Expr:
+        values = pl.col(column)
+        return values - values.shift(window - 1).fill_null(values.first())
+
+    delta_shielded = delta("shielded_volume_zec")
+    delta_transparent = delta("transparent_volume_zec")
+    return (
+        pl.when(pl.int_range(pl.len()) == 0)
+        .then(0.0)
+        .when(delta_transparent == 0)
+        .then(pl.when(delta_shielded > 0).then(100.0).otherwise(-100.0))
+        .otherwise((delta_shielded / delta_transparent * 100).clip(-100.0, 100.0))
+        .alias(f"momentum_{window}d")
+    )
+
+
+def compute_derived_metrics(daily_metrics: pl.DataFrame) -> pl.DataFrame:
+    """
+    Compute derived analytics for every day in ``daily_metrics``.
+
+    Rolling windows are trailing and row based, so a row's values only
+    depend on itself and the ``MAX_WINDOW - 1`` rows before it.
+
+    Args:
+        daily_metrics: Raw daily metrics (any order)
+
+    Returns:
+        DataFrame with ``date`` plus one column per derived metric, sorted by date
+    """
+    frame = daily_metrics.sort("date").with_columns(
+        (pl.col("shielded_transactions") / pl.col("total_transactions")).alias(
+            "shielded_tx_ratio"
+        ),
+        (pl.col("shielded_volume_zec")
+         / (pl.col("shielded_volume_zec") + pl.col("transparent_volume_zec"))).alias(
+            "shielded_volume_ratio"
+        ),
+    )
+    frame = frame.with_columns(
+        # Privacy score: weighted average (tx ratio 60%, volume ratio 40%)
+        ((pl.col("shielded_tx_ratio") * 0.6 + pl.col("shielded_volume_ratio") * 0.4) * 100).alias(
+            "privacy_score"
+        ),
+        # Adoption velocity: day-over-day change in shielded tx share (percentage points)
+        (pl.col("shielded_tx_ratio").diff() * 100).fill_null(0.0).alias("adoption_velocity"),
+    )
+
+    expressions: List[pl.Expr] = []
+    for column in ROLLING_METRICS:
+        values = pl.col(column).cast(pl.Float64)
+        for window in WINDOWS:
+            expressions.append(
+                values.rolling_mean(window, min_samples=1).alias(f"{column}_mean_{window}d")
+            )
+            expressions.append(
+                values.rolling_std(window, min_samples=2).alias(f"{column}_std_{window}d")
+            )
+    for column in DELTA_METRICS:
+        previous = pl.col(column).shift(1)
+        expressions.append((pl.col(column) - previous).alias(f"{column}_delta"))
+        expressions.append(
+            pl.when(previous != 0)
+            .then((pl.col(column) - previous) / previous * 100)
+            .alias(f"{column}_delta_pct")
+        )
+    expressions.extend(_momentum(window) for window in WINDOWS)
+
+    return frame.with_columns(expressions).select(
+        "date",
+        "shielded_tx_ratio",
+        "shielded_volume_ratio",
+        "privacy_score",
+        "adoption_velocity",
+        *(expr.meta.output_name() for expr in expressions),
+    )
+
+
+def _table_exists(conn, table: str) -> bool:
+    return bool(
+        conn.execute(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?", [table]
+        ).fetchone()[0]
+    )
+
+
+def _replace_rows(conn, derived: pl.DataFrame) -> None:
+    conn.register("derived_batch", derived)
+    try:
+        if not _table_exists(conn, DERIVED_TABLE):
+            conn.execute(f"CREATE TABLE {DERIVED_TABLE} AS SELECT * FROM derived_batch")
+            return
+        if derived.height == 0:
+            return
+        conn.execute(
+            f"DELETE FROM {DERIVED_TABLE} WHERE date BETWEEN ? AND ?",
+            [derived["date"].min(), derived["date"].max()],
+        )
+        conn.execute(f"INSERT INTO {DERIVED_TABLE} BY NAME SELECT * FROM derived_batch")
+    finally:
+        conn.unregister("derived_batch")
+
+
+def rebuild_derived_metrics(conn) -> int:
+    """Recompute the derived table from the full ``daily_metrics`` history."""
+    daily = conn.execute("SELECT * FROM daily_metrics ORDER BY date").pl()
+    derived = compute_derived_metrics(daily)
+    conn.execute(f"DROP TABLE IF EXISTS {DERIVED_TABLE}")
+    _replace_rows(conn, derived)
+    return derived.height
+
+
+def update_derived_metrics(conn, changed_dates: Iterable[date | str]) -> int:
+    """
+    Refresh derived rows affected by upserts on ``changed_dates``.
+
+    A changed day feeds the rolling windows of itself and the next
+    ``MAX_WINDOW - 1`` rows, so only that span is recomputed, using the
+    ``MAX_WINDOW - 1`` rows before it as context.
+
+    Args:
+        conn: Open DuckDB connection
+        changed_dates: Dates inserted or updated in ``daily_metrics``
+
+    Returns:
+        Number of derived rows rewritten
+    """
+    dates = [date.fromisoformat(d) if isinstance(d, str) else d for d in changed_dates]
+    if not dates:
+        return 0
+    if not _table_exists(conn, DERIVED_TABLE):
+        return rebuild_derived_metrics(conn)
+    start, end = min(dates), max(dates)
+    context = MAX_WINDOW - 1
+
+    context_start = conn.execute(
+        "SELECT MIN(date) FROM (SELECT date FROM daily_metrics WHERE date < ? "
+        "ORDER BY date DESC LIMIT ?)",
+        [start, context],
+    ).fetchone()[0] or start
+    affected_end = conn.execute(
+        "SELECT MAX(date) FROM (SELECT date FROM daily_metrics WHERE date > ? "
+        "ORDER BY date LIMIT ?)",
+        [end, context],
+    ).fetchone()[0] or end
+
+    window = conn.execute(
+        "SELECT * FROM daily_metrics WHERE date BETWEEN ? AND ? ORDER BY date",
+        [context_start, affected_end],
+    ).pl()
+    derived = compute_derived_metrics(window).filter(pl.col("date") >= start)
+    _replace_rows(conn, derived)
+    logger.debug(f"Updated {derived.height} derived rows from {start} to {affected_end}")
+    return derived.height
+
+
+def load_baseline_stats(
+    conn,
+    before_date: date,
+    window: int = MAX_WINDOW,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Read the trailing-window mean/std of each rolling metric as of the day before ``before_date``.
+
+    Returns:
+        Mapping of metric column to ``(mean, std)``; empty if no earlier day exists
+    """
+    if not _table_exists(conn, DERIVED_TABLE):
+        return {}
+    row = conn.execute(
+        f"SELECT * FROM {DERIVED_TABLE} WHERE date < ? ORDER BY date DESC LIMIT 1",
+        [before_date],
+    ).pl()
+    if row.height == 0:
+        return {}
+    values = row.row(0, named=True)
+    return {
+        column: (values[f"{column}_mean_{window}d"], values[f"{column}_std_{window}d"])
+        for column in ROLLING_METRICS
+    }
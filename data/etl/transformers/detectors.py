@@ -0,0 +1,234 @@
+"""Registry of vectorized anomaly detectors evaluated over many metrics at once.
+
+A detector turns a metric column into a trailing ``(center, scale)``
+baseline built only from earlier days. A day's score is
+``(value - center) / scale``, i.e. how many (robust) standard deviations
+it sits from its baseline. Every configured (metric, detector) pair
+becomes a few columns of a single Polars ``select``, so scoring years of
+history over every metric is one native query.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import polars as pl
+
+# (values, window) -> (center, scale); expressions must only look at earlier rows
+Detector = Callable[[pl.Expr, int], Tuple[pl.Expr, pl.Expr]]
+
+DETECTORS: Dict[str, Detector] = {}
+
+# Detector name -> days before a day its score depends on, given the window
+LOOKBACKS: Dict[str, Callable[[int], int]] = {}
+
+DEFAULT_DETECTORS = ("zscore",)
+
+# Normal-consistency constant: MAD * 1.4826 estimates σ for Gaussian data
+MAD_SCALE = 1.4826
+
+# On-chain columns of ``daily_metrics``. Market data (price, market cap,
+# trading volume) comes from exchanges rather than the chain and is not
+# alerted on.
+ONCHAIN_METRICS = (
+    "total_transactions",
+    "shielded_transactions",
+    "transparent_transactions",
+    "shielded_volume_zec",
+    "transparent_volume_zec",
+    "avg_fee_zec",
+    "median_fee_zec",
+    "avg_block_time_seconds",
+    "active_addresses",
+)
+
+# Derived ratio -> (SQL expression over ``daily_metrics``, columns it needs);
+# Polars and DuckDB both evaluate these
+RATIO_METRICS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "shielded_tx_ratio": (
+        "CAST(shielded_transactions AS DOUBLE) / NULLIF(total_transactions, 0)",
+        ("shielded_transactions", "total_transactions"),
+    ),
+    "shielded_volume_ratio": (
+        "CAST(shielded_volume_zec AS DOUBLE) "
+        "/ NULLIF(shielded_volume_zec + transparent_volume_zec, 0)",
+        ("shielded_volume_zec", "transparent_volume_zec"),
+    ),
+}
+
+# The metrics anomaly detection covers, live and backfilled alike
+ALERT_METRICS = ONCHAIN_METRICS + tuple(RATIO_METRICS)
+
+
+def register_detector(
+    name: str,
+    lookback: Callable[[int], int] = lambda window: window,
+) -> Callable[[Detector], Detector]:
+    """Add a detector to ``DETECTORS`` under ``name``, reading ``lookback(window)`` earlier days."""
+    def decorator(detector: Detector) -> Detector:
+        DETECTORS[name] = detector
+        LOOKBACKS[name] = lookback
+        return detector
+
+    return decorator
+
+
+@register_detector("zscore")
+def zscore(values: pl.Expr, window: int) -> Tuple[pl.Expr, pl.Expr]:
+    """Mean and standard deviation of the previous ``window`` days."""
+    history = values.shift(1)
+    return (
+        history.rolling_mean(window, min_samples=1),
+        history.rolling_std(window, min_samples=2),
+    )
+
+
+@register_detector("mad")
+def median_mad(values: pl.Expr, window: int) -> Tuple[pl.Expr, pl.Expr]:
+    """
+    Median and scaled median absolute deviation of the previous ``window`` days.
+
+    The MAD is the median of each day's distance from the window's own
+    median, so a spike inside the window moves neither. The window spans
+    calendar days of the ``date`` column.
+    """
+    def trailing(statistic: pl.Expr) -> pl.Expr:
+        return statistic.rolling(index_column="date", period=f"{window}d", closed="left")
+
+    median = trailing(values.median())
+    mad = trailing((values - values.median()).abs().median())
+    return median, pl.when(trailing(values.count()) >= 3).then(mad * MAD_SCALE)
+
+
+# Days before the last four spans weigh under 0.1% of the mean
+@register_detector("ewma", lookback=lambda window: 4 * window)
+def ewma(values: pl.Expr, window: int) -> Tuple[pl.Expr, pl.Expr]:
+    """EWMA control chart: exponentially weighted mean/std with a span of ``window`` days."""
+    history = values.shift(1)
+    return (
+        history.ewm_mean(span=window, min_samples=1),
+        history.ewm_std(span=window, min_samples=2),
+    )
+
+
+@register_detector("seasonal", lookback=lambda window: max(window // 7, 4) * 7)
+def weekday_seasonal(values: pl.Expr, window: int) -> Tuple[pl.Expr, pl.Expr]:
+    """Mean/std of the same weekday over the weeks in ``window`` (at least four)."""
+    weekday = pl.col("date").dt.weekday()
+    weeks = max(window // 7, 4)
+    # Inside ``over`` the shift and the window both run per weekday
+    history = values.shift(1)
+    return (
+        history.rolling_mean(weeks, min_samples=1).over(weekday),
+        history.rolling_std(weeks, min_samples=2).over(weekday),
+    )
+
+
+def _ratio_columns(frame: pl.DataFrame) -> List[pl.Expr]:
+    """Derived ratios for frames holding only raw daily columns."""
+    available = set(frame.columns)
+    return [
+        pl.sql_expr(sql).alias(ratio)
+        for ratio, (sql, inputs) in RATIO_METRICS.items()
+        if ratio not in available and set(inputs) <= available
+    ]
+
+
+def alert_metrics(frame: pl.DataFrame) -> List[str]:
+    """The ``ALERT_METRICS`` a frame holds once its ratios are derived."""
+    available = set(frame.columns) | {expr.meta.output_name() for expr in _ratio_columns(frame)}
+    return [metric for metric in ALERT_METRICS if metric in available]
+
+
+def _resolve(
+    metrics: Iterable[str],
+    detectors: Optional[Mapping[str, Sequence[str]]],
+) -> List[Tuple[str, str]]:
+    config = detectors or {}
+    fallback = tuple(config.get("*", DEFAULT_DETECTORS))
+    pairs = []
+    for metric in metrics:
+        for name in config.get(metric, fallback):
+            if name not in DETECTORS:
+                raise ValueError(f"Unknown detector {name!r} for {metric}")
+            pairs.append((metric, name))
+    return pairs
+
+
+def lookback_days(
+    detectors: Optional[Mapping[str, Sequence[str]]] = None,
+    metrics: Sequence[str] = ALERT_METRICS,
+    window: int = 30,
+) -> int:
+    """Days of history before a day that its scores under ``detectors`` depend on."""
+    return max(LOOKBACKS[name](window) for _, name in _resolve(metrics, detectors))
+
+
+def score_metrics(
+    daily_metrics: pl.DataFrame,
+    detectors: Optional[Mapping[str, Sequence[str]]] = None,
+    metrics: Optional[Sequence[str]] = None,
+    window: int = 30,
+) -> pl.DataFrame:
+    """
+    Evaluate every configured detector on every metric in one batched select.
+
+    Args:
+        daily_metrics: Daily rows (any order) with a ``date`` column
+        detectors: Detector names per metric column; ``"*"`` sets the
+            default for unlisted metrics (``DEFAULT_DETECTORS`` otherwise)
+        metrics: Columns to score (every ``ALERT_METRICS`` metric by default)
+        window: Baseline length in days
+
+    Returns:
+        Long frame of ``date, metric, detector, value, center, scale, score``
+        sorted by date, metric and detector; ``score`` is null until a
+        baseline exists
+    """
+    frame = daily_metrics.sort("date")
+    frame = frame.with_columns(_ratio_columns(frame))
+    pairs = _resolve(metrics or alert_metrics(frame), detectors)
+    if not pairs:
+        return pl.DataFrame(
+            schema={"date": pl.Date, "metric": pl.String, "detector": pl.String,
+                    "value": pl.Float64, "center": pl.Float64, "scale": pl.Float64,
+                    "score": pl.Float64}
+        )
+
+    columns: List[pl.Expr] = []
+    for metric, name in pairs:
+        values = pl.col(metric).cast(pl.Float64)
+        center, scale = DETECTORS[name](values, window)
+        columns.append(
+            pl.struct(
+                pl.lit(metric).alias("metric"),
+                pl.lit(name).alias("detector"),
+                values.alias("value"),
+                center.alias("center"),
+                scale.alias("scale"),
+            ).alias(f"{metric}:{name}")
+        )
+    wide = frame.lazy().select("date", *columns)
+    return (
+        wide.unpivot(index="date", value_name="check")
+        .select("date", pl.col("check").struct.unnest())
+        .with_columns(
+            pl.when(pl.col("scale") > 0)
+            .then((pl.col("value") - pl.col("center")) / pl.col("scale"))
+            .alias("score")
+        )
+        .sort("date", "metric", "detector", maintain_order=True)
+        .collect()
+    )
+
+
+def detect(
+    daily_metrics: pl.DataFrame,
+    threshold: float = 2.5,
+    detectors: Optional[Mapping[str, Sequence[str]]] = None,
+    metrics: Optional[Sequence[str]] = None,
+    window: int = 30,
+) -> pl.DataFrame:
+    """Rows of ``score_metrics`` whose absolute score exceeds ``threshold``."""
+    scores = score_metrics(daily_metrics, detectors, metrics, window)
+    return scores.filter(pl.col("score").abs() > threshold)
@@ -0,0 +1,322 @@
+"""Holt (level + trend) forecasts of headline metrics with state kept in DuckDB.
+
+The smoothing parameters are fitted when the state is rebuilt; after that
+each new day advances the stored level/trend in O(1). The state after the
+latest day and after the day before it are both kept, so a revised latest
+day is re-applied without refitting. Forecasts at ``HORIZONS`` are written
+to ``FORECAST_TABLE`` on every update, and readers only select them.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import polars as pl
+
+from .derived_metrics import _table_exists
+
+logger = logging.getLogger(__name__)
+
+FORECAST_STATE_TABLE = "forecast_state"
+FORECAST_TABLE = "metric_forecasts"
+
+HORIZONS = (7, 30, 90)
+
+# Two-sided 95% prediction interval, assuming normal one-step errors
+INTERVAL_Z = 1.96
+
+# Candidate smoothing parameters tried when fitting (level, trend)
+ALPHAS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9)
+BETAS = (0.01, 0.05, 0.1, 0.2, 0.3)
+
+# Forecast name -> (SQL expression over daily_metrics, (lower bound, upper bound))
+FORECAST_METRICS: Dict[str, Tuple[str, Tuple[Optional[float], Optional[float]]]] = {
+    "shielded_adoption_pct": (
+        "100.0 * shielded_transactions / NULLIF(total_transactions, 0)",
+        (0.0, 100.0),
+    ),
+    "avg_fee_zec": ("avg_fee_zec", (0.0, None)),
+    "total_transactions": ("total_transactions", (0.0, None)),
+}
+
+FORECAST_SCHEMA = {
+    "metric": pl.String,
+    "as_of": pl.Date,
+    "horizon_days": pl.Int64,
+    "target_date": pl.Date,
+    "forecast": pl.Float64,
+    "lower": pl.Float64,
+    "upper": pl.Float64,
+}
+
+
+class HoltState:
+    """Holt's linear trend method with running one-step error statistics."""
+
+    def __init__(
+        self,
+        alpha: float,
+        beta: float,
+        level: float = 0.0,
+        trend: float = 0.0,
+        sse: float = 0.0,
+        errors: int = 0,
+        observations: int = 0,
+    ) -> None:
+        self.alpha = alpha
+        self.beta = beta
+        self.level = level
+        self.trend = trend
+        self.sse = sse
+        self.errors = errors
+        self.observations = observations
+
+    def copy(self) -> "HoltState":
+        return HoltState(
+            self.alpha, self.beta, self.level, self.trend, self.sse, self.errors, self.observations
+        )
+
+    def step(self, value: Optional[float]) -> None:
+        """Fold in the next day's value; missing values leave the state unchanged."""
+        if value is None or math.isnan(value):
+            return
+        if self.observations == 0:
+            self.level = value
+        elif self.observations == 1:
+            self.trend = value - self.level
+            self.level = value
+        else:
+            predicted = self.level + self.trend
+            error = value - predicted
+            self.sse += error * error
+            self.errors += 1
+            level = self.alpha * value + (1 - self.alpha) * predicted
+            self.trend = self.beta * (level - self.level) + (1 - self.beta) * self.trend
+            self.level = level
+        self.observations += 1
+
+    @property
+    def sigma(self) -> Optional[float]:
+        """Root mean squared one-step error."""
+        if self.errors < 2:
+            return None
+        return math.sqrt(self.sse / self.errors)
+
+    def forecast(self, horizon: int) -> Tuple[float, Optional[float], Optional[float]]:
+        """``(point, lower, upper)`` ``horizon`` days ahead; bounds are None without errors yet."""
+        point = self.level + horizon * self.trend
+        if self.sigma is None:
+            return point, None, None
+        # Variance of the h-step error for the additive-error Holt model
+        spread = 1 + sum((self.alpha * (1 + j * self.beta)) ** 2 for j in range(1, horizon))
+        margin = INTERVAL_Z * self.sigma * math.sqrt(spread)
+        return point, point - margin, point + margin
+
+
+class ForecastState:
+    """Fitted Holt states of every forecast metric after the day ``as_of``."""
+
+    def __init__(self, as_of: date, models: Dict[str, HoltState]) -> None:
+        self.as_of = as_of
+        self.models = models
+
+    def advance(self, day: date, values: Dict[str, Optional[float]]) -> "ForecastState":
+        models = {metric: model.copy() for metric, model in self.models.items()}
+        for metric, model in models.items():
+            model.step(values.get(metric))
+        return ForecastState(day, models)
+
+
+def fit_holt(values: Sequence[Optional[float]]) -> HoltState:
+    """The parameter pair from ``ALPHAS`` x ``BETAS`` with the least one-step squared error."""
+    best: Optional[HoltState] = None
+    for alpha in ALPHAS:
+        for beta in BETAS:
+            model = HoltState(alpha, beta)
+            for value in values:
+                model.step(value)
+            if best is None or model.sse < best.sse:
+                best = model
+    return best
+
+
+def fit_forecasts(history: pl.DataFrame) -> List[ForecastState]:
+    """
+    Fit every forecast metric on ``history`` (raw daily rows, any order).
+
+    Returns:
+        The states after the day before the latest and after the latest
+        day, oldest first (just one state for a single day, none for no days)
+    """
+    frame = history.sort("date").select(
+        "date",
+        *(pl.sql_expr(sql).cast(pl.Float64).alias(metric)
+          for metric, (sql, _) in FORECAST_METRICS.items()),
+    )
+    if frame.height == 0:
+        return []
+    dates = frame["date"].to_list()
+    prior = {}
+    latest = {}
+    for metric in FORECAST_METRICS:
+        values = frame[metric].to_list()
+        fitted = fit_holt(values)
+        model = HoltState(fitted.alpha, fitted.beta)
+        for value in values[:-1]:
+            model.step(value)
+        prior[metric] = model
+        latest[metric] = fitted
+    states = [ForecastState(dates[-1], latest)]
+    if len(dates) > 1:
+        states.insert(0, ForecastState(dates[-2], prior))
+    return states
+
+
+def forecast_frame(state: ForecastState, horizons: Sequence[int] = HORIZONS) -> pl.DataFrame:
+    """Point forecasts and intervals of every metric at each horizon, clipped to its bounds."""
+    rows = []
+    for metric, model in state.models.items():
+        if not model.observations:
+            continue
+        for horizon in horizons:
+            point, lower, upper = model.forecast(horizon)
+            rows.append({
+                "metric": metric,
+                "as_of": state.as_of,
+                "horizon_days": horizon,
+                "target_date": state.as_of + timedelta(days=horizon),
+                "forecast": point,
+                "lower": lower,
+                "upper": upper,
+            })
+    frame = pl.DataFrame(rows, schema=FORECAST_SCHEMA)
+    bounds = pl.DataFrame(
+        [(metric, low, high) for metric, (_, (low, high)) in FORECAST_METRICS.items()],
+        schema={"metric": pl.String, "low": pl.Float64, "high": pl.Float64},
+        orient="row",
+    )
+    return (
+        frame.join(bounds, on="metric", how="left")
+        .with_columns(pl.col("forecast", "lower", "upper").clip(pl.col("low"), pl.col("high")))
+        .drop("low", "high")
+        .sort("metric", "horizon_days")
+    )
+
+
+def compute_forecasts(history: pl.DataFrame) -> pl.DataFrame:
+    """Forecasts fitted from scratch, for sources without a stored forecast table."""
+    states = fit_forecasts(history)
+    if not states:
+        return pl.DataFrame(schema=FORECAST_SCHEMA)
+    return forecast_frame(states[-1])
+
+
+def load_forecast_states(conn) -> List[ForecastState]:
+    if not _table_exists(conn, FORECAST_STATE_TABLE):
+        return []
+    rows = conn.execute(
+        f"SELECT as_of, metric, alpha, beta, level, trend, sse, errors, observations "
+        f"FROM {FORECAST_STATE_TABLE} ORDER BY as_of"
+    ).fetchall()
+    states: Dict[date, Dict[str, HoltState]] = {}
+    for row in rows:
+        states.setdefault(row[0], {})[row[1]] = HoltState(*row[2:])
+    return [ForecastState(as_of, models) for as_of, models in states.items()]
+
+
+def _save(conn, states: List[ForecastState]) -> None:
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {FORECAST_STATE_TABLE} (as_of DATE, metric VARCHAR, "
+        f"alpha DOUBLE, beta DOUBLE, level DOUBLE, trend DOUBLE, sse DOUBLE, "
+        f"errors BIGINT, observations BIGINT, PRIMARY KEY (as_of, metric))"
+    )
+    conn.execute(f"DELETE FROM {FORECAST_STATE_TABLE}")
+    conn.executemany(
+        f"INSERT INTO {FORECAST_STATE_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            [state.as_of, metric, model.alpha, model.beta, model.level, model.trend,
+             model.sse, model.errors, model.observations]
+            for state in states
+            for metric, model in state.models.items()
+        ],
+    )
+    forecasts = forecast_frame(states[-1])
+    conn.register("forecast_batch", forecasts)
+    try:
+        conn.execute(f"CREATE OR REPLACE TABLE {FORECAST_TABLE} AS SELECT * FROM forecast_batch")
+    finally:
+        conn.unregister("forecast_batch")
+
+
+def rebuild_forecasts(conn, history: Optional[pl.DataFrame] = None) -> Optional[ForecastState]:
+    """
+    Refit the forecasters and rewrite their state and forecasts.
+
+    Args:
+        conn: Open DuckDB connection to the warehouse
+        history: Raw daily rows to fit on (the hot ``daily_metrics`` rows by default)
+
+    Returns:
+        The state after the latest day, or None without data
+    """
+    if history is None:
+        history = conn.execute("SELECT * FROM daily_metrics").pl()
+    states = fit_forecasts(history)
+    if not states:
+        return None
+    _save(conn, states)
+    return states[-1]
+
+
+def read_forecast_values(conn, day: date | str) -> Optional[Dict[str, Any]]:
+    """The forecast metrics of one stored day, or None if the day is not stored."""
+    columns = ", ".join(f"{sql} AS {metric}" for metric, (sql, _) in FORECAST_METRICS.items())
+    row = conn.execute(f"SELECT {columns} FROM daily_metrics WHERE date = ?", [day]).fetchone()
+    return dict(zip(FORECAST_METRICS, row)) if row is not None else None
+
+
+def update_forecasts(
+    conn,
+    day: date | str,
+    previous: Optional[Dict[str, Any]],
+) -> Optional[ForecastState]:
+    """
+    Advance the stored forecasters past an upsert of ``day``.
+
+    Args:
+        conn: Open DuckDB connection, after the upsert
+        day: Date that was inserted or updated
+        previous: Any row of ``day`` from before the upsert (None for a new day)
+
+    Returns:
+        The state after the latest day
+    """
+    day = date.fromisoformat(day) if isinstance(day, str) else day
+    states = load_forecast_states(conn)
+    if not states:
+        return rebuild_forecasts(conn)
+    latest = states[-1]
+
+    if day > latest.as_of and previous is None:
+        # A new latest day: one smoothing step from the stored state
+        between = conn.execute(
+            "SELECT COUNT(*) FROM daily_metrics WHERE date > ? AND date < ?",
+            [latest.as_of, day],
+        ).fetchone()[0]
+        if between:
+            # Days were written without going through here
+            return rebuild_forecasts(conn)
+        states = [latest, latest.advance(day, read_forecast_values(conn, day))]
+    elif day == latest.as_of and len(states) > 1:
+        # A revised latest day: re-apply it to the state before it
+        prior = states[0]
+        states = [prior, prior.advance(day, read_forecast_values(conn, day))]
+    else:
+        # Revisions further back change every later step; rare enough to refit
+        return rebuild_forecasts(conn)
+
+    _save(conn, states)
+    return states[-1]
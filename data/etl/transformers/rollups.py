@@ -0,0 +1,169 @@
+"""Weekly, monthly and quarterly rollups of daily metrics and their upkeep in DuckDB."""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, List
+
+import polars as pl
+
+from .derived_metrics import DERIVED_TABLE, _table_exists
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_TABLE = "daily_metrics_rollups"
+
+# Bucket name -> Polars truncation interval; weeks start on Monday
+GRAINS: Dict[str, str] = {"week": "1w", "month": "1mo", "quarter": "1q"}
+
+# Days a bucket can span back from its newest day (a quarter plus a partial week),
+# which the hot window must keep so touched buckets can be recomputed from DuckDB
+ROLLUP_SPAN_DAYS = 92 + 6
+
+ROLLUP_METRICS = (
+    "total_transactions",
+    "shielded_transactions",
+    "transparent_transactions",
+    "shielded_volume_zec",
+    "transparent_volume_zec",
+    "avg_fee_zec",
+    "median_fee_zec",
+    "avg_block_time_seconds",
+    "active_addresses",
+    "zec_price_usd",
+    "market_cap_usd",
+    "trading_volume_usd",
+    "shielded_tx_ratio",
+    "shielded_volume_ratio",
+    "privacy_score",
+    "adoption_velocity",
+)
+
+STATISTICS = ("sum", "mean", "min", "max", "last")
+
+
+def _aggregations(column: str) -> List[pl.Expr]:
+    values = pl.col(column)
+    return [
+        values.sum().alias(f"{column}_sum"),
+        values.mean().alias(f"{column}_mean"),
+        values.min().alias(f"{column}_min"),
+        values.max().alias(f"{column}_max"),
+        values.last().alias(f"{column}_last"),
+    ]
+
+
+def compute_rollups(daily: pl.DataFrame, grains: Iterable[str] = GRAINS) -> pl.DataFrame:
+    """
+    Aggregate daily rows (with derived ratios) into calendar buckets.
+
+    Args:
+        daily: Daily metrics joined with their derived analytics (any order)
+        grains: Bucket sizes to compute (keys of ``GRAINS``)
+
+    Returns:
+        One row per (grain, bucket_start) with ``bucket_end``, ``days`` and
+        ``<metric>_<sum|mean|min|max|last>`` columns, sorted by grain and bucket
+    """
+    # Market data is optional upstream; keep the rollup schema fixed regardless
+    daily = daily.sort("date").with_columns(
+        pl.lit(None, dtype=pl.Float64).alias(column)
+        for column in ROLLUP_METRICS
+        if column not in daily.columns
+    )
+    frames = []
+    for grain in grains:
+        frames.append(
+            daily.group_by(pl.col("date").dt.truncate(GRAINS[grain]).alias("bucket_start"))
+            .agg(
+                pl.col("date").max().alias("bucket_end"),
+                pl.len().cast(pl.Int64).alias("days"),
+                *(expr for column in ROLLUP_METRICS for expr in _aggregations(column)),
+            )
+            .select(pl.lit(grain).alias("grain"), pl.all())
+        )
+    return pl.concat(frames).sort("grain", "bucket_start")
+
+
+def _daily_rows(conn, start: date | None = None, end: date | None = None) -> pl.DataFrame:
+    conditions, params = [], []
+    if start is not None:
+        conditions.append("m.date >= ?")
+        params.append(start)
+    if end is not None:
+        conditions.append("m.date <= ?")
+        params.append(end)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return conn.execute(
+        f"SELECT m.*, d.* EXCLUDE (date) FROM daily_metrics m "
+        f"JOIN {DERIVED_TABLE} d ON d.date = m.date{where} ORDER BY m.date",
+        params,
+    ).pl()
+
+
+def rebuild_rollups(conn) -> int:
+    """Recompute every rollup bucket from the daily rows held in DuckDB."""
+    rollups = compute_rollups(_daily_rows(conn))
+    conn.execute(f"DROP TABLE IF EXISTS {ROLLUP_TABLE}")
+    conn.register("rollup_batch", rollups)
+    try:
+        conn.execute(f"CREATE TABLE {ROLLUP_TABLE} AS SELECT * FROM rollup_batch")
+    finally:
+        conn.unregister("rollup_batch")
+    return rollups.height
+
+
+def update_rollups(conn, changed_dates: Iterable[date | str]) -> int:
+    """
+    Recompute only the buckets containing ``changed_dates``.
+
+    Call after ``update_derived_metrics`` so the ratios are current.
+    A bucket that already counts more days than DuckDB holds for it
+    reaches into the archive and is left as it is; ``archive_cold_history``
+    keeps ``ROLLUP_SPAN_DAYS`` hot so the buckets of recent days never do.
+
+    Returns:
+        Number of rollup rows rewritten
+    """
+    dates = [date.fromisoformat(d) if isinstance(d, str) else d for d in changed_dates]
+    if not dates:
+        return 0
+    # A changed day also moves the next day's adoption velocity
+    dates += [day + timedelta(days=1) for day in dates]
+    if not _table_exists(conn, ROLLUP_TABLE):
+        return rebuild_rollups(conn)
+
+    rewritten = 0
+    for grain, every in GRAINS.items():
+        starts = pl.Series("bucket_start", dates).dt.truncate(every).unique().sort()
+        span_end = starts.dt.offset_by(every)[-1] - timedelta(days=1)
+        daily = _daily_rows(conn, starts[0], span_end)
+        rollups = compute_rollups(
+            daily.filter(pl.col("date").dt.truncate(every).is_in(starts.implode())), [grain]
+        )
+        stored = conn.execute(
+            f"SELECT bucket_start, days AS stored_days FROM {ROLLUP_TABLE} "
+            f"WHERE grain = ? AND bucket_start BETWEEN ? AND ?",
+            [grain, starts[0], starts[-1]],
+        ).pl()
+        partial = rollups.join(stored, on="bucket_start").filter(
+            pl.col("stored_days") > pl.col("days")
+        )["bucket_start"]
+        if partial.len():
+            logger.debug(f"Leaving archived {grain} buckets as they are: {partial.to_list()}")
+            rollups = rollups.filter(~pl.col("bucket_start").is_in(partial.implode()))
+        if rollups.height == 0:
+            continue
+        conn.register("rollup_batch", rollups)
+        try:
+            conn.execute(
+                f"DELETE FROM {ROLLUP_TABLE} WHERE grain = ? AND bucket_start IN "
+                f"(SELECT bucket_start FROM rollup_batch)",
+                [grain],
+            )
+            conn.execute(f"INSERT INTO {ROLLUP_TABLE} BY NAME SELECT * FROM rollup_batch")
+        finally:
+            conn.unregister("rollup_batch")
+        rewritten += rollups.height
+    return rewritten
@@ -0,0 +1,258 @@
+"""Replay daily history through the anomaly rules over a grid of thresholds and windows.
+
+Usage, from the repository root::
+
+    python -m data.etl.tuning --db backend/data/zcash_pulse.duckdb \\
+        --windows 14,30,60 --thresholds 2.0:3.5:0.5 \\
+        --warning 1.5:3.5:0.1 --critical 2.0:4.5:0.1 --detectors '{"*": ["mad"]}'
+
+A grid cell is a baseline window, an ``anomaly_zscore_threshold`` and the
+warning/critical thresholds tried for every ``MONITORED_METRICS`` rule;
+its rules are those ``AnomalyDetector.alert_rules`` builds for that
+threshold. Each window is scored once with the vectorized detectors, and
+the grid is split into chunks that worker processes evaluate, each in a
+single cross-joined aggregation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import duckdb
+import polars as pl
+
+from .archive import default_archive_dir, read_daily_history
+from .publishing import resolve_published_path
+from .transformers.alert_generator import MONITORED_METRICS, AnomalyDetector
+from .transformers.detectors import alert_metrics, score_metrics
+
+logger = logging.getLogger(__name__)
+
+SWEEP_COLUMNS = ("window", "threshold", "warning", "critical")
+
+# Grid chunks handed to each worker process, to even out their load
+CHUNKS_PER_WORKER = 4
+
+
+def threshold_grid(
+    windows: Sequence[int],
+    thresholds: Sequence[float],
+    warnings: Sequence[float],
+    criticals: Sequence[float],
+) -> pl.DataFrame:
+    """Every (window, threshold, warning, critical) cell with ``critical >= warning``."""
+    axes = [
+        pl.DataFrame({"window": list(windows)}, schema={"window": pl.Int64}),
+        pl.DataFrame({"threshold": list(thresholds)}, schema={"threshold": pl.Float64}),
+        pl.DataFrame({"warning": list(warnings)}, schema={"warning": pl.Float64}),
+        pl.DataFrame({"critical": list(criticals)}, schema={"critical": pl.Float64}),
+    ]
+    grid = axes[0]
+    for axis in axes[1:]:
+        grid = grid.join(axis, how="cross")
+    return grid.filter(pl.col("critical") >= pl.col("warning"))
+
+
+def _rule_frame(thresholds: Sequence[float], metrics: Sequence[str]) -> pl.DataFrame:
+    """
+    ``AnomalyDetector(threshold=t).alert_rules(metrics)`` for every threshold.
+
+    The warning/critical thresholds of ``MONITORED_METRICS`` rules are left
+    null, as the grid supplies them.
+    """
+    monitored = {rule[0] for rule in MONITORED_METRICS}
+    rows = [
+        (threshold, metric, higher_is_better,
+         None if metric in monitored else warning,
+         None if metric in monitored else critical)
+        for threshold in thresholds
+        for metric, _, higher_is_better, warning, critical in (
+            AnomalyDetector(threshold=threshold).alert_rules(metrics)
+        )
+    ]
+    return pl.DataFrame(
+        rows,
+        schema={
+            "threshold": pl.Float64,
+            "metric": pl.String,
+            "higher_is_better": pl.Boolean,
+            "rule_warning": pl.Float64,
+            "rule_critical": pl.Float64,
+        },
+        orient="row",
+    )
+
+
+def _scored_days(
+    history: pl.DataFrame,
+    window: int,
+    metrics: Sequence[str],
+    detectors: Optional[Dict[str, List[str]]],
+) -> pl.DataFrame:
+    """Strongest score per day and metric for one baseline window."""
+    scores = score_metrics(history, detectors, metrics, window)
+    return (
+        scores.lazy()
+        .filter(pl.col("score").is_not_null())
+        .group_by("date", "metric")
+        .agg(pl.col("score").get(pl.col("score").abs().arg_max()))
+        .select(pl.lit(window, dtype=pl.Int64).alias("window"), "date", "metric", "score")
+        .collect()
+    )
+
+
+def evaluate_thresholds(
+    scored: pl.DataFrame,
+    rules: pl.DataFrame,
+    grid: pl.DataFrame,
+) -> pl.DataFrame:
+    """
+    Count the alerts ``generate_alerts`` would raise for each grid cell.
+
+    A day and metric alerts when its strength exceeds its rule's warning
+    threshold (the cell's ``warning`` for monitored metrics); it is high
+    severity when it also exceeds the critical one and is a problem.
+    """
+    least = min(grid["warning"].min(), grid["threshold"].min())
+    candidates = (
+        scored.lazy()
+        .with_columns(pl.col("score").abs().alias("strength"))
+        .filter(pl.col("strength") > least)
+        .join(rules.lazy(), on="metric")
+    )
+    counts = (
+        candidates.join(grid.lazy(), on=["window", "threshold"])
+        .filter(pl.col("strength") > pl.coalesce("rule_warning", "warning"))
+        .group_by(SWEEP_COLUMNS)
+        .agg(
+            pl.len().alias("alerts"),
+            (
+                (pl.col("strength") > pl.coalesce("rule_critical", "critical"))
+                & ((pl.col("score") > 0) != pl.col("higher_is_better")).fill_null(False)
+            )
+            .sum()
+            .alias("high"),
+            pl.col("date").n_unique().alias("alert_days"),
+        )
+    )
+    return (
+        grid.lazy()
+        .join(counts, on=list(SWEEP_COLUMNS), how="left")
+        .with_columns(pl.col("alerts", "high", "alert_days").fill_null(0).cast(pl.Int64))
+        .with_columns(
+            (pl.col("alerts") - pl.col("high")).alias("medium"),
+            (pl.col("high") / pl.col("alerts")).fill_nan(None).alias("high_share"),
+        )
+        .collect()
+    )
+
+
+def sweep_thresholds(
+    history: pl.DataFrame,
+    windows: Sequence[int] = (14, 30, 60),
+    thresholds: Sequence[float] = (2.0, 2.5, 3.0),
+    warnings: Sequence[float] = (1.5, 2.0, 2.5, 3.0),
+    criticals: Sequence[float] = (2.0, 2.5, 3.0, 3.5),
+    metrics: Optional[Sequence[str]] = None,
+    detectors: Optional[Dict[str, List[str]]] = None,
+    workers: Optional[int] = None,
+) -> pl.DataFrame:
+    """
+    Replay ``history`` through the anomaly rules for every grid configuration.
+
+    Args:
+        history: Raw daily metrics (any order)
+        windows: Baseline lengths in days
+        thresholds: ``anomaly_zscore_threshold`` values, for metrics
+            without a ``MONITORED_METRICS`` rule
+        warnings: Warning z thresholds of the monitored metrics
+        criticals: Critical z thresholds (pairs below their warning are skipped)
+        metrics: Metrics to include (every ``ALERT_METRICS`` metric by default)
+        detectors: Detector names per metric, as for ``AnomalyDetector``
+        workers: Worker processes (defaults to the CPU count)
+
+    Returns:
+        One row per (window, threshold, warning, critical) with ``alerts``,
+        ``high``, ``medium``, ``high_share`` and ``alert_days``
+    """
+    grid = threshold_grid(windows, thresholds, warnings, criticals)
+    metrics = list(metrics or alert_metrics(history))
+    rules = _rule_frame(thresholds, metrics)
+    scored = pl.concat([_scored_days(history, w, metrics, detectors) for w in windows])
+
+    workers = workers or os.cpu_count() or 1
+    chunks = grid.iter_slices(max(math.ceil(grid.height / (workers * CHUNKS_PER_WORKER)), 1))
+    if workers <= 1:
+        results = [evaluate_thresholds(scored, rules, grid)]
+    else:
+        # Spawned workers: forking a process that already runs Polars' thread pool can deadlock
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(
+                    evaluate_thresholds,
+                    scored.filter(pl.col("window").is_in(chunk["window"].unique().implode())),
+                    rules,
+                    chunk,
+                )
+                for chunk in chunks
+            ]
+            results = [future.result() for future in futures]
+    return pl.concat(results).sort(*SWEEP_COLUMNS)
+
+
+def _parse_values(spec: str, cast=float) -> List:
+    """``"1,2,3"`` or an inclusive ``"start:stop:step"`` range."""
+    if ":" not in spec:
+        return [cast(value) for value in spec.split(",") if value]
+    start, stop, step = (float(part) for part in spec.split(":"))
+    count = int(round((stop - start) / step)) + 1
+    return [cast(round(start + index * step, 10)) for index in range(count)]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, required=True, help="DuckDB warehouse to replay")
+    parser.add_argument("--windows", default="14,30,60", help="Baseline windows in days")
+    parser.add_argument("--thresholds", default="2.0:3.5:0.25",
+                        help="anomaly_zscore_threshold values")
+    parser.add_argument("--warning", default="1.5:3.5:0.25", help="Warning thresholds")
+    parser.add_argument("--critical", default="2.0:4.5:0.25", help="Critical thresholds")
+    parser.add_argument("--metrics", default=None, help="Comma-separated metrics")
+    parser.add_argument("--detectors", type=json.loads, default=None,
+                        help='Detector names per metric as JSON, e.g. \'{"*": ["mad"]}\'')
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--output", type=Path, default=None, help="Write all rows to CSV")
+    args = parser.parse_args(argv)
+
+    database = resolve_published_path(args.db) or args.db
+    with duckdb.connect(str(database), read_only=True) as conn:
+        history = read_daily_history(conn, default_archive_dir(args.db))
+    results = sweep_thresholds(
+        history,
+        windows=_parse_values(args.windows, int),
+        thresholds=_parse_values(args.thresholds),
+        warnings=_parse_values(args.warning),
+        criticals=_parse_values(args.critical),
+        metrics=args.metrics.split(",") if args.metrics else None,
+        detectors=args.detectors,
+        workers=args.workers,
+    )
+    logger.info(f"Evaluated {results.height} configurations over {history.height} days")
+    if args.output:
+        results.write_csv(args.output)
+    with pl.Config(tbl_rows=40):
+        print(results.sort("alert_days", *SWEEP_COLUMNS))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -11,9 +11,11 @@ import { NetworkHealthCard } from "./components/NetworkHealthCard";
 import { PoolMigrationCard } from "./components/PoolMigrationCard";
 import { PrivacyPanel } from "./components/PrivacyPanel";
 import { TrendChart } from "./components/TrendChart";
+import { useGenerationEvents } from "./hooks/useGenerationEvents";
 import { useAlerts, useDailyMetrics, useKpis } from "./hooks/useMetrics";
 
 export default function App() {
+  useGenerationEvents();
   const { data: metrics, isLoading: metricsLoading } = useDailyMetrics();
   const { data: kpis, isLoading: kpiLoading } = useKpis();
   const { data: alerts, isLoading: alertsLoading } = useAlerts();
@@ -9,7 +9,7 @@ export function PoolMigrationCard() {
       const response = await api.get("/metrics/pool-migration");
       return response.data;
     },
-    refetchInterval: 60000,
+    staleTime: 5 * 60 * 1000,
   });
 
   if (isLoading) {
@@ -26,7 +26,7 @@ export function TrendChart({ data }: TrendChartProps) {
       const response = await api.get("/alerts");
       return response.data;
     },
-    refetchInterval: 60000,
+    staleTime: 5 * 60 * 1000,
   });
 
   // Extract unique dates from alerts (convert timestamp to date string)
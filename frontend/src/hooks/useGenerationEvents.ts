@@ -0,0 +1,42 @@
+import { useEffect } from "react";
+import { useQueryClient } from "@tanstack/react-query";
+import { API_BASE_URL } from "../config/api";
+
+interface GenerationEvent {
+  version: string;
+  dashboard: {
+    daily: unknown;
+    kpis: unknown[];
+    summary: unknown;
+    privacy: unknown;
+    health: unknown;
+    momentum: unknown;
+    pool_migration: unknown;
+    metadata: unknown;
+  };
+}
+
+// Subscribe once to /api/events and refresh every dashboard query from the
+// pushed bundle, instead of each widget polling its own endpoint.
+export const useGenerationEvents = () => {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    const source = new EventSource(`${API_BASE_URL}/api/events`);
+
+    source.addEventListener("generation", (event) => {
+      const { dashboard } = JSON.parse((event as MessageEvent).data) as GenerationEvent;
+      queryClient.setQueryData(["daily-metrics"], dashboard.daily);
+      queryClient.setQueryData(["kpis"], { cards: dashboard.kpis });
+      queryClient.setQueryData(["summary"], dashboard.summary);
+      queryClient.setQueryData(["privacy-metrics"], dashboard.privacy);
+      queryClient.setQueryData(["network-health"], dashboard.health);
+      queryClient.setQueryData(["momentum"], dashboard.momentum);
+      queryClient.setQueryData(["poolMigration"], dashboard.pool_migration);
+      // Alerts are not part of the bundle
+      queryClient.invalidateQueries({ queryKey: ["alerts"] });
+    });
+
+    return () => source.close();
+  }, [queryClient]);
+};
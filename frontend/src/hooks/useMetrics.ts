@@ -74,7 +74,7 @@ export const useAlerts = () =>
   useQuery<AlertsResponse>({
     queryKey: ["alerts"],
     queryFn: async () => (await api.get<AlertsResponse>("/alerts")).data,
-    refetchInterval: 60 * 1000
+    staleTime: 5 * 60 * 1000
   });
 
 export const useSummary = () =>